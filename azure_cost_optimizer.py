@@ -4,13 +4,19 @@ Birden fazla Azure hesabınızın kaynaklarını analiz ederek maliyet tasarrufu
 """
 
 import os
+import asyncio
 import argparse
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Any
 
 # Modüller
 from modules.azure_client import AzureClientManager, AzureClient
+from modules.async_azure_client import AsyncAzureClient, create_async_credential
+from modules.metric_cache import MetricCache
+from modules.inventory import ResourceInventory, VIRTUAL_MACHINES, STORAGE_ACCOUNTS, SQL_DATABASES, WEB_APPS
 from modules.analyzers.resource_analyzer import ResourceAnalyzer
 from modules.analyzers.vm_analyzer import VMAnalyzer
 from modules.analyzers.app_service_analyzer import AppServiceAnalyzer
@@ -19,8 +25,13 @@ from modules.analyzers.sql_analyzer import SQLAnalyzer
 from modules.analyzers.cosmos_analyzer import CosmosDBAnalyzer
 from modules.analyzers.aks_analyzer import AKSAnalyzer
 from modules.cost_analyzer import CostAnalyzer
+from modules.cost_export import CostExport
+from modules.price_catalog import PriceCatalog
 from modules.optimizer import OptimizationRecommender
+from modules.rules import PRICED_SERVICES
 from modules.reporter import ReportGenerator
+from modules.resource_table import ResourceTable
+from modules.resource_id import ResourceId, resource_key
 from modules.config import AppConfig, AccountConfig
 
 # Logging yapılandırması
@@ -35,21 +46,33 @@ class AzureCostOptimizer:
     Birden fazla Azure hesabını analiz ederek maliyet optimizasyonu önerileri sunan ana sınıf.
     """
     
-    def __init__(self, subscription_ids=None, config=None):
+    def __init__(self, subscription_ids=None, config=None, client_manager=None):
         """
         Azure Cost Optimizer'ı başlatır.
         
         Args:
             subscription_ids: Azure Abonelik ID'leri listesi (None ise tüm abonelikler taranır)
             config: Uygulama yapılandırması (None ise varsayılan yapılandırma kullanılır)
+            client_manager: Önceden oluşturulmuş AzureClientManager (kimlik bilgisi ve metrik
+                önbelleğiyle birlikte); None ise yapılandırmadan oluşturulur
         """
         self.config = config or AppConfig()
         
         # Çıktı dizinini oluştur
         os.makedirs(self.config.output_dir, exist_ok=True)
         
+        # Metrik önbelleğini başlat
+        self.metric_cache = client_manager.metric_cache if client_manager else None
+        if client_manager is None and self.config.metric_cache_path:
+            self.metric_cache = MetricCache(
+                self.config.metric_cache_path,
+                ttl_seconds=self.config.metric_cache_ttl,
+                max_entries=self.config.metric_cache_max_entries
+            )
+        
         # Azure istemci yöneticisini başlat
-        self.client_manager = AzureClientManager()
+        self.client_manager = client_manager or AzureClientManager(
+            metric_cache=self.metric_cache, cost_query_endpoint=self.config.cost_query_endpoint)
         
         # Abonelikleri belirle
         self.subscription_ids = subscription_ids or []
@@ -74,77 +97,72 @@ class AzureCostOptimizer:
         self.inactive_resources = {}  # {subscription_id: [resources]}
         self.high_cost_resources = {}  # {subscription_id: [resources]}
         self.recommendations = {}  # {subscription_id: [recommendations]}
+        self.resource_table = ResourceTable()  # Raporlama ve arayüzün okuduğu sütunlu sonuç tablosu
+        self.analyzer_timings = {}  # {subscription_id: {analyzer: saniye}}
+        self.inventory = None  # Resource Graph envanteri (analyze_resources tarafından yüklenir)
+        self.cost_indexes = {}  # {(subscription_id, başlangıç, bitiş): CostIndex}
+        
+        # Günlük maliyetler çalıştırmalar arasında geçmiş maliyet deposunda saklanır
+        self.cost_store = None
+        if self.config.cost_store_path:
+            try:
+                from modules.cost_store import CostStore
+                self.cost_store = CostStore(self.config.cost_store_path)
+            except ImportError:
+                logger.warning("Geçmiş maliyet deposu için pandas ve pyarrow paketleri gereklidir, depo kapatıldı")
+        
+        # Maliyet dışa aktarımı tüm abonelikler için bir kez okunur
+        self.cost_export = None
+        if self.config.cost_source == 'export' and self.config.cost_export_path:
+            self.cost_export = CostExport(self.config.cost_export_path, start_date=self.config.cost_start_date,
+                                          end_date=self.config.cost_end_date, daily=self.cost_store is not None)
+        
+        # Fiyat kataloğu tüm abonelikler için bir kez, yalnızca fiyatı kullanılan hizmetlerle okunur
+        self.price_catalog = None
+        if self.config.price_catalog_path:
+            self.price_catalog = PriceCatalog(self.config.price_catalog_path, services=PRICED_SERVICES.values())
         
         logger.info(f"Azure Cost Optimizer başlatıldı - {len(self.subscription_ids)} abonelik")
     
     def analyze_resources(self):
         """
         Tüm aboneliklerdeki kaynakları analiz eder.
+        
+        Abonelikler seçilen motorla eşzamanlı olarak analiz edilir: "thread" motoru
+        sınırlı bir iş parçacığı havuzu, "async" motoru tek bir olay döngüsü kullanır.
+        Bir abonelikteki hata diğerlerini etkilemez. Sonuçlar abonelik sırasına göre
+        birleştirildiği için çıktı sıralı çalıştırmayla aynıdır.
         """
-        logger.info(f"Kaynaklar analiz ediliyor - {len(self.subscription_ids)} abonelik")
+        max_workers = max(1, min(self.config.max_workers, len(self.subscription_ids) or 1))
+        logger.info(f"Kaynaklar analiz ediliyor - {len(self.subscription_ids)} abonelik, "
+                    f"{max_workers} eşzamanlı işçi, {self.config.engine} motoru")
         
-        for sub_id in self.subscription_ids:
-            try:
-                # Abonelik için yapılandırmayı bul
-                account_config = next((acc for acc in self.config.accounts if acc.subscription_id == sub_id), None)
-                if not account_config:
-                    logger.warning(f"Abonelik için yapılandırma bulunamadı: {sub_id}, atlanıyor.")
-                    continue
-                
-                # Abonelik için Azure istemcisini al
-                azure_client = self.client_manager.get_client(sub_id)
-                
-                # Her analizörü oluştur ve çalıştır
-                vm_analyzer = VMAnalyzer(azure_client, account_config)
-                app_service_analyzer = AppServiceAnalyzer(azure_client, account_config)
-                storage_analyzer = StorageAnalyzer(azure_client, account_config)
-                sql_analyzer = SQLAnalyzer(azure_client, account_config)
-                cosmos_analyzer = CosmosDBAnalyzer(azure_client, account_config)
-                aks_analyzer = AKSAnalyzer(azure_client, account_config)
-                
-                # İnaktif kaynakları belirle
-                inactive_vms = vm_analyzer.analyze()
-                inactive_apps = app_service_analyzer.analyze()
-                inactive_storages = storage_analyzer.analyze()
-                inactive_dbs = sql_analyzer.analyze()
-                inactive_cosmos = cosmos_analyzer.analyze()
-                inactive_aks = aks_analyzer.analyze()
-                
-                # İnaktif kaynakları birleştir
-                subscription_inactive = []
-                subscription_inactive.extend(inactive_vms)
-                subscription_inactive.extend(inactive_apps)
-                subscription_inactive.extend(inactive_storages)
-                subscription_inactive.extend(inactive_dbs)
-                subscription_inactive.extend(inactive_cosmos)
-                subscription_inactive.extend(inactive_aks)
-                
-                # Maliyet analizörünü oluştur
-                cost_analyzer = CostAnalyzer(azure_client, account_config)
-                
-                # Kaynaklara maliyet verilerini ekle
-                cost_analyzer.add_costs_to_resources(subscription_inactive)
-                
-                # Yüksek maliyetli kaynakları belirle
-                subscription_high_cost = cost_analyzer.get_high_cost_resources()
-                
-                # Optimizasyon önerilerini oluştur
-                optimizer = OptimizationRecommender(azure_client)
-                subscription_recommendations = optimizer.generate_recommendations(
-                    subscription_inactive, subscription_high_cost)
-                
-                # Sonuçları depolama yapısına ekle
-                self.inactive_resources[sub_id] = subscription_inactive
-                self.high_cost_resources[sub_id] = subscription_high_cost
-                self.recommendations[sub_id] = subscription_recommendations
-                
-                logger.info(f"Abonelik analizi tamamlandı: {sub_id}")
-                logger.info(f"  İnaktif kaynaklar: {len(subscription_inactive)}")
-                logger.info(f"  Yüksek maliyetli kaynaklar: {len(subscription_high_cost)}")
-                logger.info(f"  Optimizasyon önerileri: {len(subscription_recommendations)}")
-                
-            except Exception as e:
-                logger.error(f"Abonelik analiz edilirken hata: {sub_id} - {str(e)}")
+        # Tüm aboneliklerin envanterini birkaç Resource Graph sorgusuyla önceden yükle
+        self.inventory = self._load_inventory()
+        
+        if self.config.engine == 'async':
+            outcomes = asyncio.run(self._analyze_subscriptions_async(max_workers))
+        else:
+            outcomes = self._analyze_subscriptions_threaded(max_workers)
+        
+        # Sonuçları abonelik sırasına göre birleştir
+        tables = []
+        for sub_id, result in zip(self.subscription_ids, outcomes):
+            if isinstance(result, Exception):
+                logger.error(f"Abonelik analiz edilirken hata: {sub_id} - {str(result)}")
+                continue
+            
+            if result is None:
+                continue
+            
+            subscription_inactive, subscription_high_cost, subscription_recommendations, table, timings = result
+            self.inactive_resources[sub_id] = subscription_inactive
+            self.high_cost_resources[sub_id] = subscription_high_cost
+            self.recommendations[sub_id] = subscription_recommendations
+            self.analyzer_timings[sub_id] = timings
+            tables.append(table)
+        
+        self.resource_table = ResourceTable.concat(tables)
         
         total_inactive = sum(len(resources) for resources in self.inactive_resources.values())
         total_high_cost = sum(len(resources) for resources in self.high_cost_resources.values())
@@ -154,6 +172,306 @@ class AzureCostOptimizer:
         logger.info(f"Toplam inaktif kaynaklar: {total_inactive}")
         logger.info(f"Toplam yüksek maliyetli kaynaklar: {total_high_cost}")
         logger.info(f"Toplam optimizasyon önerileri: {total_recommendations}")
+        
+        if self.metric_cache:
+            stats = self.metric_cache.stats()
+            logger.info(f"Metrik önbelleği: {stats['hits']} isabet, {stats['misses']} ıskalama, "
+                        f"{stats['evictions']} tahliye, {stats['entries']} kayıt")
+        
+        if self.cost_indexes:
+            rows_read = sum(index.rows_read for index in self.cost_indexes.values())
+            cost_seconds = sum(index.seconds for index in self.cost_indexes.values())
+            logger.info(f"Maliyet dizinleri: {len(self.cost_indexes)} dizin, {rows_read} kullanım satırı, "
+                        f"{cost_seconds:.1f} sn")
+        
+        scheduler_stats = self.client_manager.scheduler.stats()
+        logger.info(f"İstek zamanlayıcı: {scheduler_stats['throttled']} kısıtlama (429), "
+                    f"{scheduler_stats['waited_seconds']:.1f} sn bekleme")
+    
+    def _load_inventory(self):
+        """
+        Tüm aboneliklerin kaynak envanterini Resource Graph ile yükler.
+        
+        Returns:
+            ResourceInventory nesnesi veya None (devre dışıysa ya da yüklenemezse;
+            bu durumda analizörler hizmet listesi çağrılarını kullanır)
+        """
+        if not self.config.use_resource_graph or not self.subscription_ids:
+            return None
+        
+        try:
+            inventory = ResourceInventory(
+                self.client_manager.credential,
+                endpoint=self.config.resource_graph_endpoint,
+                scheduler=self.client_manager.scheduler
+            )
+            return inventory.load(self.subscription_ids)
+        except Exception as e:
+            logger.warning(f"Resource Graph envanteri yüklenemedi, hizmet listeleri kullanılacak: {str(e)}")
+            return None
+    
+    def _analyze_subscriptions_threaded(self, max_workers):
+        """
+        Abonelikleri sınırlı bir iş parçacığı havuzunda analiz eder.
+        
+        Returns:
+            Abonelik sırasıyla sonuç listesi (hata alınan abonelikler için Exception nesnesi)
+        """
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="subscription") as executor:
+            futures = [executor.submit(self._analyze_subscription, sub_id) for sub_id in self.subscription_ids]
+            
+            outcomes = []
+            for future in futures:
+                try:
+                    outcomes.append(future.result())
+                except Exception as e:
+                    outcomes.append(e)
+        
+        return outcomes
+    
+    async def _analyze_subscriptions_async(self, max_workers):
+        """
+        Abonelikleri tek bir olay döngüsünde asenkron istemcilerle analiz eder.
+        
+        Returns:
+            Abonelik sırasıyla sonuç listesi (hata alınan abonelikler için Exception nesnesi)
+        """
+        credential = create_async_credential()
+        limiter = asyncio.Semaphore(max_workers)
+        
+        async def run(sub_id):
+            async with limiter:
+                return await self._analyze_subscription_async(sub_id, credential)
+        
+        try:
+            return await asyncio.gather(*(run(sub_id) for sub_id in self.subscription_ids), return_exceptions=True)
+        finally:
+            await credential.close()
+    
+    def _analyze_subscription(self, sub_id):
+        """
+        Tek bir aboneliğin kaynaklarını analiz eder.
+        
+        Args:
+            sub_id: Azure Abonelik ID'si
+            
+        Returns:
+            (inaktif kaynaklar, yüksek maliyetli kaynaklar, öneriler, kaynak tablosu, analizör süreleri)
+            demeti veya None (abonelik için yapılandırma yoksa)
+        """
+        account_config = self._get_account_config(sub_id)
+        if not account_config:
+            return None
+        
+        # Abonelik için Azure istemcisini al
+        azure_client = self.client_manager.get_client(sub_id)
+        analyzers = self._create_analyzers(azure_client, account_config)
+        
+        # Analizörler farklı kaynak sağlayıcılarını sorguladığı için eşzamanlı çalıştırılır
+        with ThreadPoolExecutor(max_workers=len(analyzers), thread_name_prefix=f"analyzer-{sub_id[:8]}") as executor:
+            futures = [executor.submit(self._run_analyzer, analyzer) for analyzer in analyzers]
+            
+            outcomes = []
+            for future in futures:
+                try:
+                    outcomes.append(future.result())
+                except Exception as e:
+                    outcomes.append(e)
+        
+        subscription_inactive, timings = self._merge_analyzer_outcomes(sub_id, analyzers, outcomes)
+        
+        return (*self._finalize_subscription(sub_id, account_config, subscription_inactive), timings)
+    
+    async def _analyze_subscription_async(self, sub_id, credential):
+        """
+        Tek bir aboneliğin kaynaklarını asenkron istemci ile analiz eder.
+        
+        Args:
+            sub_id: Azure Abonelik ID'si
+            credential: azure.identity.aio kimlik bilgisi nesnesi
+            
+        Returns:
+            (inaktif kaynaklar, yüksek maliyetli kaynaklar, öneriler, kaynak tablosu, analizör süreleri)
+            demeti veya None (abonelik için yapılandırma yoksa)
+        """
+        account_config = self._get_account_config(sub_id)
+        if not account_config:
+            return None
+        
+        async with AsyncAzureClient(sub_id, credential, metrics_endpoint=self.client_manager.metrics_endpoint,
+                                    metric_cache=self.metric_cache,
+                                    max_concurrency=account_config.async_concurrency,
+                                    scheduler=self.client_manager.scheduler) as azure_client:
+            analyzers = self._create_analyzers(azure_client, account_config)
+            outcomes = await asyncio.gather(
+                *(self._run_analyzer_async(analyzer) for analyzer in analyzers), return_exceptions=True)
+        
+        subscription_inactive, timings = self._merge_analyzer_outcomes(sub_id, analyzers, outcomes)
+        
+        # Maliyet ve öneri adımları senkron SDK'yı kullanır; olay döngüsünü bloklamamak için
+        # ayrı bir iş parçacığında çalıştırılır
+        finalized = await asyncio.to_thread(self._finalize_subscription, sub_id, account_config, subscription_inactive)
+        
+        return (*finalized, timings)
+    
+    def _get_account_config(self, sub_id):
+        """
+        Abonelik için yapılandırmayı bulur.
+        
+        Returns:
+            AccountConfig nesnesi veya None
+        """
+        account_config = next((acc for acc in self.config.accounts if acc.subscription_id == sub_id), None)
+        if not account_config:
+            logger.warning(f"Abonelik için yapılandırma bulunamadı: {sub_id}, atlanıyor.")
+        
+        return account_config
+    
+    def _create_analyzers(self, azure_client, account_config):
+        """
+        Bir abonelik için tüm kaynak analizörlerini oluşturur.
+        
+        Returns:
+            Analizör listesi (sonuçlar bu sırayla birleştirilir)
+        """
+        return [
+            VMAnalyzer(azure_client, account_config, self.inventory),
+            AppServiceAnalyzer(azure_client, account_config, self.inventory),
+            StorageAnalyzer(azure_client, account_config, self.inventory),
+            SQLAnalyzer(azure_client, account_config, self.inventory),
+            CosmosDBAnalyzer(azure_client, account_config, self.inventory),
+            AKSAnalyzer(azure_client, account_config, self.inventory)
+        ]
+    
+    def _merge_analyzer_outcomes(self, sub_id, analyzers, outcomes):
+        """
+        Analizör sonuçlarını analizör sırasına göre birleştirir.
+        
+        Args:
+            sub_id: Azure Abonelik ID'si
+            analyzers: Analizör listesi
+            outcomes: Her analizör için (inaktif kaynaklar, süre) demeti veya Exception nesnesi
+            
+        Returns:
+            (inaktif kaynaklar, {analizör: süre}) demeti
+        """
+        subscription_inactive = []
+        timings = {}
+        for analyzer, outcome in zip(analyzers, outcomes):
+            name = type(analyzer).__name__
+            if isinstance(outcome, Exception):
+                logger.error(f"{name} çalıştırılırken hata: {sub_id} - {str(outcome)}")
+                continue
+            
+            inactive, elapsed = outcome
+            subscription_inactive.extend(inactive)
+            timings[name] = elapsed
+            logger.info(f"  {name}: {len(inactive)} inaktif kaynak, {elapsed:.2f} sn")
+        
+        return subscription_inactive, timings
+    
+    def _finalize_subscription(self, sub_id, account_config, subscription_inactive):
+        """
+        İnaktif kaynaklara maliyet ekler, yüksek maliyetli kaynakları ve önerileri belirler.
+        
+        Sonuçlar aboneliğe ait bir kaynak tablosunda toplanır; maliyetler tabloya
+        vektörel olarak eklenir ve öneriler tablodaki kayıtlardan üretilir.
+        
+        Returns:
+            (inaktif kaynaklar, yüksek maliyetli kaynaklar, öneriler, kaynak tablosu) demeti
+        """
+        azure_client = self.client_manager.get_client(sub_id)
+        
+        # Maliyet analizörünü oluştur
+        cost_analyzer = CostAnalyzer(azure_client, account_config, self.cost_indexes,
+                                     cost_source=self.config.cost_source, group_by=self.config.cost_group_by,
+                                     granularity=self.config.cost_granularity, cost_export=self.cost_export,
+                                     cost_store=self.cost_store)
+        
+        # İnaktif kaynakları tabloya ekle ve maliyet verilerini tablo üzerinden birleştir
+        table = ResourceTable()
+        table.append(subscription_inactive, sub_id, account_config.display_name, kind='inactive')
+        cost_analyzer.add_costs_to_table(table, kind='inactive')
+        
+        # Yüksek maliyetli kaynakları belirle
+        subscription_high_cost = cost_analyzer.get_high_cost_resources()
+        self._attach_sizes(sub_id, subscription_high_cost)
+        table.append(subscription_high_cost, sub_id, account_config.display_name, kind='high_cost')
+        
+        # Optimizasyon önerilerini tablodaki kayıtlardan oluştur
+        optimizer = OptimizationRecommender(azure_client, price_catalog=self._load_price_catalog())
+        subscription_recommendations = optimizer.generate_recommendations(table)
+        
+        logger.info(f"Abonelik analizi tamamlandı: {sub_id}")
+        logger.info(f"  İnaktif kaynaklar: {len(subscription_inactive)}")
+        logger.info(f"  Yüksek maliyetli kaynaklar: {len(subscription_high_cost)}")
+        logger.info(f"  Optimizasyon önerileri: {len(subscription_recommendations)}")
+        
+        return subscription_inactive, subscription_high_cost, subscription_recommendations, table
+    
+    def _attach_sizes(self, sub_id, resources):
+        """
+        Maliyet kayıtlarına envanterdeki boyut/SKU bilgisini ekler; fiyat karşılaştırmaları bu bilgiyi kullanır.
+        
+        Args:
+            sub_id: Azure Abonelik ID'si
+            resources: CostEntry listesi
+        """
+        if self.inventory is None or not resources:
+            return
+        
+        sizes = {}
+        for resource_type in (VIRTUAL_MACHINES, STORAGE_ACCOUNTS, SQL_DATABASES):
+            for item in self.inventory.get(sub_id, resource_type) or []:
+                size = item.hardware_profile.vm_size or (item.sku.name if item.sku else None)
+                if size:
+                    sizes[resource_key(item.id)] = size
+        
+        for resource in resources:
+            if resource.size is None:
+                resource.size = sizes.get(resource_key(resource.id))
+    
+    def _load_price_catalog(self):
+        """
+        Fiyat kataloğunu yükler; okunamazsa sabit oranlı tahminlere dönülür.
+        
+        Returns:
+            PriceCatalog veya None
+        """
+        if self.price_catalog is None:
+            return None
+        
+        try:
+            return self.price_catalog.load()
+        except Exception as e:
+            logger.warning(f"Fiyat kataloğu okunamadı, tasarruflar sabit oranlarla tahmin edilecek: {str(e)}")
+            self.price_catalog = None
+            return None
+    
+    def _run_analyzer(self, analyzer):
+        """
+        Bir analizörü çalıştırır ve süresini ölçer.
+        
+        Args:
+            analyzer: ResourceAnalyzer örneği
+            
+        Returns:
+            (inaktif kaynaklar, geçen süre saniye cinsinden) demeti
+        """
+        started = time.perf_counter()
+        inactive = analyzer.analyze()
+        return inactive, time.perf_counter() - started
+    
+    async def _run_analyzer_async(self, analyzer):
+        """
+        Bir analizörü asenkron olarak çalıştırır ve süresini ölçer.
+        
+        Returns:
+            (inaktif kaynaklar, geçen süre saniye cinsinden) demeti
+        """
+        started = time.perf_counter()
+        inactive = await analyzer.analyze_async()
+        return inactive, time.perf_counter() - started
     
     def generate_reports(self):
         """
@@ -172,17 +490,16 @@ class AzureCostOptimizer:
         } for acc in self.config.accounts}
         
         # Raporları oluştur
-        reporter.generate_inactive_resource_report(self.inactive_resources)
-        reporter.generate_high_cost_report(self.high_cost_resources)
+        reporter.generate_inactive_resource_report(self.resource_table)
+        reporter.generate_high_cost_report(self.resource_table)
         reporter.generate_recommendations_report(self.recommendations)
-        reporter.generate_charts(self.inactive_resources)
+        reporter.generate_charts(self.resource_table)
         reporter.generate_summary_report(
-            self.inactive_resources, 
-            self.high_cost_resources, 
+            self.resource_table,
             self.recommendations,
             account_configs
         )
-        reporter.generate_visualization(self.inactive_resources)
+        reporter.generate_visualization(self.resource_table)
         
         logger.info("Raporlar başarıyla oluşturuldu.")
     
@@ -204,9 +521,11 @@ class AzureCostOptimizer:
                 azure_client = self.client_manager.get_client(sub_id)
                 
                 for resource in resources:
-                    resource_id = resource['id']
-                    resource_name = resource['name']
-                    resource_type = resource['type'].lower()
+                    resource_id = resource.id
+                    resource_name = resource.name
+                    # Analizörler görünen tür adı (örn. "Virtual Machine") yazdığı için
+                    # eşleştirme kaynak ID'sindeki ARM türüyle yapılır
+                    resource_type = ResourceId.parse(resource_id).type_key
                     
                     logger.info(f"Kaynak devre dışı bırakılıyor: {resource_name} ({resource_type})")
                     
@@ -216,17 +535,17 @@ class AzureCostOptimizer:
                     
                     try:
                         # Kaynak türüne göre devre dışı bırakma işlemi
-                        if 'microsoft.compute/virtualmachines' in resource_type:
+                        if resource_type == VIRTUAL_MACHINES:
                             # VM'i deallocate et
-                            resource_group = azure_client.extract_resource_group(resource_id)
+                            resource_group = ResourceId.parse(resource_id).resource_group
                             azure_client.compute_client.virtual_machines.deallocate(
                                 resource_group, resource_name)
                             
                             logger.info(f"VM başarıyla devre dışı bırakıldı: {resource_name}")
                         
-                        elif 'microsoft.web/sites' in resource_type:
+                        elif resource_type == WEB_APPS:
                             # App Service'i durdur
-                            resource_group = azure_client.extract_resource_group(resource_id)
+                            resource_group = ResourceId.parse(resource_id).resource_group
                             azure_client.web_client.web_apps.stop(resource_group, resource_name)
                             
                             logger.info(f"App Service başarıyla durduruldu: {resource_name}")
@@ -258,11 +577,49 @@ def main():
                       help='İnaktif kaynakları devre dışı bırak')
     parser.add_argument('--dry-run', action='store_true',
                       help='Simülasyon modu (gerçek değişiklik yapmaz)')
+    parser.add_argument('--metric-cache', type=str, default=None,
+                      help='Metrik önbelleği dosyası (varsayılan: .cache/metrics.sqlite)')
+    parser.add_argument('--metric-cache-ttl', type=float, default=6.0,
+                      help='Metrik önbelleği geçerlilik süresi (saat, varsayılan: 6)')
+    parser.add_argument('--no-metric-cache', action='store_true',
+                      help='Metrik önbelleğini devre dışı bırak')
+    parser.add_argument('--max-workers', type=int, default=4,
+                      help='Eşzamanlı analiz edilecek en fazla abonelik sayısı (varsayılan: 4)')
+    parser.add_argument('--no-resource-graph', action='store_true',
+                      help='Resource Graph envanterini kullanma, hizmet listelerini tek tek sorgula')
+    parser.add_argument('--engine', choices=['thread', 'async'], default='thread',
+                      help='Tarama motoru: iş parçacığı havuzu (thread) veya asyncio (async)')
+    parser.add_argument('--cost-source', choices=['query', 'usage'], default='query',
+                      help='Maliyet kaynağı: Cost Management Query API (query) veya kullanım detayları (usage)')
+    parser.add_argument('--cost-export', type=str, default=None,
+                      help='Maliyetleri API yerine yerel dışa aktarım dosyalarından oku (CSV/Parquet dosyası veya dizin)')
+    parser.add_argument('--cost-group-by', type=str, nargs='*', default=[],
+                      help='Maliyetleri ResourceId\'ye ek olarak grupla (örn. ResourceType, ResourceGroup, tag:env)')
+    parser.add_argument('--cost-store', type=str, default=None,
+                      help='Günlük maliyetlerin saklandığı Parquet deposu dizini (örn. .cache/costs; '
+                           'verilmezse depo kullanılmaz)')
+    parser.add_argument('--price-catalog', type=str, default=None,
+                      help='Tasarrufları hesaplamak için Azure Retail Prices anlık görüntüsü (JSON/CSV dosyası veya dizin)')
     
     args = parser.parse_args()
     
     # Yapılandırmayı oluştur
     config = AppConfig(output_dir=args.output_dir)
+    config.max_workers = max(1, args.max_workers)
+    config.engine = args.engine
+    config.use_resource_graph = not args.no_resource_graph
+    config.cost_source = args.cost_source
+    if args.cost_export:
+        config.cost_source = 'export'
+        config.cost_export_path = args.cost_export
+    config.cost_group_by = args.cost_group_by
+    config.cost_store_path = args.cost_store
+    config.price_catalog_path = args.price_catalog
+    config.metric_cache_ttl = int(args.metric_cache_ttl * 3600)
+    if args.no_metric_cache:
+        config.metric_cache_path = None
+    elif args.metric_cache:
+        config.metric_cache_path = args.metric_cache
     
     try:
         # Belirtilen abonelikler varsa bunları kullan, yoksa tüm abonelikleri kullan
@@ -8,17 +8,12 @@ import tempfile
 import datetime
 from modules.config import AppConfig, AccountConfig
 from modules.azure_client import AzureClientManager, AzureClient
-from modules.analyzers.resource_analyzer import ResourceAnalyzer
-from modules.analyzers.vm_analyzer import VMAnalyzer
-from modules.analyzers.app_service_analyzer import AppServiceAnalyzer
-from modules.analyzers.storage_analyzer import StorageAnalyzer
-from modules.analyzers.sql_analyzer import SQLAnalyzer
-from modules.analyzers.cosmos_analyzer import CosmosDBAnalyzer
-from modules.analyzers.aks_analyzer import AKSAnalyzer
-from modules.cost_analyzer import CostAnalyzer
-from modules.optimizer import OptimizationRecommender
-from modules.reporter import ReportGenerator
+from modules.metric_cache import MetricCache
+from modules.resource_table import ResourceTable
+from modules.resource_id import ResourceId
+from modules.inventory import VIRTUAL_MACHINES, WEB_APPS
 from modules.i18n import Translator
+from azure_cost_optimizer import AzureCostOptimizer
 from azure.identity import ClientSecretCredential, DefaultAzureCredential, InteractiveBrowserCredential
 
 # Çevirici başlat
@@ -56,6 +51,7 @@ def main():
         st.session_state.inactive_resources = {}
         st.session_state.high_cost_resources = {}
         st.session_state.recommendations = {}
+        st.session_state.resource_table = ResourceTable()
         st.session_state.output_dir = "reports"
     
     if 'credential' not in st.session_state:
@@ -297,99 +293,47 @@ def main():
                         cost_threshold=cost_threshold
                     ))
                 
-                # Client manager oluştur (manuel modda)
-                client_manager = AzureClientManager()
+                # Metrik önbelleği (tekrarlanan analizlerde metrikler yeniden sorgulanmaz)
+                if 'metric_cache' not in st.session_state:
+                    st.session_state.metric_cache = MetricCache(
+                        config.metric_cache_path,
+                        ttl_seconds=config.metric_cache_ttl,
+                        max_entries=config.metric_cache_max_entries
+                    )
                 
-                # Her abonelik için analiz yap
-                inactive_resources = {}
-                high_cost_resources = {}
-                recommendations = {}
+                # Abonelikler komut satırıyla aynı analiz hattından geçer
+                # (_analyze_subscription / _finalize_subscription); sonuçlar ortak
+                # kaynak tablosunda toplanır
+                client_manager = AzureClientManager(
+                    credential=st.session_state.get('credential'),
+                    metric_cache=st.session_state.metric_cache,
+                    cost_query_endpoint=config.cost_query_endpoint
+                )
+                optimizer = AzureCostOptimizer(
+                    subscription_ids=[account.subscription_id for account in config.accounts],
+                    config=config,
+                    client_manager=client_manager
+                )
                 
                 for account in config.accounts:
-                    sub_id = account.subscription_id
-                    
-                    st.info(f"{t('analyzing_subscription')}: {account.display_name} ({sub_id})")
-                    
-                    try:
-                        # Azure istemcisini al
-                        azure_client = client_manager.get_client(sub_id)
-                        
-                        # Analizörler
-                        resource_analyzer = ResourceAnalyzer(azure_client)
-                        vm_analyzer = VMAnalyzer(azure_client, account)
-                        app_service_analyzer = AppServiceAnalyzer(azure_client, account)
-                        storage_analyzer = StorageAnalyzer(azure_client, account)
-                        sql_analyzer = SQLAnalyzer(azure_client, account)
-                        cosmos_analyzer = CosmosDBAnalyzer(azure_client, account)
-                        aks_analyzer = AKSAnalyzer(azure_client, account)
-                        
-                        # Kaynakları al ve analiz et
-                        all_resources = resource_analyzer.get_all_resources()
-                        
-                        # İnaktif kaynak analizi
-                        vm_inactive = vm_analyzer.find_inactive_vms(all_resources)
-                        app_inactive = app_service_analyzer.find_inactive_app_services(all_resources)
-                        storage_inactive = storage_analyzer.find_inactive_storage_accounts(all_resources)
-                        sql_inactive = sql_analyzer.find_inactive_sql_databases(all_resources)
-                        cosmos_inactive = cosmos_analyzer.find_inactive_cosmos_dbs(all_resources)
-                        aks_inactive = aks_analyzer.find_inactive_aks_clusters(all_resources)
-                        
-                        inactive = vm_inactive + app_inactive + storage_inactive + sql_inactive + cosmos_inactive + aks_inactive
-                        
-                        # Maliyet analizi
-                        cost_analyzer = CostAnalyzer(azure_client, account)
-                        
-                        # İnaktif kaynaklara maliyet bilgisi ekle
-                        for resource in inactive:
-                            resource_id = resource.get('id')
-                            if resource_id:
-                                resource['cost'] = cost_analyzer.get_resource_cost(resource_id)
-                        
-                        # Yüksek maliyetli kaynakları bul
-                        high_cost = cost_analyzer.find_high_cost_resources(all_resources)
-                        
-                        # Optimizer
-                        recommender = OptimizationRecommender(azure_client, account)
-                        optimize_recommendations = recommender.generate_recommendations(
-                            all_resources, inactive, high_cost
-                        )
-                        
-                        # Sonuçları kaydet
-                        inactive_resources[sub_id] = inactive
-                        high_cost_resources[sub_id] = high_cost
-                        recommendations[sub_id] = optimize_recommendations
-                        
-                    except Exception as e:
-                        st.error(f"{t('error_analyzing_subscription')}: {sub_id} - {str(e)}")
+                    st.info(f"{t('analyzing_subscription')}: {account.display_name} ({account.subscription_id})")
+                
+                optimizer.analyze_resources()
+                
+                # Analizi tamamlanamayan abonelikler sonuçlarda yer almaz
+                for account in config.accounts:
+                    if account.subscription_id not in optimizer.inactive_resources:
+                        st.error(f"{t('error_analyzing_subscription')}: {account.subscription_id}")
                 
                 # Raporları oluştur
                 with st.spinner(t("generating_reports")):
-                    reporter = ReportGenerator(output_dir)
-                    reporter.generate_inactive_resource_report(inactive_resources)
-                    reporter.generate_high_cost_report(high_cost_resources)
-                    reporter.generate_recommendations_report(recommendations)
-                    reporter.generate_charts(inactive_resources)
-                    
-                    # Hesap konfigürasyonlarını sözlük formatına dönüştür
-                    account_configs = {acc.subscription_id: {
-                        'display_name': acc.display_name,
-                        'days_inactive': acc.days_inactive,
-                        'cost_threshold': acc.cost_threshold
-                    } for acc in config.accounts}
-                    
-                    reporter.generate_summary_report(
-                        inactive_resources, 
-                        high_cost_resources, 
-                        recommendations,
-                        account_configs
-                    )
-                    
-                    reporter.generate_visualization(inactive_resources)
+                    optimizer.generate_reports()
                 
                 # Oturum verilerini kaydet
-                st.session_state.inactive_resources = inactive_resources
-                st.session_state.high_cost_resources = high_cost_resources
-                st.session_state.recommendations = recommendations
+                st.session_state.inactive_resources = optimizer.inactive_resources
+                st.session_state.high_cost_resources = optimizer.high_cost_resources
+                st.session_state.recommendations = optimizer.recommendations
+                st.session_state.resource_table = optimizer.resource_table
                 st.session_state.analysis_complete = True
                 
                 st.success(t("analysis_success"))
@@ -414,9 +358,10 @@ def main():
                         azure_client = AzureClientManager().get_client(sub_id)
                         
                         for resource in resources:
-                            resource_id = resource.get('id')
-                            resource_name = resource.get('name')
-                            resource_type = resource.get('type', '').lower()
+                            resource_id = resource.id
+                            resource_name = resource.name
+                            # Analizörler görünen tür adı yazdığı için ARM türü kaynak ID'sinden alınır
+                            resource_type = ResourceId.parse(resource_id).type_key
                             
                             if dry_run:
                                 st.write(f"[SİMÜLASYON] {resource_name} devre dışı bırakılacaktı")
@@ -425,17 +370,17 @@ def main():
                             
                             try:
                                 # Kaynak türüne göre devre dışı bırakma işlemi
-                                if 'microsoft.compute/virtualmachines' in resource_type:
+                                if resource_type == VIRTUAL_MACHINES:
                                     # VM'i deallocate et
-                                    resource_group = azure_client.extract_resource_group(resource_id)
+                                    resource_group = ResourceId.parse(resource_id).resource_group
                                     azure_client.compute_client.virtual_machines.deallocate(
                                         resource_group, resource_name)
                                     st.write(f"✅ VM deallocate: {resource_name}")
                                     success_count += 1
                                 
-                                elif 'microsoft.web/sites' in resource_type:
+                                elif resource_type == WEB_APPS:
                                     # App Service'i durdur
-                                    resource_group = azure_client.extract_resource_group(resource_id)
+                                    resource_group = ResourceId.parse(resource_id).resource_group
                                     azure_client.web_client.web_apps.stop(resource_group, resource_name)
                                     st.write(f"✅ App Service durduruldu: {resource_name}")
                                     success_count += 1
@@ -493,20 +438,13 @@ def main():
                 
                 # Tabloda gösterilecek kaynakları belirle
                 if selected_sub == "all":
-                    # Tüm aboneliklerden kaynakları birleştir
-                    all_resources = []
-                    for sub_id, resources in st.session_state.inactive_resources.items():
-                        sub_name = next((sub["name"] for sub in st.session_state.subscription_list if sub["id"] == sub_id), sub_id)
-                        for resource in resources:
-                            resource_copy = resource.copy()
-                            resource_copy['subscription'] = sub_name
-                            all_resources.append(resource_copy)
+                    # Tüm aboneliklerin kaynakları tablodan doğrudan seçilir
+                    df = st.session_state.resource_table.select(
+                        'inactive',
+                        columns=['account', 'name', 'type', 'resource_group', 'location', 'size', 'state', 'reason', 'cost']
+                    )
                     
-                    # DataFrame oluştur
-                    if all_resources:
-                        df = pd.DataFrame(all_resources)
-                        # Gereksiz sütunları kaldır
-                        df = df[['subscription', 'name', 'type', 'resource_group', 'location', 'size', 'state', 'reason', 'cost']]
+                    if not df.empty:
                         # Sütun adlarını çevir
                         df.columns = [t("col_subscription"), t("col_name"), t("col_type"), t("col_resource_group"), 
                                      t("col_location"), t("col_size"), t("col_state"), t("col_reason"), t("col_cost")]
@@ -525,12 +463,12 @@ def main():
                         st.info(t("no_inactive_resources"))
                 
                 elif selected_sub and selected_sub in st.session_state.inactive_resources:
-                    resources = st.session_state.inactive_resources[selected_sub]
+                    df = st.session_state.resource_table.select(
+                        'inactive', selected_sub,
+                        columns=['name', 'type', 'resource_group', 'location', 'size', 'state', 'reason', 'cost']
+                    )
                     
-                    if resources:
-                        df = pd.DataFrame(resources)
-                        # Gereksiz sütunları kaldır
-                        df = df[['name', 'type', 'resource_group', 'location', 'size', 'state', 'reason', 'cost']]
+                    if not df.empty:
                         # Sütun adlarını çevir
                         df.columns = [t("col_name"), t("col_type"), t("col_resource_group"), t("col_location"), 
                                      t("col_size"), t("col_state"), t("col_reason"), t("col_cost")]
@@ -573,21 +511,11 @@ def main():
                 
                 # Tabloda gösterilecek kaynakları belirle
                 if selected_sub == "all":
-                    # Tüm aboneliklerden kaynakları birleştir
-                    all_resources = []
-                    for sub_id, resources in st.session_state.high_cost_resources.items():
-                        sub_name = next((sub["name"] for sub in st.session_state.subscription_list if sub["id"] == sub_id), sub_id)
-                        for resource in resources:
-                            resource_copy = resource.copy()
-                            resource_copy['subscription'] = sub_name
-                            all_resources.append(resource_copy)
+                    # Tüm aboneliklerin kaynakları tablodan doğrudan seçilir
+                    df = st.session_state.resource_table.select(
+                        'high_cost', columns=['account', 'name', 'type', 'resource_group', 'location', 'cost'])
                     
-                    # DataFrame oluştur
-                    if all_resources:
-                        df = pd.DataFrame(all_resources)
-                        # Gereksiz sütunları kaldır
-                        columns = ['subscription', 'name', 'type', 'resource_group', 'location', 'cost']
-                        df = df[columns]
+                    if not df.empty:
                         # Sütun adlarını çevir
                         df.columns = [t("col_subscription"), t("col_name"), t("col_type"), 
                                       t("col_resource_group"), t("col_location"), t("col_cost")]
@@ -606,13 +534,10 @@ def main():
                         st.info(t("no_high_cost_resources"))
                 
                 elif selected_sub and selected_sub in st.session_state.high_cost_resources:
-                    resources = st.session_state.high_cost_resources[selected_sub]
+                    df = st.session_state.resource_table.select(
+                        'high_cost', selected_sub, columns=['name', 'type', 'resource_group', 'location', 'cost'])
                     
-                    if resources:
-                        df = pd.DataFrame(resources)
-                        # Gereksiz sütunları kaldır
-                        columns = ['name', 'type', 'resource_group', 'location', 'cost']
-                        df = df[columns]
+                    if not df.empty:
                         # Sütun adlarını çevir
                         df.columns = [t("col_name"), t("col_type"), t("col_resource_group"), 
                                       t("col_location"), t("col_cost")]
@@ -662,7 +587,7 @@ def main():
                     for sub_id, recommendations in st.session_state.recommendations.items():
                         sub_name = next((sub["name"] for sub in st.session_state.subscription_list if sub["id"] == sub_id), sub_id)
                         for rec in recommendations:
-                            rec_copy = rec.copy()
+                            rec_copy = rec.to_dict()
                             rec_copy['subscription'] = sub_name
                             all_recommendations.append(rec_copy)
                     
@@ -696,7 +621,7 @@ def main():
                     recommendations = st.session_state.recommendations[selected_sub]
                     
                     if recommendations:
-                        df = pd.DataFrame(recommendations)
+                        df = pd.DataFrame([rec.to_dict() for rec in recommendations])
                         # Sütunları düzenle
                         columns = ['resource_name', 'resource_type', 'issue', 'recommendation', 'cost_impact']
                         for col in columns:
@@ -4,6 +4,7 @@ AKS kümeleri için analiz modülü.
 
 import logging
 from modules.analyzers.resource_analyzer import ResourceAnalyzer
+from modules.inventory import AKS_CLUSTERS
 
 logger = logging.getLogger("AKSAnalyzer")
 
@@ -12,15 +13,16 @@ class AKSAnalyzer(ResourceAnalyzer):
     AKS kümelerini analiz eden sınıf.
     """
     
-    def __init__(self, azure_client, config):
+    def __init__(self, azure_client, config, inventory=None):
         """
         AKS analizörünü başlatır.
         
         Args:
             azure_client: Azure istemcisi
             config: Uygulama yapılandırması
+            inventory: Önceden yüklenmiş ResourceInventory (isteğe bağlı)
         """
-        super().__init__(azure_client, config)
+        super().__init__(azure_client, config, inventory)
         self.resource_type_name = "AKS Cluster"
     
     def analyze(self):
@@ -31,42 +33,86 @@ class AKSAnalyzer(ResourceAnalyzer):
             İnaktif AKS kümelerinin listesi
         """
         logger.info("AKS kümeleri analiz ediliyor...")
-        inactive_clusters = []
         
         try:
             # Tüm AKS kümelerini listele
-            aks_clusters = list(self.azure_client.aks_client.managed_clusters.list())
+            aks_clusters = self.list_resources(AKS_CLUSTERS, self.azure_client.aks_client.managed_clusters.list)
             
-            for cluster in aks_clusters:
-                # Node CPU kullanım metriklerini al
-                node_cpu = self.azure_client.get_resource_metric(
-                    cluster.id,
-                    'node_cpu_usage_percentage',
-                    self.config.start_time,
-                    self.config.end_time
-                )
-                
-                # İnaktif mi kontrol et
-                is_inactive = False
-                inactive_reason = ""
-                
-                if not node_cpu or self.is_metric_inactive(
-                    node_cpu, self.config.metric_thresholds['aks_cpu_threshold']):
-                    is_inactive = True
-                    inactive_reason = "Düşük CPU kullanımı"
-                
-                if is_inactive:
-                    # Node sayısını hesapla
-                    node_count = sum(pool.count for pool in cluster.agent_pool_profiles) if cluster.agent_pool_profiles else 0
-                    size_info = f"{node_count} node"
-                    
-                    inactive_clusters.append(self.create_resource_entry(
-                        cluster, cluster.provisioning_state, inactive_reason, size_info
-                    ))
+            # Node CPU ve bellek kullanım metriklerini tek geçişte toplu olarak al
+            node_metrics = self.get_metric_stats_batch(aks_clusters, **self._metric_query())
+            
+            entries = self.map_concurrent(
+                lambda cluster: self._evaluate_cluster(cluster, node_metrics.get(cluster.id, {})), aks_clusters)
+            inactive_clusters = [entry for entry in entries if entry]
             
             logger.info(f"{len(inactive_clusters)} inaktif AKS kümesi bulundu.")
             return inactive_clusters
             
         except Exception as e:
             logger.error(f"AKS kümeleri analiz edilirken hata oluştu: {str(e)}")
-            return [] 
\ No newline at end of file
+            return []
+    
+    async def analyze_async(self):
+        """
+        AKS kümelerini asenkron istemci ile analiz eder.
+        
+        Returns:
+            İnaktif AKS kümelerinin listesi
+        """
+        logger.info("AKS kümeleri analiz ediliyor (asenkron)...")
+        
+        try:
+            aks_clusters = await self.list_resources_async(AKS_CLUSTERS, lambda: self.azure_client.collect(
+                self.azure_client.aks_client.managed_clusters.list()))
+            node_metrics = await self.get_metric_stats_batch_async(aks_clusters, **self._metric_query())
+            
+            inactive_clusters = [
+                entry for entry in (self._evaluate_cluster(cluster, node_metrics.get(cluster.id, {}))
+                                    for cluster in aks_clusters)
+                if entry
+            ]
+            
+            logger.info(f"{len(inactive_clusters)} inaktif AKS kümesi bulundu.")
+            return inactive_clusters
+            
+        except Exception as e:
+            logger.error(f"AKS kümeleri analiz edilirken hata oluştu: {str(e)}")
+            return []
+    
+    def _metric_query(self):
+        """
+        Node CPU ve bellek kullanım metrikleri için sorgu parametrelerini döndürür.
+        """
+        thresholds = self.config.metric_thresholds
+        return {
+            'metric_names': ['node_cpu_usage_percentage', 'node_memory_working_set_percentage'],
+            'idle_thresholds': {
+                'node_cpu_usage_percentage': thresholds['aks_cpu_threshold'],
+                'node_memory_working_set_percentage': thresholds['aks_memory_threshold']
+            }
+        }
+    
+    def _evaluate_cluster(self, cluster, metrics):
+        """
+        Tek bir AKS kümesinin node CPU ve bellek kullanımını değerlendirir.
+        
+        Args:
+            cluster: AKS kümesi nesnesi
+            metrics: Kümenin metrik istatistikleri
+            
+        Returns:
+            Küme inaktifse kaynak bilgilerini içeren Resource kaydı, değilse None
+        """
+        thresholds = self.config.metric_thresholds
+        
+        if not (self.is_stats_inactive(
+                metrics.get('node_cpu_usage_percentage'), thresholds['aks_cpu_threshold']) and self.is_stats_inactive(
+                metrics.get('node_memory_working_set_percentage'), thresholds['aks_memory_threshold'])):
+            return None
+        
+        # Node sayısını hesapla
+        node_count = sum(pool.count for pool in cluster.agent_pool_profiles) if cluster.agent_pool_profiles else 0
+        size_info = f"{node_count} node"
+        
+        return self.create_resource_entry(
+            cluster, cluster.provisioning_state, "Düşük CPU ve bellek kullanımı", size_info, metrics) 
\ No newline at end of file
@@ -4,6 +4,8 @@ App Service uygulamaları için analiz modülü.
 
 import logging
 from modules.analyzers.resource_analyzer import ResourceAnalyzer
+from modules.inventory import WEB_APPS
+from modules.resource_id import resource_key
 
 logger = logging.getLogger("AppServiceAnalyzer")
 
@@ -12,15 +14,16 @@ class AppServiceAnalyzer(ResourceAnalyzer):
     App Service uygulamalarını analiz eden sınıf.
     """
     
-    def __init__(self, azure_client, config):
+    def __init__(self, azure_client, config, inventory=None):
         """
         App Service analizörünü başlatır.
         
         Args:
             azure_client: Azure istemcisi
             config: Uygulama yapılandırması
+            inventory: Önceden yüklenmiş ResourceInventory (isteğe bağlı)
         """
-        super().__init__(azure_client, config)
+        super().__init__(azure_client, config, inventory)
         self.resource_type_name = "App Service"
     
     def analyze(self):
@@ -31,52 +34,145 @@ class AppServiceAnalyzer(ResourceAnalyzer):
             İnaktif App Service uygulamalarının listesi
         """
         logger.info("App Service uygulamaları analiz ediliyor...")
-        inactive_apps = []
         
         try:
             # Tüm web uygulamalarını listele
-            web_apps = list(self.azure_client.web_client.web_apps.list())
+            web_apps = self.list_resources(WEB_APPS, self.azure_client.web_client.web_apps.list)
             
-            for app in web_apps:
-                # HTTP istek metriklerini al
-                http_requests = self.azure_client.get_resource_metric(
-                    app.id,
-                    'Requests',
-                    self.config.start_time,
-                    self.config.end_time,
-                    aggregation="Total"  # Toplam istek sayısı
-                )
-                
-                # İnaktif mi kontrol et
-                is_inactive = False
-                inactive_reason = ""
-                
-                if not http_requests or self.is_metric_inactive(
-                    http_requests, self.config.metric_thresholds['app_service_requests_threshold']):
-                    is_inactive = True
-                    inactive_reason = "Düşük HTTP istek sayısı"
-                
-                if is_inactive:
-                    # SKU bilgisini al
-                    sku = "Unknown"
-                    try:
-                        # App Service planını bulmaya çalış
-                        if hasattr(app, 'server_farm_id') and app.server_farm_id:
-                            resource_group = self.azure_client.extract_resource_group(app.server_farm_id)
-                            plan_name = app.server_farm_id.split('/')[-1]
-                            app_plan = self.azure_client.web_client.app_service_plans.get(
-                                resource_group, plan_name)
-                            sku = app_plan.sku.name if hasattr(app_plan, 'sku') and app_plan.sku else "Unknown"
-                    except Exception:
-                        pass
-                    
-                    inactive_apps.append(self.create_resource_entry(
-                        app, app.state, inactive_reason, sku
-                    ))
+            # HTTP istek metriklerini toplu olarak al
+            app_metrics = self.get_metric_stats_batch(web_apps, **self._metric_query())
+            
+            # App Service planlarını abonelik başına tek seferde listele
+            plans = self._index_plans(self._list_plans(), web_apps)
+            
+            # Plan bilgisi dizinden okunduğu için uygulama başına ek çağrı yapılmaz
+            entries = [self._evaluate_app(app, app_metrics.get(app.id, {}), plans) for app in web_apps]
+            inactive_apps = [entry for entry in entries if entry]
+            
+            logger.info(f"{len(inactive_apps)} inaktif App Service uygulaması bulundu.")
+            return inactive_apps
+            
+        except Exception as e:
+            logger.error(f"App Service uygulamaları analiz edilirken hata oluştu: {str(e)}")
+            return []
+    
+    async def analyze_async(self):
+        """
+        App Service uygulamalarını asenkron istemci ile analiz eder.
+        
+        Returns:
+            İnaktif App Service uygulamalarının listesi
+        """
+        logger.info("App Service uygulamaları analiz ediliyor (asenkron)...")
+        
+        try:
+            web_apps = await self.list_resources_async(WEB_APPS, lambda: self.azure_client.collect(
+                self.azure_client.web_client.web_apps.list()))
+            app_metrics = await self.get_metric_stats_batch_async(web_apps, **self._metric_query())
+            plans = self._index_plans(await self._list_plans_async(), web_apps)
+            
+            entries = [self._evaluate_app(app, app_metrics.get(app.id, {}), plans) for app in web_apps]
+            inactive_apps = [entry for entry in entries if entry]
             
             logger.info(f"{len(inactive_apps)} inaktif App Service uygulaması bulundu.")
             return inactive_apps
             
         except Exception as e:
             logger.error(f"App Service uygulamaları analiz edilirken hata oluştu: {str(e)}")
-            return [] 
\ No newline at end of file
+            return []
+    
+    def _metric_query(self):
+        """
+        HTTP istek metrikleri için sorgu parametrelerini döndürür.
+        """
+        return {
+            'metric_names': ['Requests'],
+            'aggregations': "Total",  # Toplam istek sayısı
+            'idle_thresholds': {'Requests': self.daily_threshold('app_service_requests_threshold')}
+        }
+    
+    def _is_app_inactive(self, metrics):
+        """
+        Uygulamanın HTTP istek sayısına göre inaktif olup olmadığını kontrol eder.
+        """
+        threshold = self.daily_threshold('app_service_requests_threshold')
+        return self.is_stats_inactive(metrics.get('Requests'), threshold)
+    
+    def _list_plans(self):
+        """
+        Aboneliğin tüm App Service planlarını listeler.
+        
+        Returns:
+            App Service planı nesneleri listesi (hata durumunda boş liste)
+        """
+        try:
+            return list(self.azure_client.web_client.app_service_plans.list())
+        except Exception as e:
+            logger.warning(f"App Service planları listelenemedi: {str(e)}")
+            return []
+    
+    async def _list_plans_async(self):
+        """
+        Aboneliğin tüm App Service planlarını asenkron istemci ile listeler.
+        
+        Returns:
+            App Service planı nesneleri listesi (hata durumunda boş liste)
+        """
+        try:
+            return await self.azure_client.collect(self.azure_client.web_client.app_service_plans.list())
+        except Exception as e:
+            logger.warning(f"App Service planları listelenemedi: {str(e)}")
+            return []
+    
+    def _index_plans(self, plans, web_apps):
+        """
+        Planları küçük harfli ID'ye göre dizinler ve plan başına uygulama yoğunluğunu hesaplar.
+        
+        Args:
+            plans: App Service planı nesneleri listesi
+            web_apps: Web uygulaması nesneleri listesi
+            
+        Returns:
+            Küçük harfli plan ID'sine göre plan bilgisi sözlüğü
+            {plan_id: {'name', 'sku', 'tier', 'app_count'}}
+        """
+        index = {}
+        for plan in plans:
+            index[resource_key(plan.id)] = {
+                'name': plan.name,
+                'sku': plan.sku.name if getattr(plan, 'sku', None) else "Unknown",
+                'tier': plan.sku.tier if getattr(plan, 'sku', None) else None,
+                'app_count': 0
+            }
+        
+        for app in web_apps:
+            plan = index.get(resource_key(getattr(app, 'server_farm_id', None)))
+            if plan:
+                plan['app_count'] += 1
+        
+        return index
+    
+    def _evaluate_app(self, app, metrics, plans):
+        """
+        Tek bir web uygulamasının HTTP istek sayısını değerlendirir.
+        
+        Args:
+            app: Web uygulaması nesnesi
+            metrics: Uygulamanın metrik istatistikleri
+            plans: _index_plans ile oluşturulmuş plan dizini
+            
+        Returns:
+            Uygulama inaktifse kaynak bilgilerini içeren Resource kaydı, değilse None
+        """
+        if not self._is_app_inactive(metrics):
+            return None
+        
+        # SKU bilgisini plan dizininden al
+        plan_id = getattr(app, 'server_farm_id', None)
+        plan = plans.get(resource_key(plan_id), {})
+        
+        entry = self.create_resource_entry(
+            app, app.state, "Düşük HTTP istek sayısı", plan.get('sku', "Unknown"), metrics)
+        entry.set_detail('app_service_plan', plan_id)
+        entry.set_detail('plan_app_count', plan.get('app_count', 0))
+        return entry
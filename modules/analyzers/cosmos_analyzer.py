@@ -4,6 +4,7 @@ CosmosDB hesapları için analiz modülü.
 
 import logging
 from modules.analyzers.resource_analyzer import ResourceAnalyzer
+from modules.inventory import COSMOS_ACCOUNTS
 
 logger = logging.getLogger("CosmosDBAnalyzer")
 
@@ -12,15 +13,16 @@ class CosmosDBAnalyzer(ResourceAnalyzer):
     CosmosDB hesaplarını analiz eden sınıf.
     """
     
-    def __init__(self, azure_client, config):
+    def __init__(self, azure_client, config, inventory=None):
         """
         CosmosDB analizörünü başlatır.
         
         Args:
             azure_client: Azure istemcisi
             config: Uygulama yapılandırması
+            inventory: Önceden yüklenmiş ResourceInventory (isteğe bağlı)
         """
-        super().__init__(azure_client, config)
+        super().__init__(azure_client, config, inventory)
         self.resource_type_name = "CosmosDB Account"
     
     def analyze(self):
@@ -31,41 +33,80 @@ class CosmosDBAnalyzer(ResourceAnalyzer):
             İnaktif CosmosDB hesaplarının listesi
         """
         logger.info("CosmosDB hesapları analiz ediliyor...")
-        inactive_accounts = []
         
         try:
             # Tüm CosmosDB hesaplarını listele
-            cosmos_accounts = list(self.azure_client.cosmosdb_client.database_accounts.list())
+            cosmos_accounts = self.list_resources(
+                COSMOS_ACCOUNTS, self.azure_client.cosmosdb_client.database_accounts.list)
             
-            for account in cosmos_accounts:
-                # İstek metriklerini al
-                total_requests = self.azure_client.get_resource_metric(
-                    account.id,
-                    'TotalRequests',
-                    self.config.start_time,
-                    self.config.end_time,
-                    aggregation="Total"  # Toplam istek sayısı
-                )
-                
-                # İnaktif mi kontrol et
-                is_inactive = False
-                inactive_reason = ""
-                
-                if not total_requests or self.is_metric_inactive(
-                    total_requests, self.config.metric_thresholds['cosmos_requests_threshold']):
-                    is_inactive = True
-                    inactive_reason = "Düşük istek sayısı"
-                
-                if is_inactive:
-                    offer_type = account.database_account_offer_type or "Unknown"
-                    
-                    inactive_accounts.append(self.create_resource_entry(
-                        account, 'Available', inactive_reason, offer_type
-                    ))
+            # İstek metriklerini toplu olarak al
+            cosmos_metrics = self.get_metric_stats_batch(cosmos_accounts, **self._metric_query())
+            
+            entries = self.map_concurrent(
+                lambda account: self._evaluate_account(account, cosmos_metrics.get(account.id, {})),
+                cosmos_accounts)
+            inactive_accounts = [entry for entry in entries if entry]
             
             logger.info(f"{len(inactive_accounts)} inaktif CosmosDB hesabı bulundu.")
             return inactive_accounts
             
         except Exception as e:
             logger.error(f"CosmosDB hesapları analiz edilirken hata oluştu: {str(e)}")
-            return [] 
\ No newline at end of file
+            return []
+    
+    async def analyze_async(self):
+        """
+        CosmosDB hesaplarını asenkron istemci ile analiz eder.
+        
+        Returns:
+            İnaktif CosmosDB hesaplarının listesi
+        """
+        logger.info("CosmosDB hesapları analiz ediliyor (asenkron)...")
+        
+        try:
+            cosmos_accounts = await self.list_resources_async(COSMOS_ACCOUNTS, lambda: self.azure_client.collect(
+                self.azure_client.cosmosdb_client.database_accounts.list()))
+            cosmos_metrics = await self.get_metric_stats_batch_async(cosmos_accounts, **self._metric_query())
+            
+            inactive_accounts = [
+                entry for entry in (self._evaluate_account(account, cosmos_metrics.get(account.id, {}))
+                                    for account in cosmos_accounts)
+                if entry
+            ]
+            
+            logger.info(f"{len(inactive_accounts)} inaktif CosmosDB hesabı bulundu.")
+            return inactive_accounts
+            
+        except Exception as e:
+            logger.error(f"CosmosDB hesapları analiz edilirken hata oluştu: {str(e)}")
+            return []
+    
+    def _metric_query(self):
+        """
+        CosmosDB istek metrikleri için sorgu parametrelerini döndürür.
+        """
+        return {
+            'metric_names': ['TotalRequests'],
+            'aggregations': "Total",  # Toplam istek sayısı
+            'idle_thresholds': {'TotalRequests': self.daily_threshold('cosmos_requests_threshold')}
+        }
+    
+    def _evaluate_account(self, account, metrics):
+        """
+        Tek bir CosmosDB hesabının istek sayısını değerlendirir.
+        
+        Args:
+            account: CosmosDB hesabı nesnesi
+            metrics: Hesabın metrik istatistikleri
+            
+        Returns:
+            Hesap inaktifse kaynak bilgilerini içeren Resource kaydı, değilse None
+        """
+        threshold = self.daily_threshold('cosmos_requests_threshold')
+        
+        if not self.is_stats_inactive(metrics.get('TotalRequests'), threshold):
+            return None
+        
+        offer_type = account.database_account_offer_type or "Unknown"
+        
+        return self.create_resource_entry(account, 'Available', "Düşük istek sayısı", offer_type, metrics) 
\ No newline at end of file
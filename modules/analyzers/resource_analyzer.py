@@ -2,8 +2,13 @@
 Azure kaynakları için temel analizör sınıfı.
 """
 
+import asyncio
 import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from modules.metric_stats import compute_series_stats, interval_days, stats_by_index
+from modules.records import Resource
+from modules.resource_id import ResourceId
 
 logger = logging.getLogger("ResourceAnalyzer")
 
@@ -12,16 +17,18 @@ class ResourceAnalyzer(ABC):
     Çeşitli Azure kaynakları için temel analizör sınıfı.
     """
     
-    def __init__(self, azure_client, config):
+    def __init__(self, azure_client, config, inventory=None):
         """
         Temel analizör sınıfını başlatır.
         
         Args:
             azure_client: Azure istemcisi
             config: Uygulama yapılandırması
+            inventory: Önceden yüklenmiş ResourceInventory (isteğe bağlı)
         """
         self.azure_client = azure_client
         self.config = config
+        self.inventory = inventory
         self.resource_type_name = "Generic Resource" # Alt sınıflar tarafından override edilmeli
     
     @abstractmethod
@@ -31,6 +38,71 @@ class ResourceAnalyzer(ABC):
         """
         pass
     
+    @abstractmethod
+    async def analyze_async(self):
+        """
+        Kaynakları asenkron istemci (AsyncAzureClient) ile analiz eder.
+        """
+        pass
+    
+    def _inventory_resources(self, resource_type):
+        """
+        Aboneliğin belirli türdeki kaynaklarını envanterden döndürür.
+        
+        Returns:
+            Kaynak listesi veya None (envanter yoksa ya da abonelik yüklenmediyse)
+        """
+        if self.inventory is None:
+            return None
+        
+        return self.inventory.get(self.azure_client.subscription_id, resource_type)
+    
+    def list_resources(self, resource_type, list_func):
+        """
+        Kaynakları envanterden, envanter yoksa hizmet listesi çağrısıyla alır.
+        
+        Args:
+            resource_type: Envanterdeki kaynak türü (örn. inventory.VIRTUAL_MACHINES)
+            list_func: Envanter kullanılamadığında çağrılacak liste işlevi
+            
+        Returns:
+            Kaynak listesi
+        """
+        resources = self._inventory_resources(resource_type)
+        if resources is not None:
+            return resources
+        
+        return list(list_func())
+    
+    async def list_resources_async(self, resource_type, list_func):
+        """
+        list_resources'ın asenkron karşılığı; list_func bir eşyordam işlevidir.
+        
+        Returns:
+            Kaynak listesi
+        """
+        resources = self._inventory_resources(resource_type)
+        if resources is not None:
+            return resources
+        
+        return await list_func()
+    
+    def daily_threshold(self, name):
+        """
+        Günlük toplam olarak tanımlanmış bir eşiği metrik aralığının uzunluğuna ölçekler.
+        
+        Toplam (Total) metrikleri aralık başına döner; örneğin PT1H aralıkta günlük
+        5 MB eşiği saat başına 5 MB / 24 olarak karşılaştırılır.
+        
+        Args:
+            name: config.metric_thresholds içindeki eşik adı
+            
+        Returns:
+            Aralık başına eşik değeri
+        """
+        interval = getattr(self.config, 'metric_interval', 'P1D')
+        return self.config.metric_thresholds[name] * interval_days(interval)
+    
     def is_metric_inactive(self, metric_value, threshold):
         """
         Bir metrik değerinin inaktif olup olmadığını kontrol eder.
@@ -44,29 +116,190 @@ class ResourceAnalyzer(ABC):
         """
         return metric_value is None or metric_value < threshold
     
-    def create_resource_entry(self, resource, state, reason, size_info=None):
+    def is_stats_inactive(self, stats, threshold):
         """
-        Kaynak bilgilerini içeren bir sözlük oluşturur.
+        Bir metriğin istatistiklerine göre inaktif olup olmadığını kontrol eder.
+        
+        Tek bir ortalama yerine yüzde 95'lik dilim kullanılır; kısa süreli yoğun
+        kullanımı olan kaynaklar inaktif sayılmaz.
+        
+        Args:
+            stats: Metrik istatistikleri sözlüğü (mean, max, p95, ...) veya None
+            threshold: İnaktiflik eşiği
+            
+        Returns:
+            True ise inaktif, False ise aktif
+        """
+        if not stats or not stats.get('count'):
+            return True
+        
+        return self.is_metric_inactive(stats['p95'], threshold)
+    
+    def get_metric_stats_batch(self, resources, metric_names, aggregations="Average", idle_thresholds=None):
+        """
+        Kaynak listesinin metrik serilerini toplu olarak alır ve istatistiklerini
+        tüm kaynaklar için tek vektörel geçişte hesaplar.
+        
+        Args:
+            resources: Azure kaynak nesneleri listesi
+            metric_names: Metrik adları listesi
+            aggregations: Ortak toplama yöntemi veya {metric_name: aggregation} sözlüğü
+            idle_thresholds: Boşta geçen nokta oranı için {metric_name: eşik} sözlüğü
+            
+        Returns:
+            Kaynak ID'sine göre metrik istatistikleri sözlüğü
+            {resource_id: {metric_name: {mean, max, p95, p99, idle_fraction, trend_slope, count}}}
+        """
+        if not resources:
+            return {}
+        
+        series = self.azure_client.get_multi_metric_series_batch(
+            [resource.id for resource in resources],
+            metric_names,
+            self.config.start_time,
+            self.config.end_time,
+            aggregations=aggregations,
+            locations={resource.id: resource.location for resource in resources},
+            interval=self.config.metric_interval
+        )
+        
+        return self._compute_metric_stats(resources, metric_names, series, idle_thresholds)
+    
+    async def get_metric_stats_batch_async(self, resources, metric_names, aggregations="Average",
+                                           idle_thresholds=None):
+        """
+        get_metric_stats_batch'in asenkron istemci için karşılığı.
+        
+        Returns:
+            Kaynak ID'sine göre metrik istatistikleri sözlüğü
+        """
+        if not resources:
+            return {}
+        
+        series = await self.azure_client.get_multi_metric_series_batch(
+            [resource.id for resource in resources],
+            metric_names,
+            self.config.start_time,
+            self.config.end_time,
+            aggregations=aggregations,
+            locations={resource.id: resource.location for resource in resources},
+            interval=self.config.metric_interval
+        )
+        
+        return self._compute_metric_stats(resources, metric_names, series, idle_thresholds)
+    
+    def _compute_metric_stats(self, resources, metric_names, series, idle_thresholds=None):
+        """
+        Alınan serilerden tüm kaynakların istatistiklerini metrik başına tek vektörel geçişte hesaplar.
+        
+        Returns:
+            Kaynak ID'sine göre metrik istatistikleri sözlüğü
+        """
+        idle_thresholds = idle_thresholds or {}
+        resource_ids = [resource.id for resource in resources]
+        results = {resource_id: {} for resource_id in resource_ids}
+        
+        for metric_name in metric_names:
+            stats = compute_series_stats(
+                [series.get(resource_id, {}).get(metric_name) for resource_id in resource_ids],
+                idle_threshold=idle_thresholds.get(metric_name)
+            )
+            for index, resource_id in enumerate(resource_ids):
+                results[resource_id][metric_name] = stats_by_index(stats, index)
+        
+        return results
+    
+    def map_concurrent(self, func, items, max_workers=None):
+        """
+        Bir işlevi kaynak listesi üzerinde sınırlı eşzamanlılıkla çalıştırır.
+        
+        Sonuçlar girdi sırasıyla döner. Bir kaynakta oluşan hata diğerlerini
+        etkilemez; hata günlüğe yazılır ve o kaynağın sonucu None olur.
+        
+        Args:
+            func: Her kaynak için çağrılacak işlev
+            items: Kaynak listesi
+            max_workers: En fazla eşzamanlı çağrı sayısı (None ise config.resource_concurrency)
+            
+        Returns:
+            Girdi sırasıyla sonuç listesi
+        """
+        items = list(items)
+        if not items:
+            return []
+        
+        def call(item):
+            try:
+                return func(item)
+            except Exception as e:
+                logger.error(f"{self.resource_type_name} işlenirken hata: "
+                             f"{getattr(item, 'name', item)} - {str(e)}")
+                return None
+        
+        max_workers = max_workers or getattr(self.config, 'resource_concurrency', 1)
+        max_workers = max(1, min(max_workers, len(items)))
+        
+        if max_workers == 1:
+            return [call(item) for item in items]
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=type(self).__name__) as executor:
+            return list(executor.map(call, items))
+    
+    async def map_concurrent_async(self, func, items, max_workers=None):
+        """
+        map_concurrent'in asenkron karşılığı: bir eşyordam işlevini kaynak listesi
+        üzerinde tek olay döngüsünde sınırlı eşzamanlılıkla çalıştırır.
+        
+        Args:
+            func: Her kaynak için çağrılacak eşyordam işlevi
+            items: Kaynak listesi
+            max_workers: En fazla eşzamanlı çağrı sayısı (None ise config.async_concurrency)
+            
+        Returns:
+            Girdi sırasıyla sonuç listesi (hata alınan kaynaklar için None)
+        """
+        items = list(items)
+        if not items:
+            return []
+        
+        limiter = asyncio.Semaphore(max_workers or getattr(self.config, 'async_concurrency', 1))
+        
+        async def call(item):
+            async with limiter:
+                try:
+                    return await func(item)
+                except Exception as e:
+                    logger.error(f"{self.resource_type_name} işlenirken hata: "
+                                 f"{getattr(item, 'name', item)} - {str(e)}")
+                    return None
+        
+        return await asyncio.gather(*(call(item) for item in items))
+    
+    def create_resource_entry(self, resource, state, reason, size_info=None, metric_stats=None):
+        """
+        Kaynak bilgilerini içeren bir kayıt oluşturur.
         
         Args:
             resource: Azure kaynak nesnesi
             state: Kaynağın durumu
             reason: İnaktiflik nedeni
             size_info: Boyut bilgisi (isteğe bağlı)
+            metric_stats: Metrik adına göre istatistikler (isteğe bağlı)
             
         Returns:
-            Kaynak bilgilerini içeren sözlük
-        """
-        resource_group = self.azure_client.extract_resource_group(resource.id)
-        
-        return {
-            'id': resource.id,
-            'name': resource.name,
-            'type': self.resource_type_name,
-            'resource_group': resource_group,
-            'location': resource.location,
-            'size': size_info or "Unknown",
-            'state': state,
-            'reason': reason,
-            'cost': 0.0  # Başlangıçta maliyet bilgisi yok, daha sonra CostAnalyzer tarafından doldurulacak
-        } 
\ No newline at end of file
+            Kaynak bilgilerini içeren Resource kaydı
+        """
+        resource_group = ResourceId.parse(resource.id).resource_group
+        
+        return Resource(
+            id=resource.id,
+            name=resource.name,
+            type=self.resource_type_name,
+            resource_group=resource_group,
+            location=resource.location,
+            size=size_info or "Unknown",
+            state=state,
+            reason=reason,
+            cost=0.0,  # Başlangıçta maliyet bilgisi yok, daha sonra CostAnalyzer tarafından doldurulacak
+            metrics=metric_stats
+        ) 
\ No newline at end of file
@@ -4,6 +4,8 @@ SQL veritabanları için analiz modülü.
 
 import logging
 from modules.analyzers.resource_analyzer import ResourceAnalyzer
+from modules.inventory import SQL_DATABASES
+from modules.resource_id import ResourceId
 
 logger = logging.getLogger("SQLAnalyzer")
 
@@ -12,15 +14,16 @@ class SQLAnalyzer(ResourceAnalyzer):
     SQL veritabanlarını analiz eden sınıf.
     """
     
-    def __init__(self, azure_client, config):
+    def __init__(self, azure_client, config, inventory=None):
         """
         SQL analizörünü başlatır.
         
         Args:
             azure_client: Azure istemcisi
             config: Uygulama yapılandırması
+            inventory: Önceden yüklenmiş ResourceInventory (isteğe bağlı)
         """
-        super().__init__(azure_client, config)
+        super().__init__(azure_client, config, inventory)
         self.resource_type_name = "SQL Database"
     
     def analyze(self):
@@ -31,52 +34,133 @@ class SQLAnalyzer(ResourceAnalyzer):
             İnaktif SQL veritabanlarının listesi
         """
         logger.info("SQL veritabanları analiz ediliyor...")
-        inactive_dbs = []
         
         try:
-            # Tüm SQL sunucularını listele
-            servers = list(self.azure_client.sql_client.servers.list())
+            # Tüm veritabanlarını al (master veritabanları hariç)
+            databases = [db for db in self.list_resources(SQL_DATABASES, self._list_all_databases)
+                         if db.name.lower() != 'master']
             
-            for server in servers:
-                resource_group = self.azure_client.extract_resource_group(server.id)
-                
-                # Sunucuya ait veritabanlarını listele
-                databases = list(self.azure_client.sql_client.databases.list_by_server(
-                    resource_group, server.name))
-                
-                for db in databases:
-                    # Master veritabanını atla
-                    if db.name.lower() == 'master':
-                        continue
-                    
-                    # DTU kullanım metriklerini al
-                    dtu_usage = self.azure_client.get_resource_metric(
-                        db.id,
-                        'dtu_consumption_percent',
-                        self.config.start_time,
-                        self.config.end_time
-                    )
-                    
-                    # İnaktif mi kontrol et
-                    is_inactive = False
-                    inactive_reason = ""
-                    
-                    if not dtu_usage or self.is_metric_inactive(
-                        dtu_usage, self.config.metric_thresholds['sql_dtu_threshold']):
-                        is_inactive = True
-                        inactive_reason = "Düşük DTU kullanımı"
-                    
-                    if is_inactive:
-                        sku_name = db.sku.name if hasattr(db, 'sku') and db.sku else "Unknown"
-                        db_status = db.status if hasattr(db, 'status') else 'Unknown'
-                        
-                        inactive_dbs.append(self.create_resource_entry(
-                            db, db_status, inactive_reason, sku_name
-                        ))
+            # DTU kullanım metriklerini toplu olarak al
+            db_metrics = self.get_metric_stats_batch(databases, **self._metric_query())
+            
+            entries = self.map_concurrent(
+                lambda db: self._evaluate_database(db, db_metrics.get(db.id, {})), databases)
+            inactive_dbs = [entry for entry in entries if entry]
+            
+            logger.info(f"{len(inactive_dbs)} inaktif SQL veritabanı bulundu.")
+            return inactive_dbs
+            
+        except Exception as e:
+            logger.error(f"SQL veritabanları analiz edilirken hata oluştu: {str(e)}")
+            return []
+    
+    async def analyze_async(self):
+        """
+        SQL veritabanlarını asenkron istemci ile analiz eder.
+        
+        Returns:
+            İnaktif SQL veritabanlarının listesi
+        """
+        logger.info("SQL veritabanları analiz ediliyor (asenkron)...")
+        
+        try:
+            databases = [db for db in await self.list_resources_async(SQL_DATABASES, self._list_all_databases_async)
+                         if db.name.lower() != 'master']
+            
+            db_metrics = await self.get_metric_stats_batch_async(databases, **self._metric_query())
+            
+            inactive_dbs = [
+                entry for entry in (self._evaluate_database(db, db_metrics.get(db.id, {})) for db in databases)
+                if entry
+            ]
             
             logger.info(f"{len(inactive_dbs)} inaktif SQL veritabanı bulundu.")
             return inactive_dbs
             
         except Exception as e:
             logger.error(f"SQL veritabanları analiz edilirken hata oluştu: {str(e)}")
-            return [] 
\ No newline at end of file
+            return []
+    
+    def _metric_query(self):
+        """
+        DTU kullanım metrikleri için sorgu parametrelerini döndürür.
+        """
+        return {
+            'metric_names': ['dtu_consumption_percent'],
+            'idle_thresholds': {'dtu_consumption_percent': self.config.metric_thresholds['sql_dtu_threshold']}
+        }
+    
+    def _list_all_databases(self):
+        """
+        Tüm SQL sunucularını listeler ve veritabanlarını sunucu başına eşzamanlı olarak toplar.
+        
+        Returns:
+            Veritabanı nesneleri listesi
+        """
+        servers = list(self.azure_client.sql_client.servers.list())
+        
+        databases = []
+        for server_databases in self.map_concurrent(self._list_server_databases, servers):
+            databases.extend(server_databases or [])
+        return databases
+    
+    async def _list_all_databases_async(self):
+        """
+        _list_all_databases'in asenkron karşılığı.
+        
+        Returns:
+            Veritabanı nesneleri listesi
+        """
+        servers = await self.azure_client.collect(self.azure_client.sql_client.servers.list())
+        
+        # Sunuculara ait veritabanı listelerini aynı anda iste
+        databases = []
+        for server_databases in await self.map_concurrent_async(self._list_server_databases_async, servers):
+            databases.extend(server_databases or [])
+        return databases
+    
+    def _list_server_databases(self, server):
+        """
+        Bir SQL sunucusuna ait veritabanlarını listeler.
+        
+        Args:
+            server: SQL sunucusu nesnesi
+            
+        Returns:
+            Veritabanı nesneleri listesi
+        """
+        resource_group = ResourceId.parse(server.id).resource_group
+        
+        return list(self.azure_client.sql_client.databases.list_by_server(resource_group, server.name))
+    
+    async def _list_server_databases_async(self, server):
+        """
+        Bir SQL sunucusuna ait veritabanlarını asenkron istemci ile listeler.
+        
+        Returns:
+            Veritabanı nesneleri listesi
+        """
+        resource_group = ResourceId.parse(server.id).resource_group
+        return await self.azure_client.collect(
+            self.azure_client.sql_client.databases.list_by_server(resource_group, server.name))
+    
+    def _evaluate_database(self, db, metrics):
+        """
+        Tek bir veritabanının DTU kullanımını değerlendirir.
+        
+        Args:
+            db: SQL veritabanı nesnesi
+            metrics: Veritabanının metrik istatistikleri
+            
+        Returns:
+            Veritabanı inaktifse kaynak bilgilerini içeren Resource kaydı, değilse None
+        """
+        threshold = self.config.metric_thresholds['sql_dtu_threshold']
+        
+        if not self.is_stats_inactive(metrics.get('dtu_consumption_percent'), threshold):
+            return None
+        
+        sku_name = db.sku.name if hasattr(db, 'sku') and db.sku else "Unknown"
+        db_status = db.status if hasattr(db, 'status') else 'Unknown'
+        
+        return self.create_resource_entry(db, db_status, "Düşük DTU kullanımı", sku_name, metrics) 
\ No newline at end of file
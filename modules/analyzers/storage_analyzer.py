@@ -4,6 +4,7 @@ Storage hesapları için analiz modülü.
 
 import logging
 from modules.analyzers.resource_analyzer import ResourceAnalyzer
+from modules.inventory import STORAGE_ACCOUNTS
 
 logger = logging.getLogger("StorageAnalyzer")
 
@@ -12,15 +13,16 @@ class StorageAnalyzer(ResourceAnalyzer):
     Storage hesaplarını analiz eden sınıf.
     """
     
-    def __init__(self, azure_client, config):
+    def __init__(self, azure_client, config, inventory=None):
         """
         Storage analizörünü başlatır.
         
         Args:
             azure_client: Azure istemcisi
             config: Uygulama yapılandırması
+            inventory: Önceden yüklenmiş ResourceInventory (isteğe bağlı)
         """
-        super().__init__(azure_client, config)
+        super().__init__(azure_client, config, inventory)
         self.resource_type_name = "Storage Account"
     
     def analyze(self):
@@ -31,41 +33,80 @@ class StorageAnalyzer(ResourceAnalyzer):
             İnaktif storage hesaplarının listesi
         """
         logger.info("Storage hesapları analiz ediliyor...")
-        inactive_storages = []
         
         try:
             # Tüm storage hesaplarını listele
-            storage_accounts = list(self.azure_client.storage_client.storage_accounts.list())
+            storage_accounts = self.list_resources(
+                STORAGE_ACCOUNTS, self.azure_client.storage_client.storage_accounts.list)
             
-            for storage in storage_accounts:
-                # İşlem metriklerini al
-                transactions = self.azure_client.get_resource_metric(
-                    storage.id,
-                    'Transactions',
-                    self.config.start_time,
-                    self.config.end_time,
-                    aggregation="Total"  # Toplam işlem sayısı
-                )
-                
-                # İnaktif mi kontrol et
-                is_inactive = False
-                inactive_reason = ""
-                
-                if not transactions or self.is_metric_inactive(
-                    transactions, self.config.metric_thresholds['storage_transactions_threshold']):
-                    is_inactive = True
-                    inactive_reason = "Düşük erişim aktivitesi"
-                
-                if is_inactive:
-                    sku_name = storage.sku.name if hasattr(storage, 'sku') and storage.sku else "Unknown"
-                    
-                    inactive_storages.append(self.create_resource_entry(
-                        storage, 'Available', inactive_reason, sku_name
-                    ))
+            # İşlem metriklerini toplu olarak al
+            storage_metrics = self.get_metric_stats_batch(storage_accounts, **self._metric_query())
+            
+            entries = self.map_concurrent(
+                lambda storage: self._evaluate_storage(storage, storage_metrics.get(storage.id, {})),
+                storage_accounts)
+            inactive_storages = [entry for entry in entries if entry]
             
             logger.info(f"{len(inactive_storages)} inaktif storage hesabı bulundu.")
             return inactive_storages
             
         except Exception as e:
             logger.error(f"Storage hesapları analiz edilirken hata oluştu: {str(e)}")
-            return [] 
\ No newline at end of file
+            return []
+    
+    async def analyze_async(self):
+        """
+        Storage hesaplarını asenkron istemci ile analiz eder.
+        
+        Returns:
+            İnaktif storage hesaplarının listesi
+        """
+        logger.info("Storage hesapları analiz ediliyor (asenkron)...")
+        
+        try:
+            storage_accounts = await self.list_resources_async(STORAGE_ACCOUNTS, lambda: self.azure_client.collect(
+                self.azure_client.storage_client.storage_accounts.list()))
+            storage_metrics = await self.get_metric_stats_batch_async(storage_accounts, **self._metric_query())
+            
+            inactive_storages = [
+                entry for entry in (self._evaluate_storage(storage, storage_metrics.get(storage.id, {}))
+                                    for storage in storage_accounts)
+                if entry
+            ]
+            
+            logger.info(f"{len(inactive_storages)} inaktif storage hesabı bulundu.")
+            return inactive_storages
+            
+        except Exception as e:
+            logger.error(f"Storage hesapları analiz edilirken hata oluştu: {str(e)}")
+            return []
+    
+    def _metric_query(self):
+        """
+        Storage işlem metrikleri için sorgu parametrelerini döndürür.
+        """
+        return {
+            'metric_names': ['Transactions'],
+            'aggregations': "Total",  # Toplam işlem sayısı
+            'idle_thresholds': {'Transactions': self.daily_threshold('storage_transactions_threshold')}
+        }
+    
+    def _evaluate_storage(self, storage, metrics):
+        """
+        Tek bir storage hesabının işlem sayısını değerlendirir.
+        
+        Args:
+            storage: Storage hesabı nesnesi
+            metrics: Hesabın metrik istatistikleri
+            
+        Returns:
+            Hesap inaktifse kaynak bilgilerini içeren Resource kaydı, değilse None
+        """
+        threshold = self.daily_threshold('storage_transactions_threshold')
+        
+        if not self.is_stats_inactive(metrics.get('Transactions'), threshold):
+            return None
+        
+        sku_name = storage.sku.name if hasattr(storage, 'sku') and storage.sku else "Unknown"
+        
+        return self.create_resource_entry(storage, 'Available', "Düşük erişim aktivitesi", sku_name, metrics) 
\ No newline at end of file
@@ -4,6 +4,8 @@ Sanal makineler için analiz modülü.
 
 import logging
 from modules.analyzers.resource_analyzer import ResourceAnalyzer
+from modules.inventory import VIRTUAL_MACHINES
+from modules.resource_id import ResourceId, resource_key
 
 logger = logging.getLogger("VMAnalyzer")
 
@@ -12,15 +14,16 @@ class VMAnalyzer(ResourceAnalyzer):
     Sanal makineleri analiz eden sınıf.
     """
     
-    def __init__(self, azure_client, config):
+    def __init__(self, azure_client, config, inventory=None):
         """
         VM analizörünü başlatır.
         
         Args:
             azure_client: Azure istemcisi
             config: Uygulama yapılandırması
+            inventory: Önceden yüklenmiş ResourceInventory (isteğe bağlı)
         """
-        super().__init__(azure_client, config)
+        super().__init__(azure_client, config, inventory)
         self.resource_type_name = "Virtual Machine"
     
     def analyze(self):
@@ -31,51 +34,222 @@ class VMAnalyzer(ResourceAnalyzer):
             İnaktif sanal makinelerin listesi
         """
         logger.info("Sanal makineler analiz ediliyor...")
-        inactive_vms = []
         
         try:
             # Tüm sanal makineleri listele
-            vms = list(self.azure_client.compute_client.virtual_machines.list_all())
+            vms = self.list_resources(VIRTUAL_MACHINES, self.azure_client.compute_client.virtual_machines.list_all)
             
-            for vm in vms:
-                resource_group = self.azure_client.extract_resource_group(vm.id)
-                
-                # VM'in durumunu kontrol et
-                instance_view = self.azure_client.compute_client.virtual_machines.instance_view(
-                    resource_group, vm.name)
-                power_state = next((status.code for status in instance_view.statuses 
-                                   if status.code.startswith('PowerState/')), None)
-                
-                # VM'in CPU kullanımını al
-                cpu_usage = self.azure_client.get_resource_metric(
-                    vm.id,
-                    'Percentage CPU',
-                    self.config.start_time,
-                    self.config.end_time
-                )
-                
-                # İnaktif mi kontrol et
-                is_inactive = False
-                inactive_reason = ""
-                
-                if power_state == 'PowerState/deallocated':
-                    is_inactive = True
-                    inactive_reason = "VM deallocated durumunda"
-                elif not cpu_usage or self.is_metric_inactive(cpu_usage, self.config.metric_thresholds['vm_cpu_threshold']):
-                    is_inactive = True
-                    inactive_reason = "Düşük CPU kullanımı"
-                
-                if is_inactive:
-                    vm_size = vm.hardware_profile.vm_size
-                    vm_state = power_state.replace('PowerState/', '') if power_state else 'Unknown'
-                    
-                    inactive_vms.append(self.create_resource_entry(
-                        vm, vm_state, inactive_reason, vm_size
-                    ))
+            # Tüm VM'lerin inaktiflik sinyallerini tek geçişte toplu olarak al
+            vm_metrics = self.get_metric_stats_batch(vms, **self._metric_query())
+            
+            # Güç durumlarını VM başına instance_view yerine toplu olarak al
+            power_states = self._collect_power_states(vms)
+            
+            # Her VM'in durumunu sınırlı eşzamanlılıkla değerlendir
+            entries = self.map_concurrent(
+                lambda vm: self._evaluate_vm(vm, vm_metrics.get(vm.id, {}), power_states.get(resource_key(vm.id))), vms)
+            inactive_vms = [entry for entry in entries if entry]
             
             logger.info(f"{len(inactive_vms)} inaktif sanal makine bulundu.")
             return inactive_vms
             
         except Exception as e:
             logger.error(f"Sanal makineler analiz edilirken hata oluştu: {str(e)}")
-            return [] 
\ No newline at end of file
+            return []
+    
+    async def analyze_async(self):
+        """
+        Sanal makineleri asenkron istemci ile analiz eder.
+        
+        Returns:
+            İnaktif sanal makinelerin listesi
+        """
+        logger.info("Sanal makineler analiz ediliyor (asenkron)...")
+        
+        try:
+            vms = await self.list_resources_async(VIRTUAL_MACHINES, lambda: self.azure_client.collect(
+                self.azure_client.compute_client.virtual_machines.list_all()))
+            vm_metrics = await self.get_metric_stats_batch_async(vms, **self._metric_query())
+            power_states = await self._collect_power_states_async(vms)
+            
+            async def evaluate(vm):
+                power_state = power_states.get(resource_key(vm.id)) or await self._get_power_state_async(vm)
+                return self._classify_vm(vm, power_state, vm_metrics.get(vm.id, {}))
+            
+            entries = await self.map_concurrent_async(evaluate, vms)
+            inactive_vms = [entry for entry in entries if entry]
+            
+            logger.info(f"{len(inactive_vms)} inaktif sanal makine bulundu.")
+            return inactive_vms
+            
+        except Exception as e:
+            logger.error(f"Sanal makineler analiz edilirken hata oluştu: {str(e)}")
+            return []
+    
+    def _metric_query(self):
+        """
+        VM inaktiflik sinyalleri için metrik sorgusu parametrelerini döndürür.
+        """
+        thresholds = self.config.metric_thresholds
+        network_threshold = self.daily_threshold('vm_network_threshold')
+        return {
+            'metric_names': ['Percentage CPU', 'Network In Total', 'Network Out Total'],
+            'aggregations': {
+                'Percentage CPU': "Average",
+                'Network In Total': "Total",   # Aralık başına toplam gelen trafik (bayt)
+                'Network Out Total': "Total"   # Aralık başına toplam giden trafik (bayt)
+            },
+            'idle_thresholds': {
+                'Percentage CPU': thresholds['vm_cpu_threshold'],
+                'Network In Total': network_threshold,
+                'Network Out Total': network_threshold
+            }
+        }
+    
+    def _collect_power_states(self, vms):
+        """
+        VM'lerin güç durumlarını toplu olarak toplar.
+        
+        Envanterden gelen VM'ler güç durumunu zaten taşır; eksik kalanlar için
+        aboneliğin tüm VM'leri tek bir status-only liste çağrısıyla alınır.
+        
+        Args:
+            vms: Sanal makine nesneleri listesi
+            
+        Returns:
+            Küçük harfli VM ID'sine göre güç durumu kodu sözlüğü
+        """
+        power_states = self._inventory_power_states(vms)
+        if len(power_states) == len(vms):
+            return power_states
+        
+        try:
+            statuses = self.azure_client.compute_client.virtual_machines.list_all(status_only="true")
+            power_states.update(self._power_states_from_statuses(statuses))
+        except Exception as e:
+            logger.warning(f"Toplu güç durumu alınamadı, VM başına sorgulara geçiliyor: {str(e)}")
+        
+        return power_states
+    
+    async def _collect_power_states_async(self, vms):
+        """
+        VM'lerin güç durumlarını asenkron istemci ile toplu olarak toplar.
+        
+        Returns:
+            Küçük harfli VM ID'sine göre güç durumu kodu sözlüğü
+        """
+        power_states = self._inventory_power_states(vms)
+        if len(power_states) == len(vms):
+            return power_states
+        
+        try:
+            statuses = await self.azure_client.collect(
+                self.azure_client.compute_client.virtual_machines.list_all(status_only="true"))
+            power_states.update(self._power_states_from_statuses(statuses))
+        except Exception as e:
+            logger.warning(f"Toplu güç durumu alınamadı, VM başına sorgulara geçiliyor: {str(e)}")
+        
+        return power_states
+    
+    def _inventory_power_states(self, vms):
+        """
+        Resource Graph envanterinden gelen VM'lerin güç durumlarını döndürür.
+        """
+        return {resource_key(vm.id): vm.power_state for vm in vms if getattr(vm, 'power_state', None)}
+    
+    def _power_states_from_statuses(self, statuses):
+        """
+        Status-only liste sonucundaki VM'lerin güç durumlarını çıkarır.
+        """
+        power_states = {}
+        for vm in statuses:
+            power_state = self._power_state_from_view(vm.instance_view)
+            if power_state:
+                power_states[resource_key(vm.id)] = power_state
+        
+        return power_states
+    
+    def _evaluate_vm(self, vm, metrics, power_state=None):
+        """
+        Tek bir sanal makinenin güç durumunu ve metriklerini değerlendirir.
+        
+        Args:
+            vm: Sanal makine nesnesi
+            metrics: VM'in metrik istatistikleri
+            power_state: Toplu olarak alınmış güç durumu (None ise instance_view sorgulanır)
+            
+        Returns:
+            VM inaktifse kaynak bilgilerini içeren Resource kaydı, değilse None
+        """
+        if power_state is None:
+            resource_group = ResourceId.parse(vm.id).resource_group
+            
+            # VM'in durumunu kontrol et
+            instance_view = self.azure_client.compute_client.virtual_machines.instance_view(
+                resource_group, vm.name)
+            power_state = self._power_state_from_view(instance_view)
+        
+        return self._classify_vm(vm, power_state, metrics)
+    
+    async def _get_power_state_async(self, vm):
+        """
+        VM'in güç durumunu asenkron istemci ile alır.
+        
+        Returns:
+            Güç durumu kodu (örn. PowerState/running) veya None
+        """
+        resource_group = ResourceId.parse(vm.id).resource_group
+        instance_view = await self.azure_client.call(
+            self.azure_client.compute_client.virtual_machines.instance_view, resource_group, vm.name)
+        
+        return self._power_state_from_view(instance_view)
+    
+    def _power_state_from_view(self, instance_view):
+        """
+        Instance view durum kodlarından güç durumunu çıkarır.
+        """
+        if instance_view is None:
+            return None
+        
+        return next((status.code for status in instance_view.statuses or []
+                     if status.code and status.code.startswith('PowerState/')), None)
+    
+    def _classify_vm(self, vm, power_state, metrics):
+        """
+        VM'in güç durumuna ve metriklerine göre inaktif olup olmadığına karar verir.
+        
+        Args:
+            vm: Sanal makine nesnesi
+            power_state: Güç durumu kodu veya None
+            metrics: VM'in metrik istatistikleri
+            
+        Returns:
+            VM inaktifse kaynak bilgilerini içeren Resource kaydı, değilse None
+        """
+        thresholds = self.config.metric_thresholds
+        network_threshold = self.daily_threshold('vm_network_threshold')
+        
+        # VM'in CPU kullanımını ve ağ trafiğini değerlendir
+        cpu_idle = self.is_stats_inactive(metrics.get('Percentage CPU'), thresholds['vm_cpu_threshold'])
+        network_idle = (
+            self.is_stats_inactive(metrics.get('Network In Total'), network_threshold) and
+            self.is_stats_inactive(metrics.get('Network Out Total'), network_threshold))
+        
+        # İnaktif mi kontrol et
+        is_inactive = False
+        inactive_reason = ""
+        
+        if power_state == 'PowerState/deallocated':
+            is_inactive = True
+            inactive_reason = "VM deallocated durumunda"
+        elif cpu_idle and network_idle:
+            is_inactive = True
+            inactive_reason = "Düşük CPU kullanımı ve ağ trafiği"
+        
+        if not is_inactive:
+            return None
+        
+        vm_size = vm.hardware_profile.vm_size
+        vm_state = power_state.replace('PowerState/', '') if power_state else 'Unknown'
+        
+        return self.create_resource_entry(vm, vm_state, inactive_reason, vm_size, metrics) 
\ No newline at end of file
@@ -0,0 +1,296 @@
+"""
+Azure servislerine asenkron (asyncio) olarak bağlanmak için istemci modülü.
+Binlerce metrik ve envanter isteğini tek iş parçacığında eşzamanlı yürütmek için
+azure.mgmt.*.aio istemcilerini kullanır.
+"""
+
+import asyncio
+import logging
+from azure.core.pipeline import AsyncPipelineClient
+from azure.core.pipeline.policies import AsyncBearerTokenCredentialPolicy, AsyncHTTPPolicy, AsyncRetryPolicy
+from azure.identity.aio import DefaultAzureCredential
+from azure.mgmt.resource.resources.aio import ResourceManagementClient
+from azure.mgmt.compute.aio import ComputeManagementClient
+from azure.mgmt.monitor.aio import MonitorManagementClient
+from azure.mgmt.storage.aio import StorageManagementClient
+from azure.mgmt.web.aio import WebSiteManagementClient
+from azure.mgmt.cosmosdb.aio import CosmosDBManagementClient
+from azure.mgmt.sql.aio import SqlManagementClient
+from azure.mgmt.containerservice.aio import ContainerServiceClient
+from modules.azure_client import (MetricsBatchClient, MetricSeriesMixin, RequestScheduler, request_budget_kind,
+                                  subscription_from_url, metric_window, METRICS_BATCH_SCOPE,
+                                  METRICS_DEFAULT_INTERVAL)
+
+logger = logging.getLogger("AsyncAzureClient")
+
+class AsyncThrottlingPolicy(AsyncHTTPPolicy):
+    """
+    ThrottlingPolicy'nin asenkron pipeline'lar için karşılığı; beklemeler olay
+    döngüsünü bloklamaz.
+    """
+    
+    def __init__(self, scheduler, kind=None):
+        """
+        Politikayı başlatır.
+        
+        Args:
+            scheduler: Paylaşılan RequestScheduler nesnesi
+            kind: Sabit bütçe türü (None ise HTTP yöntemine göre belirlenir)
+        """
+        super().__init__()
+        self.scheduler = scheduler
+        self.kind = kind
+    
+    async def send(self, request):
+        subscription_id = subscription_from_url(request.http_request.url)
+        kind = self.kind or request_budget_kind(request.http_request)
+        
+        delay = self.scheduler.reserve(subscription_id, kind)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        
+        response = await self.next.send(request)
+        self.scheduler.update(subscription_id, kind, response.http_response.status_code,
+                              response.http_response.headers)
+        return response
+
+class AsyncMetricsBatchClient(MetricsBatchClient):
+    """
+    Azure Monitor metrics:getBatch uç noktasının asenkron istemcisi.
+    """
+    
+    def _get_pipeline(self, base_url):
+        """
+        Belirtilen temel adres için AsyncPipelineClient döndürür, yoksa oluşturur.
+        """
+        if base_url not in self._pipelines:
+            policies = [AsyncRetryPolicy()]
+            # Yerel (http) sahte uç noktalar için kimlik doğrulama gerekmez
+            if base_url.startswith("https://"):
+                policies.insert(0, AsyncBearerTokenCredentialPolicy(self.credential, METRICS_BATCH_SCOPE))
+            if self.scheduler:
+                policies.append(AsyncThrottlingPolicy(self.scheduler, kind='metrics'))
+            self._pipelines[base_url] = AsyncPipelineClient(base_url=base_url, policies=policies)
+        
+        return self._pipelines[base_url]
+    
+    async def query(self, subscription_id, region, metric_namespace, resource_ids, metric_names,
+                    start_time, end_time, interval=METRICS_DEFAULT_INTERVAL, aggregation="Average"):
+        """
+        Bir kaynak grubunun metriklerini tek istekte alır.
+        
+        Returns:
+            Küçük harfli kaynak ID'sine göre metrik listeleri sözlüğü
+            {resource_id: [metric]}
+        """
+        base_url = self.endpoint.format(region=region)
+        client = self._get_pipeline(base_url)
+        
+        request = self._build_request(base_url, subscription_id, metric_namespace, resource_ids, metric_names,
+                                      start_time, end_time, interval, aggregation)
+        response = await client.send_request(request)
+        response.raise_for_status()
+        
+        return self._parse_values(response.json())
+    
+    async def close(self):
+        """
+        Açık HTTP bağlantılarını kapatır.
+        """
+        for client in self._pipelines.values():
+            await client.close()
+        self._pipelines.clear()
+
+class AsyncAzureClient(MetricSeriesMixin):
+    """
+    Azure servislerine asenkron olarak bağlanmak için kullanılan istemci sınıfı.
+    
+    Tüm istekler tek bir olay döngüsünde çalışır; aynı anda uçuşta olan istek
+    sayısı max_concurrency ile sınırlanır.
+    """
+    
+    def __init__(self, subscription_id, credential, metrics_endpoint=None, metric_cache=None, max_concurrency=256,
+                 scheduler=None):
+        """
+        Asenkron Azure istemcilerini başlatır.
+        
+        Args:
+            subscription_id: Azure Abonelik ID'si
+            credential: azure.identity.aio kimlik bilgisi nesnesi
+            metrics_endpoint: Toplu metrik uç noktası şablonu (None ise Azure Monitor kullanılır)
+            metric_cache: Metrik serileri için MetricCache nesnesi (None ise önbellek kullanılmaz)
+            max_concurrency: Aynı anda uçuşta olabilecek en fazla istek sayısı
+            scheduler: ARM istek bütçesini izleyen RequestScheduler (None ise oluşturulur)
+        """
+        self.subscription_id = subscription_id
+        self.metric_cache = metric_cache
+        self.credential = credential
+        self.limiter = asyncio.Semaphore(max_concurrency)
+        self.scheduler = scheduler or RequestScheduler()
+        
+        # Azure servisleri için asenkron istemcileri oluştur
+        self.resource_client = ResourceManagementClient(credential, subscription_id, **self._client_options())
+        self.compute_client = ComputeManagementClient(credential, subscription_id, **self._client_options())
+        self.monitor_client = MonitorManagementClient(credential, subscription_id, **self._client_options())
+        self.storage_client = StorageManagementClient(credential, subscription_id, **self._client_options())
+        self.web_client = WebSiteManagementClient(credential, subscription_id, **self._client_options())
+        self.cosmosdb_client = CosmosDBManagementClient(credential, subscription_id, **self._client_options())
+        self.sql_client = SqlManagementClient(credential, subscription_id, **self._client_options())
+        self.aks_client = ContainerServiceClient(credential, subscription_id, **self._client_options())
+        self.metrics_batch_client = AsyncMetricsBatchClient(credential, metrics_endpoint, scheduler=self.scheduler)
+        
+        logger.info(f"Asenkron Azure istemcileri başarıyla başlatıldı - Abonelik: {subscription_id}")
+    
+    def _client_options(self):
+        """
+        Yönetim istemcilerine verilecek pipeline seçeneklerini döndürür
+        (bkz. AzureClient._client_options).
+        """
+        return {'custom_hook_policy': AsyncThrottlingPolicy(self.scheduler)}
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    async def close(self):
+        """
+        Tüm asenkron istemcileri ve bağlantılarını kapatır.
+        """
+        for client in (self.resource_client, self.compute_client, self.monitor_client, self.storage_client,
+                       self.web_client, self.cosmosdb_client, self.sql_client, self.aks_client):
+            await client.close()
+        await self.metrics_batch_client.close()
+    
+    async def call(self, func, *args, **kwargs):
+        """
+        Bir SDK çağrısını eşzamanlılık sınırı altında bekler.
+        
+        Args:
+            func: Awaitable döndüren SDK işlevi
+        
+        Returns:
+            Çağrının sonucu
+        """
+        async with self.limiter:
+            return await func(*args, **kwargs)
+    
+    async def collect(self, pager):
+        """
+        Sayfalı bir SDK listesinin tüm öğelerini toplar.
+        
+        Args:
+            pager: AsyncItemPaged nesnesi
+        
+        Returns:
+            Öğe listesi
+        """
+        async with self.limiter:
+            return [item async for item in pager]
+    
+    async def get_multi_metric_series_batch(self, resource_ids, metric_names, start_time, end_time,
+                                            aggregations="Average", locations=None,
+                                            interval=METRICS_DEFAULT_INTERVAL):
+        """
+        Birden fazla kaynağın metrik zaman serilerini toplu olarak alır.
+        
+        AzureClient.get_multi_metric_series_batch ile aynı planlamayı kullanır;
+        tüm parçalar ve tekil geri dönüş sorguları aynı anda uçuşta olur. SQLite
+        önbelleği senkron olduğu için önbellek okuma/yazmaları olay döngüsünü
+        bloklamamak üzere iş parçacığında (asyncio.to_thread) yürütülür.
+        
+        Returns:
+            Kaynak ID'sine göre seri sözlüğü
+            {resource_id: {metric_name: [[zaman damgası, değer]] veya None}}
+        """
+        start_time, end_time = metric_window(start_time, end_time, interval)
+        aggregation_map = self._resolve_aggregations(metric_names, aggregations)
+        results, pending, groups, singles = await asyncio.to_thread(
+            self._plan_series_batch,
+            resource_ids, metric_names, start_time, end_time, aggregation_map, locations, interval)
+        
+        async def fetch_single(resource_id, cached=None):
+            pending_cached, fetch_start = pending[resource_id]
+            if cached is None:
+                cached = pending_cached
+            results[resource_id] = await self._fetch_resource_series(
+                resource_id, metric_names, start_time, end_time, aggregation_map, cached, fetch_start, interval)
+        
+        async def fetch_chunk(region, namespace, fetch_start, chunk):
+            try:
+                async with self.limiter:
+                    batch = await self.metrics_batch_client.query(
+                        self.subscription_id, region, namespace, chunk, metric_names,
+                        fetch_start, end_time, interval=interval,
+                        aggregation=','.join(sorted(set(aggregation_map.values()))))
+            except Exception as e:
+                logger.warning(f"Toplu metrik sorgusu başarısız, tekil sorgulara geçiliyor - "
+                               f"{namespace} ({region}), {', '.join(metric_names)}: {str(e)}")
+                await asyncio.gather(*(fetch_single(resource_id) for resource_id in chunk))
+                return
+            
+            def store_chunk():
+                # Parçanın tüm önbellek yazmaları tek iş parçacığı çağrısında yapılır
+                retries = []
+                for resource_id in chunk:
+                    cached, _ = pending[resource_id]
+                    series, missing = self._store_batch_series(
+                        batch, resource_id, metric_names, start_time, end_time, aggregation_map,
+                        cached, fetch_start, interval)
+                    if missing:
+                        retries.append((resource_id, series))
+                    else:
+                        results[resource_id] = {metric_name: series[metric_name] for metric_name in metric_names}
+                return retries
+            
+            retries = await asyncio.to_thread(store_chunk)
+            
+            # Yanıtta bulunmayan kaynaklar tekil sorguyla yeniden denenir
+            await asyncio.gather(*(fetch_single(resource_id, series) for resource_id, series in retries))
+        
+        await asyncio.gather(
+            *(fetch_single(resource_id) for resource_id in singles),
+            *(fetch_chunk(*chunk) for chunk in self._iter_batch_chunks(groups)))
+        
+        return results
+    
+    async def _fetch_resource_series(self, resource_id, metric_names, start_time, end_time, aggregation_map,
+                                     cached, fetch_start, interval=METRICS_DEFAULT_INTERVAL):
+        """
+        Önbellekte bulunmayan metrikleri tek istekte sorgular ve önbelleğe yazar.
+        
+        Returns:
+            Metrik adına göre seri sözlüğü (alınamayanlar için None)
+        """
+        results = dict(cached)
+        missing = [metric_name for metric_name in metric_names if metric_name not in cached]
+        
+        if missing:
+            try:
+                metrics_data = await self.call(
+                    self.monitor_client.metrics.list,
+                    resource_id,
+                    timespan=f"{fetch_start.isoformat()}/{end_time.isoformat()}",
+                    interval=interval,
+                    metricnames=','.join(missing),
+                    aggregation=','.join(sorted({aggregation_map[name] for name in missing}))
+                )
+                
+                fetched = self._series_from_response(metrics_data, missing, aggregation_map)
+                results.update(await asyncio.to_thread(
+                    self._write_cached_series,
+                    resource_id, fetched, fetch_start, start_time, end_time, aggregation_map, interval))
+            except Exception as e:
+                logger.warning(f"Metrik verisi alınamadı - {resource_id}, {', '.join(missing)}: {str(e)}")
+        
+        return {metric_name: results.get(metric_name) for metric_name in metric_names}
+
+def create_async_credential():
+    """
+    Asenkron istemciler için varsayılan Azure kimlik bilgisini oluşturur.
+    
+    Returns:
+        azure.identity.aio.DefaultAzureCredential nesnesi
+    """
+    return DefaultAzureCredential()
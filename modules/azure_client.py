@@ -2,7 +2,16 @@
 Azure servislerine bağlanmak için istemci modülü.
 """
 
+import re
+import time
 import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from azure.core.pipeline import PipelineClient
+from azure.core.pipeline.policies import BearerTokenCredentialPolicy, HTTPPolicy, RetryPolicy
+from azure.core.rest import HttpRequest
 from azure.identity import DefaultAzureCredential, InteractiveBrowserCredential
 from azure.mgmt.resource import ResourceManagementClient
 from azure.mgmt.compute import ComputeManagementClient
@@ -14,23 +23,314 @@ from azure.mgmt.consumption import ConsumptionManagementClient
 from azure.mgmt.sql import SqlManagementClient
 from azure.mgmt.containerservice import ContainerServiceClient
 from azure.mgmt.reservations import AzureReservationAPI
+from modules.metric_stats import series_means
+from modules.resource_id import ResourceId, resource_key
 
 logger = logging.getLogger("AzureClient")
 
+# Azure Monitor toplu metrik (metrics:getBatch) uç noktası ayarları
+METRICS_BATCH_ENDPOINT = "https://{region}.metrics.monitor.azure.com"
+METRICS_BATCH_SCOPE = "https://metrics.monitor.azure.com/.default"
+METRICS_BATCH_API_VERSION = "2023-10-01"
+METRICS_BATCH_MAX_RESOURCES = 50  # Tek istekte gönderilebilecek en fazla kaynak sayısı
+METRICS_DEFAULT_INTERVAL = 'P1D'
+
+# Cost Management sorgu (Query API) uç noktası ayarları
+COST_QUERY_ENDPOINT = "https://management.azure.com"
+COST_QUERY_SCOPE = "https://management.azure.com/.default"
+COST_QUERY_API_VERSION = "2023-03-01"
+COST_QUERY_MAX_GROUPINGS = 2  # Tek sorguda kullanılabilecek en fazla gruplama sayısı
+
+# Gruplama için kısa adlar ve Cost Management boyut adları
+_COST_DIMENSION_ALIASES = {
+    'resourcegroup': 'ResourceGroupName',
+    'resourcegroupname': 'ResourceGroupName',
+    'resourcetype': 'ResourceType',
+    'resourcelocation': 'ResourceLocation',
+    'location': 'ResourceLocation',
+    'servicename': 'ServiceName',
+    'metercategory': 'MeterCategory'
+}
+
+# Toplam maliyet sütunu API sürümüne ve sözleşme türüne göre farklı adlarla dönebilir
+_COST_COLUMN_ALIASES = ('Cost', 'PreTaxCost', 'totalCost', 'CostUSD')
+
+_SUBSCRIPTION_IN_URL = re.compile(r"/subscriptions/([0-9a-fA-F-]{36})", re.IGNORECASE)
+
+def parse_retry_after(headers, default=None):
+    """
+    Yanıt başlıklarından beklenmesi gereken süreyi (saniye) okur.
+    
+    retry-after-ms, x-ms-retry-after-ms, Retry-After (saniye veya HTTP tarihi) ve
+    Cost Management x-ms-ratelimit-microsoft.costmanagement-*-retry-after başlıkları
+    desteklenir.
+    
+    Args:
+        headers: Yanıt başlıkları (büyük/küçük harf duyarsız eşleme)
+        default: Başlık yoksa döndürülecek değer
+        
+    Returns:
+        Bekleme süresi (saniye) veya default
+    """
+    for header in ('retry-after-ms', 'x-ms-retry-after-ms'):
+        value = headers.get(header)
+        if value:
+            try:
+                return max(0.0, float(value) / 1000.0)
+            except ValueError:
+                pass
+    
+    value = headers.get('retry-after')
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    
+    # Cost Management kısıtlaması sorgu işleme birimi (QPU) başlıklarıyla bildirilir
+    delays = []
+    for scope in ('qpu', 'entity', 'tenant'):
+        value = headers.get(f'x-ms-ratelimit-microsoft.costmanagement-{scope}-retry-after')
+        if value:
+            try:
+                delays.append(max(0.0, float(value)))
+            except ValueError:
+                pass
+    if delays:
+        return max(delays)
+    
+    return default
+
+def subscription_from_url(url):
+    """
+    İstek adresinden abonelik ID'sini çıkarır.
+    
+    Returns:
+        Küçük harfli abonelik ID'si veya None (kiracı düzeyindeki istekler için)
+    """
+    match = _SUBSCRIPTION_IN_URL.search(url or '')
+    return match.group(1).lower() if match else None
+
+def metric_window(start_time, end_time, interval=METRICS_DEFAULT_INTERVAL):
+    """
+    Metrik sorgu penceresini UTC'ye çevirir.
+    
+    Saat dilimi bilgisi olmayan zamanlar yerel saat kabul edilir. Günlük (P1D)
+    aralıkta başlangıç UTC gece yarısına hizalanır; böylece günlük kovalar ilk ve
+    artımlı sorgularda aynı sınırlara düşer ve ilk gün kısmi kalmaz.
+    
+    Returns:
+        (başlangıç, bitiş) saat dilimli UTC zamanları
+    """
+    start_time = start_time.astimezone(timezone.utc)
+    end_time = end_time.astimezone(timezone.utc)
+    if interval == 'P1D':
+        start_time = datetime.combine(start_time.date(), datetime.min.time(), tzinfo=timezone.utc)
+    
+    return start_time, end_time
+
+def request_budget_kind(http_request):
+    """
+    İsteğin hangi ARM bütçesinden düşeceğini belirler.
+    
+    Returns:
+        GET/HEAD için 'reads', diğer yöntemler için 'writes'
+    """
+    return 'reads' if http_request.method.upper() in ('GET', 'HEAD') else 'writes'
+
+class RequestScheduler:
+    """
+    ARM istek bütçesini abonelik ve kiracı kapsamında izleyen merkezi zamanlayıcı.
+    
+    Yanıtlardaki x-ms-ratelimit-remaining-{subscription,tenant}-{reads,writes}
+    başlıklarından kalan bütçe öğrenilir. Bütçe azaldığında istekler yenilenme
+    hızına göre aralıklarla gönderilir; 429 yanıtında Retry-After süresi boyunca
+    ilgili kapsamdaki tüm istekler bekletilir. İş parçacıkları ve olay döngüsü
+    arasında paylaşılabilir.
+    """
+    
+    def __init__(self, low_watermark=50, refill_per_second=25.0, default_retry_after=5.0, clock=time.monotonic):
+        """
+        Zamanlayıcıyı başlatır.
+        
+        Args:
+            low_watermark: Bu değerin altındaki kalan bütçede istekler aralıklandırılır
+            refill_per_second: Kapsam başına saniyede yenilenen istek sayısı (ARM okuma kovası)
+            default_retry_after: 429 yanıtında Retry-After başlığı yoksa beklenecek süre (saniye)
+            clock: Monoton saat işlevi
+        """
+        self.low_watermark = low_watermark
+        self.refill_per_second = refill_per_second
+        self.default_retry_after = default_retry_after
+        self.clock = clock
+        self.throttled = 0
+        self.waited_seconds = 0.0
+        self._remaining = {}  # kapsam -> kalan istek bütçesi
+        self._paused_until = {}  # kapsam -> bekleme bitiş zamanı
+        self._next_slot = {}  # kapsam -> bir sonraki aralıklı istek zamanı
+        self._lock = threading.Lock()
+    
+    def _scopes(self, subscription_id, kind):
+        """
+        Bir isteğin tabi olduğu bütçe kapsamlarını döndürür.
+        """
+        scopes = [('tenant', f"tenant/{kind}")]
+        if subscription_id:
+            scopes.append(('subscription', f"subscription/{subscription_id.lower()}/{kind}"))
+        return scopes
+    
+    def reserve(self, subscription_id, kind='reads'):
+        """
+        Bir istek için bütçeden yer ayırır ve gönderilmeden önce beklenecek süreyi hesaplar.
+        
+        Args:
+            subscription_id: Abonelik ID'si (kiracı düzeyindeki istekler için None)
+            kind: Bütçe türü ('reads', 'writes' veya veri düzlemi için ayrı bir ad)
+            
+        Returns:
+            Bekleme süresi (saniye)
+        """
+        now = self.clock()
+        delay = 0.0
+        
+        with self._lock:
+            for _, scope in self._scopes(subscription_id, kind):
+                delay = max(delay, self._paused_until.get(scope, 0.0) - now)
+                
+                remaining = self._remaining.get(scope)
+                if remaining is None:
+                    continue
+                
+                if remaining <= self.low_watermark:
+                    # Bütçe azaldığında istekleri kovanın yenilenme hızıyla aralıklandır
+                    slot = max(now + delay, self._next_slot.get(scope, 0.0))
+                    self._next_slot[scope] = slot + 1.0 / self.refill_per_second
+                    delay = max(delay, slot - now)
+                
+                # Yanıt gelene kadar eşzamanlı isteklerin azalan bütçeyi görmesi için iyimser düşüş
+                self._remaining[scope] = remaining - 1
+            
+            self.waited_seconds += delay
+        
+        return delay
+    
+    def wait(self, subscription_id, kind='reads'):
+        """
+        Bir istek gönderilebilir olana kadar çağıran iş parçacığını bekletir.
+        """
+        delay = self.reserve(subscription_id, kind)
+        if delay > 0:
+            time.sleep(delay)
+    
+    def update(self, subscription_id, kind, status_code, headers):
+        """
+        Yanıt başlıklarından kalan bütçeyi günceller, 429 yanıtında kapsamı duraklatır.
+        
+        Args:
+            subscription_id: Abonelik ID'si (kiracı düzeyindeki istekler için None)
+            kind: Bütçe türü
+            status_code: HTTP durum kodu
+            headers: Yanıt başlıkları
+        """
+        now = self.clock()
+        
+        with self._lock:
+            reported = {}
+            for level, scope in self._scopes(subscription_id, kind):
+                value = headers.get(f"x-ms-ratelimit-remaining-{level}-{kind}")
+                if value is None:
+                    continue
+                try:
+                    reported[level] = self._remaining[scope] = int(value)
+                except ValueError:
+                    continue
+            
+            if status_code != 429:
+                return
+            
+            self.throttled += 1
+            retry_after = parse_retry_after(headers, self.default_retry_after)
+            
+            # Kiracı bütçesi tükendiyse tüm abonelikler, aksi halde yalnızca bu abonelik bekletilir
+            level = 'subscription' if subscription_id and reported.get('tenant', 1) > 0 else 'tenant'
+            scope = dict(self._scopes(subscription_id, kind))[level]
+            self._paused_until[scope] = max(self._paused_until.get(scope, 0.0), now + retry_after)
+            self._remaining[scope] = 0
+            
+            logger.warning(f"İstek kısıtlandı (429) - {scope}, {retry_after:.1f} sn bekleniyor")
+    
+    def stats(self):
+        """
+        Zamanlayıcı sayaçlarını döndürür.
+        
+        Returns:
+            İstatistik sözlüğü
+        """
+        with self._lock:
+            return {
+                'throttled': self.throttled,
+                'waited_seconds': self.waited_seconds,
+                'remaining': dict(self._remaining)
+            }
+
+class ThrottlingPolicy(HTTPPolicy):
+    """
+    Her isteği RequestScheduler üzerinden zamanlayan azure-core pipeline politikası.
+    
+    Yeniden deneme politikasının arkasında çalışır, böylece her deneme bütçeye
+    tabi olur ve 429 yanıtları diğer istekleri de bekletir.
+    """
+    
+    def __init__(self, scheduler, kind=None):
+        """
+        Politikayı başlatır.
+        
+        Args:
+            scheduler: Paylaşılan RequestScheduler nesnesi
+            kind: Sabit bütçe türü (None ise GET/HEAD için 'reads', diğerleri için 'writes')
+        """
+        super().__init__()
+        self.scheduler = scheduler
+        self.kind = kind
+    
+    def send(self, request):
+        subscription_id = subscription_from_url(request.http_request.url)
+        kind = self.kind or request_budget_kind(request.http_request)
+        
+        self.scheduler.wait(subscription_id, kind)
+        response = self.next.send(request)
+        self.scheduler.update(subscription_id, kind, response.http_response.status_code,
+                              response.http_response.headers)
+        return response
+
 class AzureClientManager:
     """
     Birden fazla Azure hesabı için istemci yöneticisi.
     """
     
-    def __init__(self, credential=None):
+    def __init__(self, credential=None, metrics_endpoint=None, metric_cache=None, scheduler=None,
+                 cost_query_endpoint=None):
         """
         Yönetici sınıfını başlatır.
         
         Args:
             credential: Önceden oluşturulmuş Azure kimlik bilgisi (None ise otomatik oluşturulur)
+            metrics_endpoint: Toplu metrik uç noktası şablonu (None ise Azure Monitor kullanılır)
+            metric_cache: Tüm abonelikler için ortak MetricCache nesnesi (isteğe bağlı)
+            scheduler: Tüm abonelikler için ortak RequestScheduler (None ise oluşturulur)
+            cost_query_endpoint: Cost Management sorgu temel adresi (None ise Azure Resource Manager)
         """
         self._clients = {}  # subscription_id -> AzureClient
+        self._lock = threading.Lock()
         self.credential = credential or self._get_credentials()
+        self.metrics_endpoint = metrics_endpoint
+        self.cost_query_endpoint = cost_query_endpoint
+        self.metric_cache = metric_cache
+        # Kiracı bütçesi tüm aboneliklerde ortak olduğu için zamanlayıcı paylaşılır
+        self.scheduler = scheduler or RequestScheduler()
     
     def _get_credentials(self):
         """
@@ -61,10 +361,15 @@ class AzureClientManager:
         Returns:
             AzureClient nesnesi
         """
-        if subscription_id not in self._clients:
-            self._clients[subscription_id] = AzureClient(subscription_id, self.credential)
-        
-        return self._clients[subscription_id]
+        # Eşzamanlı abonelik taramalarında aynı istemcinin iki kez oluşturulmasını önle
+        with self._lock:
+            if subscription_id not in self._clients:
+                self._clients[subscription_id] = AzureClient(
+                    subscription_id, self.credential, metrics_endpoint=self.metrics_endpoint,
+                    metric_cache=self.metric_cache, scheduler=self.scheduler,
+                    cost_query_endpoint=self.cost_query_endpoint)
+            
+            return self._clients[subscription_id]
     
     def list_subscriptions(self):
         """
@@ -89,36 +394,551 @@ class AzureClientManager:
             logger.error(f"Abonelikler listelenirken hata: {str(e)}")
             return []
 
-class AzureClient:
+class MetricsBatchClient:
+    """
+    Azure Monitor metrics:getBatch uç noktası için istemci.
+    
+    Aynı abonelik, bölge ve kaynak türündeki en fazla 50 kaynağın metriklerini
+    tek bir HTTP isteğiyle alır.
+    """
+    
+    def __init__(self, credential, endpoint=None, api_version=METRICS_BATCH_API_VERSION, scheduler=None):
+        """
+        Toplu metrik istemcisini başlatır.
+        
+        Args:
+            credential: Azure kimlik bilgisi nesnesi
+            endpoint: Uç nokta şablonu, {region} yer tutucusu içerebilir
+                (None ise Azure Monitor uç noktası kullanılır)
+            api_version: Metrik API sürümü
+            scheduler: İstekleri zamanlayacak RequestScheduler (isteğe bağlı)
+        """
+        self.credential = credential
+        self.endpoint = endpoint or METRICS_BATCH_ENDPOINT
+        self.api_version = api_version
+        self.scheduler = scheduler
+        self._pipelines = {}  # base_url -> PipelineClient
+        self._lock = threading.Lock()
+    
+    def _get_pipeline(self, base_url):
+        """
+        Belirtilen temel adres için PipelineClient döndürür, yoksa oluşturur.
+        """
+        with self._lock:
+            if base_url not in self._pipelines:
+                policies = [RetryPolicy()]
+                # Yerel (http) sahte uç noktalar için kimlik doğrulama gerekmez
+                if base_url.startswith("https://"):
+                    policies.insert(0, BearerTokenCredentialPolicy(self.credential, METRICS_BATCH_SCOPE))
+                # Metrik veri düzleminin kısıtlaması ARM okuma bütçesinden ayrı izlenir
+                if self.scheduler:
+                    policies.append(ThrottlingPolicy(self.scheduler, kind='metrics'))
+                self._pipelines[base_url] = PipelineClient(base_url=base_url, policies=policies)
+            
+            return self._pipelines[base_url]
+    
+    def query(self, subscription_id, region, metric_namespace, resource_ids, metric_names,
+              start_time, end_time, interval=METRICS_DEFAULT_INTERVAL, aggregation="Average"):
+        """
+        Bir kaynak grubunun metriklerini tek istekte alır.
+        
+        Args:
+            subscription_id: Azure Abonelik ID'si
+            region: Kaynakların bulunduğu bölge
+            metric_namespace: Kaynak türü (örn. Microsoft.Compute/virtualMachines)
+            resource_ids: Aynı bölge ve türdeki kaynak ID'leri (en fazla 50)
+            metric_names: Metrik adları listesi
+            start_time: Başlangıç zamanı
+            end_time: Bitiş zamanı
+            interval: Zaman aralığı (ISO 8601 süre)
+            aggregation: Toplama yöntemi
+            
+        Returns:
+            Küçük harfli kaynak ID'sine göre metrik listeleri sözlüğü
+            {resource_id: [metric]}
+        """
+        base_url = self.endpoint.format(region=region)
+        client = self._get_pipeline(base_url)
+        
+        request = self._build_request(base_url, subscription_id, metric_namespace, resource_ids, metric_names,
+                                      start_time, end_time, interval, aggregation)
+        response = client.send_request(request)
+        response.raise_for_status()
+        
+        return self._parse_values(response.json())
+    
+    def _build_request(self, base_url, subscription_id, metric_namespace, resource_ids, metric_names,
+                       start_time, end_time, interval, aggregation):
+        """
+        metrics:getBatch isteğini oluşturur.
+        """
+        return HttpRequest(
+            "POST",
+            f"{base_url.rstrip('/')}/subscriptions/{subscription_id}/metrics:getBatch",
+            params={
+                'api-version': self.api_version,
+                'metricnamespace': metric_namespace,
+                'metricnames': ','.join(metric_names),
+                'starttime': start_time.isoformat(),
+                'endtime': end_time.isoformat(),
+                'interval': interval,
+                'aggregation': aggregation
+            },
+            json={'resourceids': list(resource_ids)}
+        )
+    
+    def _parse_values(self, data):
+        """
+        metrics:getBatch yanıtını küçük harfli kaynak ID'sine göre metrik listelerine dönüştürür.
+        """
+        results = {}
+        for item in data.get('values', []):
+            resource_id = item.get('resourceid')
+            if resource_id:
+                results[resource_key(resource_id)] = item.get('value', [])
+        
+        return results
+
+class CostQueryClient:
+    """
+    Cost Management sorgu (Query API) uç noktası için istemci.
+    
+    Maliyetleri sunucu tarafında kaynak ID'sine (ve isteğe bağlı olarak tür, kaynak
+    grubu, bölge veya etiket) göre gruplanmış olarak alır; yanıt kullanım satırı
+    başına değil kaynak başına bir satırdır.
+    """
+    
+    def __init__(self, credential, endpoint=None, api_version=COST_QUERY_API_VERSION, scheduler=None):
+        """
+        Maliyet sorgu istemcisini başlatır.
+        
+        Args:
+            credential: Azure kimlik bilgisi nesnesi
+            endpoint: Temel adres (None ise Azure Resource Manager kullanılır)
+            api_version: Cost Management API sürümü
+            scheduler: İstekleri zamanlayacak RequestScheduler (isteğe bağlı)
+        """
+        self.credential = credential
+        self.endpoint = (endpoint or COST_QUERY_ENDPOINT).rstrip('/')
+        self.api_version = api_version
+        self.scheduler = scheduler
+        self._client = None
+        self._lock = threading.Lock()
+    
+    def _get_pipeline(self):
+        """
+        PipelineClient döndürür, yoksa oluşturur.
+        """
+        with self._lock:
+            if self._client is None:
+                policies = [RetryPolicy()]
+                # Yerel (http) sahte uç noktalar için kimlik doğrulama gerekmez
+                if self.endpoint.startswith("https://"):
+                    policies.insert(0, BearerTokenCredentialPolicy(self.credential, COST_QUERY_SCOPE))
+                # Cost Management kısıtlaması ARM okuma bütçesinden ayrı izlenir
+                if self.scheduler:
+                    policies.append(ThrottlingPolicy(self.scheduler, kind='costmanagement'))
+                self._client = PipelineClient(base_url=self.endpoint, policies=policies)
+            
+            return self._client
+    
+    def query(self, subscription_id, start_date, end_date, group_by=None, granularity="None",
+              cost_type="ActualCost"):
+        """
+        Aboneliğin maliyetlerini kaynak ID'sine göre gruplanmış olarak sayfa sayfa alır.
+        
+        Args:
+            subscription_id: Azure Abonelik ID'si
+            start_date: Başlangıç tarihi (YYYY-MM-DD)
+            end_date: Bitiş tarihi (YYYY-MM-DD, dahil)
+            group_by: ResourceId'ye ek gruplamalar (örn. ['ResourceType'] veya ['tag:env'])
+            granularity: "None" (dönem toplamı), "Daily" veya "Monthly"
+            cost_type: "ActualCost" veya "AmortizedCost"
+            
+        Returns:
+            Sayfa üreteci; her sayfa sütun adına göre satır sözlükleri listesidir.
+            Maliyet sütunu her zaman 'Cost' adıyla döner.
+        """
+        client = self._get_pipeline()
+        body = self._build_body(start_date, end_date, group_by, granularity, cost_type)
+        url = f"{self.endpoint}/subscriptions/{subscription_id}/providers/Microsoft.CostManagement/query"
+        params = {'api-version': self.api_version}
+        
+        while url:
+            response = client.send_request(HttpRequest("POST", url, params=params, json=body))
+            response.raise_for_status()
+            
+            rows, url = self._parse_page(response.json())
+            # nextLink sorgu parametrelerini zaten içerir
+            params = None
+            yield rows
+    
+    def _build_body(self, start_date, end_date, group_by, granularity, cost_type):
+        """
+        Query API istek gövdesini oluşturur.
+        """
+        grouping = [{'type': 'Dimension', 'name': 'ResourceId'}]
+        for name in group_by or []:
+            if name.lower().startswith('tag:'):
+                grouping.append({'type': 'TagKey', 'name': name[4:]})
+            else:
+                grouping.append({'type': 'Dimension', 'name': _COST_DIMENSION_ALIASES.get(name.lower(), name)})
+        
+        if len(grouping) > COST_QUERY_MAX_GROUPINGS:
+            raise ValueError(f"Cost Management sorgusu en fazla {COST_QUERY_MAX_GROUPINGS} gruplama destekler: "
+                             f"{', '.join(item['name'] for item in grouping)}")
+        
+        return {
+            'type': cost_type,
+            'timeframe': 'Custom',
+            'timePeriod': {
+                'from': f"{start_date}T00:00:00Z",
+                'to': f"{end_date}T23:59:59Z"
+            },
+            'dataset': {
+                'granularity': granularity,
+                'aggregation': {'totalCost': {'name': 'Cost', 'function': 'Sum'}},
+                'grouping': grouping
+            }
+        }
+    
+    def _parse_page(self, data):
+        """
+        Query API yanıtını satır sözlüklerine dönüştürür.
+        
+        Returns:
+            (satır sözlükleri listesi, sonraki sayfa adresi veya None)
+        """
+        properties = data.get('properties') or {}
+        columns = [column['name'] for column in properties.get('columns', [])]
+        columns = ['Cost' if name in _COST_COLUMN_ALIASES else name for name in columns]
+        
+        rows = [dict(zip(columns, row)) for row in properties.get('rows', [])]
+        return rows, properties.get('nextLink') or None
+
+class MetricSeriesMixin:
+    """
+    Senkron ve asenkron istemcilerin ortak kullandığı metrik serisi yardımcıları.
+    
+    Önbellek okuma/yazma, toplu sorgu planlama ve yanıt ayrıştırma işlemleri
+    ağ çağrısı yapmaz; sınıfın metric_cache ve subscription_id niteliklerine dayanır.
+    """
+    
+    def _plan_series_batch(self, resource_ids, metric_names, start_time, end_time, aggregation_map,
+                           locations, interval=METRICS_DEFAULT_INTERVAL):
+        """
+        Toplu metrik sorgusunu planlar: önbellekte eksiksiz bulunan kaynakları ayırır,
+        kalanları bölge, kaynak türü ve sorgu başlangıcına göre gruplar.
+        
+        Returns:
+            (önbellekten gelen sonuçlar {resource_id: seriler},
+             bekleyenler {resource_id: (önbellekten okunan seriler, sorgu başlangıcı)},
+             gruplar {(region, namespace, fetch_start): [resource_id]},
+             bölgesi bilinmeyen kaynak ID'leri listesi)
+        """
+        locations = locations or {}
+        results = {}
+        pending = {}
+        groups = defaultdict(list)
+        singles = []
+        
+        for resource_id in resource_ids:
+            cached, fetch_start = self._read_cached_series(
+                resource_id, metric_names, start_time, end_time, aggregation_map, interval)
+            if len(cached) == len(metric_names):
+                results[resource_id] = cached
+                continue
+            
+            pending[resource_id] = (cached, fetch_start)
+            region = (locations.get(resource_id) or '').replace(' ', '').lower()
+            namespace = ResourceId.parse(resource_id).type
+            
+            if region and namespace:
+                groups[(region, namespace, fetch_start)].append(resource_id)
+            else:
+                singles.append(resource_id)
+        
+        return results, pending, groups, singles
+    
+    def _iter_batch_chunks(self, groups):
+        """
+        Sorgu gruplarını en fazla METRICS_BATCH_MAX_RESOURCES kaynaklık parçalara böler.
+        
+        Returns:
+            (region, namespace, fetch_start, chunk) demetleri üreteci
+        """
+        for (region, namespace, fetch_start), group_ids in groups.items():
+            for i in range(0, len(group_ids), METRICS_BATCH_MAX_RESOURCES):
+                yield region, namespace, fetch_start, group_ids[i:i + METRICS_BATCH_MAX_RESOURCES]
+    
+    def _series_from_batch(self, batch, resource_id, metric_names, aggregation_map):
+        """
+        Toplu sorgu yanıtından bir kaynağın metrik serilerini çıkarır.
+        
+        Returns:
+            Metrik adına göre seri sözlüğü (yalnızca yanıtta bulunan metrikler)
+        """
+        series = {}
+        for metric in batch.get(resource_key(resource_id), []):
+            metric_name = self._match_metric_name((metric.get('name') or {}).get('value'), metric_names)
+            timeseries = metric.get('timeseries')
+            if metric_name and timeseries:
+                series[metric_name] = self._extract_series(
+                    timeseries[0].get('data', []), aggregation_map[metric_name])
+        
+        return series
+    
+    def _store_batch_series(self, batch, resource_id, metric_names, start_time, end_time, aggregation_map,
+                            cached, fetch_start, interval=METRICS_DEFAULT_INTERVAL):
+        """
+        Toplu sorgu yanıtındaki serileri önbelleğe yazar ve önbellekten okunanlarla birleştirir.
+        
+        Yanıtta bulunmayan kaynak/metrik çiftleri önbelleğe boş seri olarak yazılmaz;
+        bunlar tekil sorguyla yeniden denenmek üzere eksik olarak döner.
+        
+        Returns:
+            (metrik adına göre seriler, yanıtta bulunmayan metrik adları listesi)
+        """
+        series = dict(cached)
+        fetched = self._series_from_batch(batch, resource_id, metric_names, aggregation_map)
+        if fetched:
+            series.update(self._write_cached_series(
+                resource_id, fetched, fetch_start, start_time, end_time, aggregation_map, interval))
+        
+        return series, [metric_name for metric_name in metric_names if metric_name not in series]
+    
+    def _series_from_response(self, metrics_data, metric_names, aggregation_map):
+        """
+        SDK metrik yanıtından metrik serilerini çıkarır.
+        
+        Returns:
+            Metrik adına göre seri sözlüğü (yanıtta olmayanlar için boş seri)
+        """
+        series = {metric_name: [] for metric_name in metric_names}
+        for metric in metrics_data.value or []:
+            metric_name = self._match_metric_name(metric.name.value, metric_names)
+            if metric_name and metric.timeseries:
+                series[metric_name] = self._extract_series(
+                    metric.timeseries[0].data, aggregation_map[metric_name])
+        
+        return series
+    
+    def _read_cached_series(self, resource_id, metric_names, start_time, end_time, aggregation_map,
+                            interval=METRICS_DEFAULT_INTERVAL):
+        """
+        Metrik serilerini önbellekten okur ve eksikler için sorgu başlangıcını belirler.
+        
+        Günlük seriler artımlı olarak saklanır: yerelde kapanmış günleri eksiksiz
+        olan metrikler önbellekten döner, diğerleri için yalnızca ilk eksik günden
+        itibaren sorgu yapılır.
+        
+        Returns:
+            (önbellekte bulunan seriler {metric_name: seri}, sorgu başlangıç zamanı)
+        """
+        if self.metric_cache is None:
+            return {}, start_time
+        
+        cached = {}
+        
+        if interval == 'P1D':
+            start_day, end_day = start_time.date(), end_time.date()
+            fetch_days = []
+            for metric_name in metric_names:
+                series_key = self.metric_cache.daily_key(
+                    resource_id, metric_name, aggregation_map[metric_name])
+                fetch_from = self.metric_cache.plan_daily_fetch(series_key, start_day, end_day)
+                if fetch_from is None:
+                    cached[metric_name] = self.metric_cache.read_daily_series(series_key, start_day, end_day)
+                else:
+                    fetch_days.append(fetch_from)
+            
+            if not fetch_days:
+                return cached, start_time
+            
+            # UTC gün sınırına hizala, pencere başlangıcından önceye gitme
+            return cached, max(start_time, datetime.combine(min(fetch_days), datetime.min.time(),
+                                                            tzinfo=timezone.utc))
+        
+        for metric_name in metric_names:
+            key = self.metric_cache.make_key(resource_id, metric_name, start_time, end_time,
+                                             interval, aggregation_map[metric_name])
+            series = self.metric_cache.get(key)
+            if series is not None:
+                cached[metric_name] = series
+        
+        return cached, start_time
+    
+    def _write_cached_series(self, resource_id, series_by_metric, fetch_start, start_time, end_time, aggregation_map,
+                             interval=METRICS_DEFAULT_INTERVAL):
+        """
+        Alınan metrik serilerini önbelleğe yazar.
+        
+        Günlük seriler yerel kayıtlarla birleştirilir ve analiz penceresinin
+        tamamı için birleşik seri döndürülür.
+        
+        Returns:
+            Metrik adına göre analiz penceresine ait seriler
+        """
+        if self.metric_cache is None:
+            return series_by_metric
+        
+        if interval == 'P1D':
+            start_day, end_day = start_time.date(), end_time.date()
+            series_keys = {
+                metric_name: self.metric_cache.daily_key(resource_id, metric_name, aggregation_map[metric_name])
+                for metric_name, series in series_by_metric.items() if series is not None
+            }
+            
+            self.metric_cache.put_daily_many([
+                (series_key, series_by_metric[metric_name], fetch_start.date(), end_day)
+                for metric_name, series_key in series_keys.items()
+            ])
+            
+            return {
+                metric_name: (self.metric_cache.read_daily_series(series_keys[metric_name], start_day, end_day)
+                              if metric_name in series_keys else None)
+                for metric_name in series_by_metric
+            }
+        
+        self.metric_cache.put_many([
+            (self.metric_cache.make_key(resource_id, metric_name, start_time, end_time,
+                                        interval, aggregation_map[metric_name]),
+             series, end_time)
+            for metric_name, series in series_by_metric.items() if series is not None
+        ])
+        
+        return series_by_metric
+    
+    def _resolve_aggregations(self, metric_names, aggregations):
+        """
+        Her metrik için kullanılacak toplama yöntemini belirler.
+        
+        Args:
+            metric_names: Metrik adları listesi
+            aggregations: Ortak toplama yöntemi veya {metric_name: aggregation} sözlüğü
+            
+        Returns:
+            Metrik adına göre toplama yöntemleri sözlüğü
+        """
+        if isinstance(aggregations, dict):
+            return {name: aggregations.get(name, "Average") for name in metric_names}
+        
+        return {name: aggregations for name in metric_names}
+    
+    def _match_metric_name(self, returned_name, metric_names):
+        """
+        Yanıttaki metrik adını istenen metrik adlarından biriyle eşleştirir.
+        
+        Returns:
+            İstenen metrik adı veya None
+        """
+        if not returned_name:
+            return None
+        
+        return next((name for name in metric_names if name.lower() == returned_name.lower()), None)
+    
+    def _extract_series(self, points, aggregation):
+        """
+        Metrik veri noktalarından toplama yöntemine göre zaman serisi çıkarır.
+        
+        Args:
+            points: SDK veri noktası nesneleri veya REST yanıtındaki sözlükler
+            aggregation: Toplama yöntemi (Average, Total, Maximum, Minimum)
+            
+        Returns:
+            [zaman damgası, değer] çiftleri listesi (değer None olabilir)
+        """
+        field = aggregation.lower()
+        series = []
+        for point in points:
+            # Toplama yöntemine göre değeri al
+            if isinstance(point, dict):
+                timestamp = point.get('timeStamp')
+                value = point.get(field)
+            else:
+                timestamp = point.time_stamp.isoformat() if point.time_stamp else None
+                value = getattr(point, field, None)
+            series.append([timestamp, value])
+        
+        return series
+    
+    def extract_resource_group(self, resource_id):
+        """
+        Kaynak ID'sinden resource group adını çıkarır.
+        
+        Args:
+            resource_id: Azure kaynak ID'si
+            
+        Returns:
+            Resource group adı
+        """
+        return ResourceId.parse(resource_id).resource_group
+    
+    def extract_resource_type(self, resource_id):
+        """
+        Kaynak ID'sinden tam kaynak türünü çıkarır.
+        
+        Args:
+            resource_id: Azure kaynak ID'si
+            
+        Returns:
+            Kaynak türü (örn. Microsoft.Sql/servers/databases) veya None
+        """
+        return ResourceId.parse(resource_id).type
+
+class AzureClient(MetricSeriesMixin):
     """
     Azure servislerine bağlanmak için kullanılan istemci sınıfı.
     """
     
-    def __init__(self, subscription_id, credential=None):
+    def __init__(self, subscription_id, credential=None, metrics_endpoint=None, metric_cache=None, scheduler=None,
+                 cost_query_endpoint=None):
         """
         Azure istemcilerini başlatır.
         
         Args:
             subscription_id: Azure Abonelik ID'si
             credential: Azure kimlik bilgisi nesnesi (None ise otomatik oluşturulur)
+            metrics_endpoint: Toplu metrik uç noktası şablonu (None ise Azure Monitor kullanılır)
+            metric_cache: Metrik serileri için MetricCache nesnesi (None ise önbellek kullanılmaz)
+            scheduler: ARM istek bütçesini izleyen RequestScheduler (None ise oluşturulur)
+            cost_query_endpoint: Cost Management sorgu temel adresi (None ise Azure Resource Manager)
         """
         self.subscription_id = subscription_id
+        self.metric_cache = metric_cache
+        self.scheduler = scheduler or RequestScheduler()
         self.credential = credential or self._get_credentials()
         
         # Azure servisleri için istemcileri oluştur
-        self.resource_client = ResourceManagementClient(self.credential, subscription_id)
-        self.compute_client = ComputeManagementClient(self.credential, subscription_id)
-        self.monitor_client = MonitorManagementClient(self.credential, subscription_id)
-        self.storage_client = StorageManagementClient(self.credential, subscription_id)
-        self.web_client = WebSiteManagementClient(self.credential, subscription_id)
-        self.cosmosdb_client = CosmosDBManagementClient(self.credential, subscription_id)
-        self.consumption_client = ConsumptionManagementClient(self.credential, subscription_id)
-        self.sql_client = SqlManagementClient(self.credential, subscription_id)
-        self.aks_client = ContainerServiceClient(self.credential, subscription_id)
-        self.reservation_client = AzureReservationAPI(self.credential)
+        self.resource_client = ResourceManagementClient(self.credential, subscription_id, **self._client_options())
+        self.compute_client = ComputeManagementClient(self.credential, subscription_id, **self._client_options())
+        self.monitor_client = MonitorManagementClient(self.credential, subscription_id, **self._client_options())
+        self.storage_client = StorageManagementClient(self.credential, subscription_id, **self._client_options())
+        self.web_client = WebSiteManagementClient(self.credential, subscription_id, **self._client_options())
+        self.cosmosdb_client = CosmosDBManagementClient(self.credential, subscription_id, **self._client_options())
+        self.consumption_client = ConsumptionManagementClient(
+            self.credential, subscription_id, **self._client_options())
+        self.sql_client = SqlManagementClient(self.credential, subscription_id, **self._client_options())
+        self.aks_client = ContainerServiceClient(self.credential, subscription_id, **self._client_options())
+        self.reservation_client = AzureReservationAPI(self.credential, **self._client_options())
+        self.metrics_batch_client = MetricsBatchClient(self.credential, metrics_endpoint, scheduler=self.scheduler)
+        self.cost_query_client = CostQueryClient(self.credential, cost_query_endpoint, scheduler=self.scheduler)
         
         logger.info(f"Azure istemcileri başarıyla başlatıldı - Abonelik: {subscription_id}")
     
+    def _client_options(self):
+        """
+        Yönetim istemcilerine verilecek pipeline seçeneklerini döndürür.
+        
+        Oluşturulan istemcilerin custom_hook_policy yuvası yeniden deneme politikasından
+        sonra çalışır; zamanlayıcı politikası bu yuvaya yerleştirilir. Politikalar
+        pipeline'a bağlandığı için her istemciye ayrı bir örnek verilir.
+        
+        Returns:
+            İstemci oluşturma seçenekleri sözlüğü
+        """
+        return {'custom_hook_policy': ThrottlingPolicy(self.scheduler)}
+    
     def _get_credentials(self):
         """
         Azure kimlik bilgilerini döndürür.
@@ -153,50 +973,205 @@ class AzureClient:
         Returns:
             Ortalama metrik değeri veya None (metrik yoksa)
         """
-        try:
-            metrics_data = self.monitor_client.metrics.list(
-                resource_id,
-                timespan=f"{start_time.isoformat()}/{end_time.isoformat()}",
-                interval='P1D',
-                metricnames=metric_name,
-                aggregation=aggregation
-            )
-            
-            # Metrikleri topla
-            if metrics_data.value and metrics_data.value[0].timeseries:
-                values = []
-                for point in metrics_data.value[0].timeseries[0].data:
-                    # Toplama yöntemine göre değeri al
-                    if aggregation == 'Average' and point.average is not None:
-                        values.append(point.average)
-                    elif aggregation == 'Total' and point.total is not None:
-                        values.append(point.total)
-                    elif aggregation == 'Maximum' and point.maximum is not None:
-                        values.append(point.maximum)
-                    elif aggregation == 'Minimum' and point.minimum is not None:
-                        values.append(point.minimum)
-                
-                # Değerlerin ortalamasını al
-                if values:
-                    return sum(values) / len(values)
+        return self.get_resource_metrics(
+            resource_id, [metric_name], start_time, end_time, aggregation)[metric_name]
+    
+    def get_resource_metrics(self, resource_id, metric_names, start_time, end_time, aggregations="Average"):
+        """
+        Bir kaynağın birden fazla metriğini tek istekte alır.
+        
+        Args:
+            resource_id: Azure kaynak ID'si
+            metric_names: Metrik adları listesi
+            start_time: Başlangıç zamanı
+            end_time: Bitiş zamanı
+            aggregations: Tüm metrikler için toplama yöntemi ya da metrik adına göre
+                toplama yöntemleri sözlüğü {metric_name: aggregation}
             
-            return None
-        except Exception as e:
-            logger.warning(f"Metrik verisi alınamadı - {resource_id}, {metric_name}: {str(e)}")
-            return None
+        Returns:
+            Metrik adına göre ortalama değerler sözlüğü {metric_name: değer veya None}
+        """
+        series = self.get_resource_metric_series(
+            resource_id, metric_names, start_time, end_time, aggregations)
+        
+        means = series_means(list(series.values()))
+        return dict(zip(series.keys(), means))
     
-    def extract_resource_group(self, resource_id):
+    def get_resource_metric_series(self, resource_id, metric_names, start_time, end_time, aggregations="Average",
+                                   interval=METRICS_DEFAULT_INTERVAL):
         """
-        Kaynak ID'sinden resource group adını çıkarır.
+        Bir kaynağın metrik zaman serilerini alır, önbellekte olanları yeniden sorgulamaz.
         
         Args:
             resource_id: Azure kaynak ID'si
+            metric_names: Metrik adları listesi
+            start_time: Başlangıç zamanı
+            end_time: Bitiş zamanı
+            aggregations: Ortak toplama yöntemi veya {metric_name: aggregation} sözlüğü
+            interval: Zaman aralığı (ISO 8601 süre, örn. P1D veya PT1H)
             
         Returns:
-            Resource group adı
+            Metrik adına göre seri sözlüğü {metric_name: [[zaman damgası, değer]] veya None}
+        """
+        start_time, end_time = metric_window(start_time, end_time, interval)
+        aggregation_map = self._resolve_aggregations(metric_names, aggregations)
+        cached, fetch_start = self._read_cached_series(
+            resource_id, metric_names, start_time, end_time, aggregation_map, interval)
+        
+        return self._fetch_resource_series(
+            resource_id, metric_names, start_time, end_time, aggregation_map, cached, fetch_start, interval)
+    
+    def get_resource_metrics_batch(self, resource_ids, metric_name, start_time, end_time,
+                                   aggregation="Average", locations=None):
+        """
+        Birden fazla kaynağın tek bir metriğini toplu olarak alır.
+        
+        Args:
+            resource_ids: Azure kaynak ID'leri listesi
+            metric_name: Metrik adı
+            start_time: Başlangıç zamanı
+            end_time: Bitiş zamanı
+            aggregation: Toplama yöntemi (Average, Total, Maximum, Minimum)
+            locations: Kaynak ID'sine göre bölge sözlüğü {resource_id: location}
+            
+        Returns:
+            Kaynak ID'sine göre ortalama metrik değerleri sözlüğü
+            {resource_id: değer veya None}
+        """
+        results = self.get_multi_metrics_batch(
+            resource_ids, [metric_name], start_time, end_time, aggregation, locations)
+        
+        return {resource_id: values[metric_name] for resource_id, values in results.items()}
+    
+    def get_multi_metrics_batch(self, resource_ids, metric_names, start_time, end_time,
+                                aggregations="Average", locations=None):
+        """
+        Birden fazla kaynağın birden fazla metriğini toplu olarak alır.
+        
+        Args:
+            resource_ids: Azure kaynak ID'leri listesi
+            metric_names: Metrik adları listesi
+            start_time: Başlangıç zamanı
+            end_time: Bitiş zamanı
+            aggregations: Tüm metrikler için toplama yöntemi ya da metrik adına göre
+                toplama yöntemleri sözlüğü {metric_name: aggregation}
+            locations: Kaynak ID'sine göre bölge sözlüğü {resource_id: location}
+            
+        Returns:
+            Kaynak ID'sine göre metrik değerleri sözlüğü
+            {resource_id: {metric_name: değer veya None}}
+        """
+        series = self.get_multi_metric_series_batch(
+            resource_ids, metric_names, start_time, end_time, aggregations, locations)
+        
+        results = {resource_id: {} for resource_id in series}
+        for metric_name in metric_names:
+            # Her metrik için tüm kaynakların ortalamaları tek vektörel geçişte hesaplanır
+            means = series_means([metrics.get(metric_name) for metrics in series.values()])
+            for resource_id, mean in zip(series.keys(), means):
+                results[resource_id][metric_name] = mean
+        
+        return results
+    
+    def get_multi_metric_series_batch(self, resource_ids, metric_names, start_time, end_time,
+                                      aggregations="Average", locations=None, interval=METRICS_DEFAULT_INTERVAL):
+        """
+        Birden fazla kaynağın metrik zaman serilerini toplu olarak alır.
+        
+        Önbellekte tüm metrikleri bulunan kaynaklar sorgulanmaz; günlük seriler için
+        yalnızca yerelde bulunmayan günler istenir. Kalan kaynaklar bölge, kaynak türü
+        ve sorgu başlangıcına göre gruplanır, her grup en fazla 50 kaynaklık parçalar
+        halinde tek istekle sorgulanır. Bölgesi bilinmeyen kaynaklar, başarısız olan
+        parçalar ve yanıtta bulunmayan kaynaklar için tekil sorguya geri dönülür.
+        
+        Args:
+            resource_ids: Azure kaynak ID'leri listesi
+            metric_names: Metrik adları listesi
+            start_time: Başlangıç zamanı
+            end_time: Bitiş zamanı
+            aggregations: Ortak toplama yöntemi veya {metric_name: aggregation} sözlüğü
+            locations: Kaynak ID'sine göre bölge sözlüğü {resource_id: location}
+            interval: Zaman aralığı (ISO 8601 süre, örn. P1D veya PT1H)
+            
+        Returns:
+            Kaynak ID'sine göre seri sözlüğü
+            {resource_id: {metric_name: [[zaman damgası, değer]] veya None}}
         """
-        parts = resource_id.split('/')
-        for i, part in enumerate(parts):
-            if part.lower() == 'resourcegroups' and i + 1 < len(parts):
-                return parts[i + 1]
-        return None 
\ No newline at end of file
+        start_time, end_time = metric_window(start_time, end_time, interval)
+        aggregation_map = self._resolve_aggregations(metric_names, aggregations)
+        results, pending, groups, singles = self._plan_series_batch(
+            resource_ids, metric_names, start_time, end_time, aggregation_map, locations, interval)
+        
+        for resource_id in singles:
+            cached, fetch_start = pending[resource_id]
+            results[resource_id] = self._fetch_resource_series(
+                resource_id, metric_names, start_time, end_time, aggregation_map, cached, fetch_start, interval)
+        
+        for region, namespace, fetch_start, chunk in self._iter_batch_chunks(groups):
+            try:
+                batch = self.metrics_batch_client.query(
+                    self.subscription_id, region, namespace, chunk, metric_names,
+                    fetch_start, end_time, interval=interval,
+                    aggregation=','.join(sorted(set(aggregation_map.values()))))
+            except Exception as e:
+                logger.warning(f"Toplu metrik sorgusu başarısız, tekil sorgulara geçiliyor - "
+                               f"{namespace} ({region}), {', '.join(metric_names)}: {str(e)}")
+                for resource_id in chunk:
+                    cached, _ = pending[resource_id]
+                    results[resource_id] = self._fetch_resource_series(
+                        resource_id, metric_names, start_time, end_time, aggregation_map,
+                        cached, fetch_start, interval)
+                continue
+            
+            for resource_id in chunk:
+                cached, _ = pending[resource_id]
+                series, missing = self._store_batch_series(
+                    batch, resource_id, metric_names, start_time, end_time, aggregation_map,
+                    cached, fetch_start, interval)
+                if missing:
+                    # Yanıtta bulunmayan kaynaklar tekil sorguyla yeniden denenir
+                    series = self._fetch_resource_series(
+                        resource_id, metric_names, start_time, end_time, aggregation_map,
+                        series, fetch_start, interval)
+                results[resource_id] = {metric_name: series.get(metric_name) for metric_name in metric_names}
+        
+        return results
+    
+    def _fetch_resource_series(self, resource_id, metric_names, start_time, end_time, aggregation_map,
+                               cached, fetch_start, interval=METRICS_DEFAULT_INTERVAL):
+        """
+        Önbellekte bulunmayan metrikleri tek istekte sorgular ve önbelleğe yazar.
+        
+        Args:
+            resource_id: Azure kaynak ID'si
+            metric_names: Metrik adları listesi
+            start_time: Analiz penceresinin başlangıcı
+            end_time: Analiz penceresinin bitişi
+            aggregation_map: Metrik adına göre toplama yöntemleri
+            cached: Önbellekten okunmuş seriler {metric_name: seri}
+            fetch_start: Sorgunun başlangıç zamanı (artımlı sorgularda pencere başlangıcından sonra olabilir)
+            interval: Zaman aralığı (ISO 8601 süre)
+            
+        Returns:
+            Metrik adına göre seri sözlüğü (alınamayanlar için None)
+        """
+        results = dict(cached)
+        missing = [metric_name for metric_name in metric_names if metric_name not in cached]
+        
+        if missing:
+            try:
+                metrics_data = self.monitor_client.metrics.list(
+                    resource_id,
+                    timespan=f"{fetch_start.isoformat()}/{end_time.isoformat()}",
+                    interval=interval,
+                    metricnames=','.join(missing),
+                    aggregation=','.join(sorted({aggregation_map[name] for name in missing}))
+                )
+                
+                fetched = self._series_from_response(metrics_data, missing, aggregation_map)
+                results.update(self._write_cached_series(
+                    resource_id, fetched, fetch_start, start_time, end_time, aggregation_map, interval))
+            except Exception as e:
+                logger.warning(f"Metrik verisi alınamadı - {resource_id}, {', '.join(missing)}: {str(e)}")
+        
+        return {metric_name: results.get(metric_name) for metric_name in metric_names}
@@ -28,21 +28,28 @@ class AccountConfig:
         # Analiz için tarih aralıkları
         self.end_time = datetime.now()
         self.start_time = self.end_time - timedelta(days=days_inactive)
+        self.metric_interval = 'P1D'  # Metrik zaman aralığı (saatlik analiz için PT1H)
+        self.resource_concurrency = 16  # Analizör başına eşzamanlı kaynak çağrısı sınırı
+        self.async_concurrency = 256  # Asenkron motorda analizör başına uçuştaki istek sınırı
         
         # Maliyet analizleri için tarih aralıkları
         self.today = datetime.now().date()
         first_day_prev_month = (self.today.replace(day=1) - timedelta(days=1)).replace(day=1)
         self.cost_start_date = first_day_prev_month.strftime('%Y-%m-%d')
         self.cost_end_date = self.today.strftime('%Y-%m-%d')
+        self.cost_partition_days = 7  # Kullanım detayları penceresinin bölüneceği gün sayısı (0 ise bölünmez)
+        self.cost_fetch_concurrency = 4  # Abonelik başına eşzamanlı sorgulanan en fazla bölüm sayısı
         
         # Metrik analizi için eşik değerleri
         self.metric_thresholds = {
             'vm_cpu_threshold': 5.0,            # %5 CPU kullanımından az
-            'app_service_requests_threshold': 10.0,  # Günde 10 istek veya daha az
-            'storage_transactions_threshold': 100.0,  # Günde 100 işlem veya daha az
+            'vm_network_threshold': 5 * 1024 * 1024,  # Günde 5 MB ağ trafiğinden az (metrik aralığına ölçeklenir)
+            'app_service_requests_threshold': 10.0,  # Günde 10 istek veya daha az (metrik aralığına ölçeklenir)
+            'storage_transactions_threshold': 100.0,  # Günde 100 işlem veya daha az (metrik aralığına ölçeklenir)
             'sql_dtu_threshold': 5.0,           # %5 DTU kullanımından az
-            'cosmos_requests_threshold': 10.0,   # Günde 10 istek veya daha az
-            'aks_cpu_threshold': 10.0           # %10 CPU kullanımından az
+            'cosmos_requests_threshold': 10.0,   # Günde 10 istek veya daha az (metrik aralığına ölçeklenir)
+            'aks_cpu_threshold': 10.0,          # %10 CPU kullanımından az
+            'aks_memory_threshold': 20.0        # %20 bellek kullanımından az
         }
 
 class AppConfig:
@@ -60,6 +67,33 @@ class AppConfig:
         """
         self.accounts = accounts or []
         self.output_dir = output_dir
+        self.max_workers = 4  # Eşzamanlı analiz edilecek en fazla abonelik sayısı
+        self.engine = 'thread'  # Tarama motoru: 'thread' veya 'async'
+        
+        # Resource Graph envanteri ayarları (resource_graph_endpoint None ise Azure Resource Manager)
+        self.use_resource_graph = True
+        self.resource_graph_endpoint = None
+        
+        # Maliyet kaynağı ayarları: 'query' (Cost Management Query API), 'export' (yerel
+        # dışa aktarım dosyaları) veya 'usage' (Consumption kullanım detayları);
+        # 'query' ve 'export' hata durumunda kullanım detaylarına geri döner
+        self.cost_source = 'query'
+        self.cost_export_path = None  # Dışa aktarım dosyası veya dizini ('export' kaynağı için)
+        self.cost_group_by = []  # ResourceId'ye ek gruplama (örn. ['ResourceType'] veya ['tag:env'])
+        self.cost_granularity = 'None'  # 'None', 'Daily' veya 'Monthly'
+        self.cost_query_endpoint = None  # None ise Azure Resource Manager
+        
+        # Geçmiş maliyet deposu; isteğe bağlıdır (örn. ".cache/costs"). Depo açıkken Query API
+        # günlük ayrıntı düzeyinde sorgulanır, None ise günlük maliyetler saklanmaz
+        self.cost_store_path = None
+        
+        # Retail Prices anlık görüntüsü (JSON/CSV dosyası veya dizin); None ise tasarruflar sabit oranlarla tahmin edilir
+        self.price_catalog_path = None
+        
+        # Metrik önbelleği ayarları (metric_cache_path None ise önbellek kapalı)
+        self.metric_cache_path = os.path.join(".cache", "metrics.sqlite")
+        self.metric_cache_ttl = 6 * 3600        # Açık zaman aralıkları için 6 saat
+        self.metric_cache_max_entries = 200000
         
         # Analiz için tarih aralıkları
         self.end_time = datetime.now()
@@ -74,9 +108,11 @@ class AppConfig:
         # Metrik analizi için eşik değerleri
         self.metric_thresholds = {
             'vm_cpu_threshold': 5.0,            # %5 CPU kullanımından az
-            'app_service_requests_threshold': 10.0,  # Günde 10 istek veya daha az
-            'storage_transactions_threshold': 100.0,  # Günde 100 işlem veya daha az
+            'vm_network_threshold': 5 * 1024 * 1024,  # Günde 5 MB ağ trafiğinden az (metrik aralığına ölçeklenir)
+            'app_service_requests_threshold': 10.0,  # Günde 10 istek veya daha az (metrik aralığına ölçeklenir)
+            'storage_transactions_threshold': 100.0,  # Günde 100 işlem veya daha az (metrik aralığına ölçeklenir)
             'sql_dtu_threshold': 5.0,           # %5 DTU kullanımından az
-            'cosmos_requests_threshold': 10.0,   # Günde 10 istek veya daha az
-            'aks_cpu_threshold': 10.0           # %10 CPU kullanımından az
+            'cosmos_requests_threshold': 10.0,   # Günde 10 istek veya daha az (metrik aralığına ölçeklenir)
+            'aks_cpu_threshold': 10.0,          # %10 CPU kullanımından az
+            'aks_memory_threshold': 20.0        # %20 bellek kullanımından az
         } 
\ No newline at end of file
@@ -2,8 +2,12 @@
 Azure kaynakları için maliyet analizi modülü.
 """
 
+import time
 import logging
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from modules.cost_index import CostIndex, cost_index_key
+from modules.resource_id import ResourceId
 
 logger = logging.getLogger("CostAnalyzer")
 
@@ -12,69 +16,332 @@ class CostAnalyzer:
     Azure kaynaklarının maliyetlerini analiz eden sınıf.
     """
     
-    def __init__(self, azure_client, config):
+    def __init__(self, azure_client, config, cost_indexes=None, cost_source='query', group_by=None,
+                 granularity="None", cost_export=None, daily=False, cost_store=None):
         """
         Maliyet analizörünü başlatır.
         
         Args:
             azure_client: Azure istemcisi
             config: Uygulama yapılandırması
+            cost_indexes: (abonelik, tarih aralığı) anahtarlı paylaşılan maliyet dizinleri
+                sözlüğü (None ise dizinler yalnızca bu analizör içinde paylaşılır)
+            cost_source: Maliyet kaynağı; 'query' (Cost Management Query API), 'export'
+                (yerel dışa aktarım dosyaları) veya 'usage' (Consumption kullanım detayları).
+                'query' ve 'export' hata durumunda kullanım detaylarına geri döner.
+            group_by: Query API'de ResourceId'ye ek gruplama (örn. ['ResourceType'] veya ['tag:env'])
+            granularity: Query API ayrıntı düzeyi ("None", "Daily" veya "Monthly")
+            cost_export: 'export' kaynağı için paylaşılan CostExport nesnesi
+            daily: True ise maliyet dizini kaynak başına günlük maliyetleri de tutar
+                (Query API sorgusu günlük ayrıntı düzeyinde yapılır)
+            cost_store: Paylaşılan CostStore nesnesi; verilirse günlük maliyetler depoya
+                yazılır ve API kaynaklarında yalnızca depoda kapanmamış günler sorgulanır
         """
         self.azure_client = azure_client
         self.config = config
+        self.cost_indexes = cost_indexes if cost_indexes is not None else {}
+        self.cost_source = cost_source
+        self.group_by = list(group_by or [])
+        self.cost_export = cost_export
+        self.cost_store = cost_store
+        self.daily = daily or cost_store is not None
+        # Kaynak başına toplamda ayrıntı düzeyi sonucu değiştirmez; günlük dizinler gün gerektirir
+        self.granularity = 'Daily' if self.daily else granularity
+    
+    def get_cost_index(self):
+        """
+        Aboneliğin yapılandırılmış tarih aralığı için maliyet dizinini döndürür.
         
-    def get_high_cost_resources(self):
+        Dizin (abonelik, tarih aralığı) başına bir kez oluşturulur ve sonraki
+        çağrılarda yeniden kullanılır.
+        
+        Returns:
+            CostIndex nesnesi
         """
-        Yüksek maliyetli kaynakları belirler.
+        key = cost_index_key(self.azure_client.subscription_id, self.config.cost_start_date,
+                             self.config.cost_end_date)
+        cost_index = self.cost_indexes.get(key)
+        
+        if cost_index is None:
+            cost_index = self._build_cost_index()
+            self.cost_indexes[key] = cost_index
+        
+        return cost_index
+    
+    def _build_cost_index(self):
+        """
+        Maliyet dizinini yapılandırılmış kaynaktan oluşturur.
+        
+        Maliyet deposu varsa API kaynaklarında dizin artımlı olarak oluşturulur:
+        yalnızca depoda kapanmamış veya hiç alınmamış günler sorgulanır, pencere
+        toplamı depodaki günlük satırlardan yeniden hesaplanır.
         
         Returns:
-            Yüksek maliyetli kaynaklar listesi
+            CostIndex nesnesi
         """
-        logger.info("Yüksek maliyetli kaynaklar analiz ediliyor...")
-        high_cost_resources = []
+        started = time.perf_counter()
+        start_date, end_date = self.config.cost_start_date, self.config.cost_end_date
+        
+        if self.cost_store is not None and self.cost_source != 'export':
+            cost_index = self._build_incremental_cost_index(start_date, end_date)
+        else:
+            cost_index = self._fetch_costs(start_date, end_date)
+            if self.cost_store is not None:
+                self._store_costs(cost_index)
+        
+        cost_index.seconds = time.perf_counter() - started
+        
+        logger.info(f"Maliyet dizini oluşturuldu ({cost_index.source}) - {cost_index.rows_read} satır, "
+                    f"{cost_index.pages_read} sayfa, {len(cost_index)} kaynak, {cost_index.seconds:.2f} sn")
+        return cost_index
+    
+    def _build_incremental_cost_index(self, start_date, end_date):
+        """
+        Maliyet dizinini depodaki günlük maliyetlerden artımlı olarak oluşturur.
+        
+        Kapanmış günler depodan okunur; ilk açık veya eksik günden pencere sonuna
+        kadar olan günler sorgulanıp depoya yazılır.
+        
+        Args:
+            start_date: Pencerenin ilk günü (YYYY-MM-DD)
+            end_date: Pencerenin son günü (YYYY-MM-DD)
+        
+        Returns:
+            CostIndex nesnesi
+        """
+        subscription_id = self.azure_client.subscription_id
+        fetch_from = self.cost_store.plan_fetch(subscription_id, start_date, end_date)
         
+        cost_index = self._new_cost_index('store')
+        
+        # Kapanmış günler depodan okunur
+        stored_until = end_date
+        if fetch_from is not None:
+            stored_until = (datetime.strptime(fetch_from, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+        
+        if stored_until >= start_date:
+            for row in self.cost_store.read_daily(subscription_id, start_date, stored_until):
+                cost_index.add(row['resource_id'], row['cost'], name=row['name'],
+                               resource_type=row['resource_type'], resource_group=row['resource_group'],
+                               location=row['location'], currency=row['currency'], usage_date=row['date'])
+        
+        # Açık ve eksik günler sorgulanır, depoya yazılır ve dizine eklenir
+        if fetch_from is not None:
+            fetched = self._fetch_costs(fetch_from, end_date)
+            self._store_costs(fetched, fetch_from, end_date)
+            cost_index.merge(fetched)
+            cost_index.source = f"{fetched.source}+store" if fetch_from > start_date else fetched.source
+        
+        logger.info(f"Maliyet deposu: {subscription_id} - "
+                    f"{'sorgulanan ilk gün ' + fetch_from if fetch_from else 'tüm günler depodan okundu'}")
+        return cost_index
+    
+    def _store_costs(self, cost_index, start_date=None, end_date=None):
+        """
+        Dizindeki günlük maliyetleri depoya yazar; yazma hatası analizi durdurmaz.
+        """
         try:
-            # Son fatura döneminin maliyet verilerini al
-            usage_details = list(self.azure_client.consumption_client.usage_details.list(
-                scope=f"/subscriptions/{self.azure_client.subscription_id}",
-                filter=f"properties/usageStart ge '{self.config.cost_start_date}' and properties/usageEnd le '{self.config.cost_end_date}'"
-            ))
-            
-            # Kaynak ID'sine göre maliyetleri grupla
-            resource_costs = {}
-            
-            for usage in usage_details:
-                if not usage.resource_id:
-                    continue  # Kaynak ID'si olmayan öğeleri atla
+            self.cost_store.write(cost_index, account=getattr(self.config, 'display_name', None),
+                                  start_date=start_date, end_date=end_date)
+        except Exception as e:
+            logger.warning(f"Maliyetler depoya yazılamadı ({self.azure_client.subscription_id}): {str(e)}")
+    
+    def _fetch_costs(self, start_date, end_date):
+        """
+        Bir tarih aralığının maliyetlerini yapılandırılmış kaynaktan alır.
+        
+        Query API ve dışa aktarım aralığı tek seferde okur; Query API sayfaları
+        nextLink ile izlenir. Sorgu veya dışa aktarım okuması başarısız olursa
+        (yetki, desteklenmeyen sözleşme türü vb.) kullanım detaylarına geri dönülür.
+        
+        Args:
+            start_date: Başlangıç tarihi (YYYY-MM-DD)
+            end_date: Bitiş tarihi (YYYY-MM-DD)
+        
+        Returns:
+            CostIndex nesnesi
+        """
+        if self.cost_source == 'query':
+            try:
+                cost_index = self._new_cost_index('query', start_date, end_date)
+                self._load_query_costs(cost_index)
+                return cost_index
+            except Exception as e:
+                logger.warning(f"Cost Management sorgusu başarısız, kullanım detaylarına geçiliyor: {str(e)}")
+        
+        elif self.cost_source == 'export' and self.cost_export is not None:
+            try:
+                cost_index = self._new_cost_index('export', start_date, end_date)
+                self._load_export_costs(cost_index)
+                return cost_index
+            except Exception as e:
+                logger.warning(f"Maliyet dışa aktarımı okunamadı, kullanım detaylarına geçiliyor: {str(e)}")
+        
+        return self._fetch_usage_costs(start_date, end_date)
+    
+    def _fetch_usage_costs(self, start_date, end_date):
+        """
+        Bir tarih aralığının maliyetlerini Consumption kullanım detaylarından alır.
+        
+        Aralık config.cost_partition_days günlük bölümlere ayrılır ve bölümler
+        config.cost_fetch_concurrency sınırıyla eşzamanlı sorgulanır. İstekler
+        abonelikler arasında paylaşılan RequestScheduler'dan geçtiği için bir
+        bölümdeki 429 yanıtı diğer bölümleri de bekletir. Bölüm dizinleri sonunda
+        tek dizinde birleştirilir.
+        
+        Args:
+            start_date: Başlangıç tarihi (YYYY-MM-DD)
+            end_date: Bitiş tarihi (YYYY-MM-DD)
+        
+        Returns:
+            CostIndex nesnesi
+        """
+        partitions = date_partitions(start_date, end_date, getattr(self.config, 'cost_partition_days', 0))
+        
+        if len(partitions) == 1:
+            return self._fetch_usage_partition(start_date, end_date)
+        
+        max_workers = max(1, min(getattr(self.config, 'cost_fetch_concurrency', 1), len(partitions)))
+        with ThreadPoolExecutor(max_workers=max_workers,
+                                thread_name_prefix=f"cost-{self.azure_client.subscription_id[:8]}") as executor:
+            partial_indexes = list(executor.map(lambda partition: self._fetch_usage_partition(*partition),
+                                                partitions))
+        
+        cost_index = self._new_cost_index('usage_details', start_date, end_date)
+        for partial_index in partial_indexes:
+            cost_index.merge(partial_index)
+        
+        logger.info(f"Kullanım detayları {len(partitions)} bölümde alındı ({max_workers} eşzamanlı) - "
+                    f"{self.azure_client.subscription_id}, {start_date} - {end_date}")
+        return cost_index
+    
+    def _fetch_usage_partition(self, start_date, end_date):
+        """
+        Bir tarih bölümünün kullanım detaylarını yeni bir maliyet dizinine okur.
+        
+        Args:
+            start_date: Başlangıç tarihi (YYYY-MM-DD)
+            end_date: Bitiş tarihi (YYYY-MM-DD)
+        
+        Returns:
+            CostIndex nesnesi
+        """
+        cost_index = self._new_cost_index('usage_details', start_date, end_date)
+        self._load_usage_details(cost_index)
+        return cost_index
+    
+    def _new_cost_index(self, source, start_date=None, end_date=None):
+        """
+        Aboneliğin tarih aralığı (varsayılan: yapılandırılmış aralık) için boş bir maliyet dizini oluşturur.
+        """
+        cost_index = CostIndex(self.azure_client.subscription_id, start_date or self.config.cost_start_date,
+                               end_date or self.config.cost_end_date, daily=self.daily)
+        cost_index.source = source
+        return cost_index
+    
+    def _load_query_costs(self, cost_index):
+        """
+        Kaynak başına toplam maliyetleri Cost Management Query API ile alır.
+        
+        Sunucu maliyetleri kaynak ID'sine göre gruplar.
+        
+        Args:
+            cost_index: Doldurulacak CostIndex nesnesi
+        """
+        pages = self.azure_client.cost_query_client.query(
+            self.azure_client.subscription_id, cost_index.start_date, cost_index.end_date,
+            group_by=self.group_by, granularity=self.granularity)
+        
+        for page in pages:
+            for row in page:
+                cost_index.rows_read += 1
                 
-                resource_id = usage.resource_id.lower()
-                cost = usage.pretax_cost or 0
+                resource_id = row.get('ResourceId')
+                if not resource_id:
+                    continue  # Kaynak ID'si olmayan maliyetleri atla
                 
-                if resource_id not in resource_costs:
-                    resource_costs[resource_id] = {
-                        'id': usage.resource_id,
-                        'name': usage.resource_name or 'Unknown',
-                        'type': usage.resource_type or 'Unknown',
-                        'resource_group': usage.resource_group or 'Unknown',
-                        'location': usage.resource_location or 'Unknown',
-                        'cost': 0,
-                        'currency': usage.billing_currency or 'USD'
-                    }
+                # Günlük sorgularda UsageDate YYYYMMDD biçiminde bir sayıdır
+                usage_date = row.get('UsageDate')
+                if usage_date:
+                    usage_date = str(usage_date)
+                    usage_date = f"{usage_date[:4]}-{usage_date[4:6]}-{usage_date[6:8]}"
                 
-                resource_costs[resource_id]['cost'] += cost
+                self._add_resource_cost(cost_index, resource_id, row.get('Cost'), row.get('ResourceType'),
+                                        row.get('ResourceGroupName'), row.get('ResourceLocation'),
+                                        row.get('Currency'), usage_date)
             
-            # Maliyet eşiğini aşan kaynakları belirle
-            threshold = self.config.cost_threshold
-            for resource_id, resource in resource_costs.items():
-                if resource['cost'] >= threshold:
-                    high_cost_resources.append(resource)
-            
-            # Maliyete göre azalan sıralama
-            high_cost_resources.sort(key=lambda x: x['cost'], reverse=True)
+            cost_index.pages_read += 1
+    
+    def _load_export_costs(self, cost_index):
+        """
+        Kaynak başına toplam maliyetleri yerel dışa aktarım dosyalarından alır.
+        
+        Dosyalar ilk abonelikte bir kez okunur; sonraki abonelikler aynı toplam
+        tablosundan beslenir ve API çağrısı yapılmaz.
+        
+        Args:
+            cost_index: Doldurulacak CostIndex nesnesi
+        """
+        for record in self.cost_export.resources(self.azure_client.subscription_id):
+            cost_index.rows_read += int(record['rows'])
+            self._add_resource_cost(cost_index, record['resource_id'], record['cost'], record['resource_type'],
+                                    record['resource_group'], record['location'], record['currency'],
+                                    record['usage_date'])
+        
+        cost_index.pages_read = self.cost_export.chunks_read
+    
+    def _add_resource_cost(self, cost_index, resource_id, cost, resource_type=None, resource_group=None,
+                           location=None, currency=None, usage_date=None):
+        """
+        Kaynak başına toplanmış bir maliyeti dizine ekler; eksik tür ve kaynak grubu
+        bilgisi kaynak ID'sinden çıkarılır.
+        """
+        parsed = ResourceId.parse(resource_id)
+        cost_index.add(
+            resource_id,
+            cost,
+            name=parsed.name,
+            resource_type=resource_type or parsed.type,
+            resource_group=resource_group or parsed.resource_group,
+            location=location,
+            currency=currency,
+            usage_date=usage_date
+        )
+    
+    def _load_usage_details(self, cost_index):
+        """
+        Kullanım detaylarını Consumption API'den okuyarak maliyet dizinini doldurur.
+        
+        Satırlar sayfa sayfa toplanır ve hiçbir zaman bir listede biriktirilmez;
+        bellek kullanımı satır sayısıyla değil farklı kaynak sayısıyla orantılıdır.
+        
+        Args:
+            cost_index: Doldurulacak CostIndex nesnesi
+        """
+        usage_details = self.azure_client.consumption_client.usage_details.list(
+            scope=f"/subscriptions/{self.azure_client.subscription_id}",
+            filter=f"properties/usageStart ge '{cost_index.start_date}' and properties/usageEnd le '{cost_index.end_date}'"
+        )
+        
+        for page in usage_details.by_page():
+            cost_index.add_page(page)
+    
+    def get_high_cost_resources(self):
+        """
+        Yüksek maliyetli kaynakları belirler.
+        
+        Returns:
+            Yüksek maliyetli kaynaklar listesi
+        """
+        logger.info("Yüksek maliyetli kaynaklar analiz ediliyor...")
+        
+        try:
+            # Maliyet eşiğini aşan kaynakları maliyete göre azalan sırada al
+            high_cost_resources = self.get_cost_index().resources_above(self.config.cost_threshold)
             
             logger.info(f"{len(high_cost_resources)} yüksek maliyetli kaynak bulundu.")
             return high_cost_resources
-            
+        
         except Exception as e:
             logger.error(f"Maliyet verileri alınırken hata oluştu: {str(e)}")
             return []
@@ -90,32 +357,58 @@ class CostAnalyzer:
             return
         
         try:
-            # Maliyet verilerini al
-            usage_details = list(self.azure_client.consumption_client.usage_details.list(
-                scope=f"/subscriptions/{self.azure_client.subscription_id}",
-                filter=f"properties/usageStart ge '{self.config.cost_start_date}' and properties/usageEnd le '{self.config.cost_end_date}'"
-            ))
-            
-            # Kaynak ID'sine göre maliyet verileri sözlüğü oluştur
-            cost_dict = {}
-            for usage in usage_details:
-                if not usage.resource_id:
-                    continue
-                
-                resource_id = usage.resource_id.lower()
-                cost = usage.pretax_cost or 0
-                
-                if resource_id not in cost_dict:
-                    cost_dict[resource_id] = 0
-                
-                cost_dict[resource_id] += cost
+            cost_index = self.get_cost_index()
             
             # Kaynak listesine maliyet verilerini ekle
             for resource in resources:
-                resource_id = resource['id'].lower()
-                resource['cost'] = cost_dict.get(resource_id, 0)
+                resource.cost = cost_index.cost(resource.id)
             
             logger.info(f"{len(resources)} kaynağa maliyet verileri eklendi.")
+        
+        except Exception as e:
+            logger.error(f"Kaynaklara maliyet verileri eklenirken hata oluştu: {str(e)}")
+    
+    def add_costs_to_table(self, table, kind='inactive'):
+        """
+        Kaynak tablosundaki bu aboneliğe ait satırlara maliyetleri vektörel olarak ekler.
+        
+        Args:
+            table: ResourceTable nesnesi (yerinde güncellenir, kayıtlara da yazılır)
+            kind: Maliyeti eklenecek kayıt türü
+        """
+        try:
+            cost_index = self.get_cost_index()
+            
+            updated = table.join_costs(cost_index.costs(), kind=kind,
+                                       subscription_id=self.azure_client.subscription_id)
             
+            logger.info(f"{updated} kaynağa maliyet verileri eklendi.")
+        
         except Exception as e:
-            logger.error(f"Kaynaklara maliyet verileri eklenirken hata oluştu: {str(e)}") 
\ No newline at end of file
+            logger.error(f"Kaynaklara maliyet verileri eklenirken hata oluştu: {str(e)}")
+
+def date_partitions(start_date, end_date, days):
+    """
+    Bir tarih aralığını ardışık, çakışmayan bölümlere ayırır.
+    
+    Args:
+        start_date: Başlangıç tarihi (YYYY-MM-DD)
+        end_date: Bitiş tarihi (YYYY-MM-DD, dahil)
+        days: Bölüm başına gün sayısı (0 veya None ise aralık bölünmez)
+    
+    Returns:
+        (başlangıç, bitiş) tarih çiftleri listesi
+    """
+    if not days or days <= 0:
+        return [(start_date, end_date)]
+    
+    partitions = []
+    day = datetime.strptime(start_date, '%Y-%m-%d')
+    last_day = datetime.strptime(end_date, '%Y-%m-%d')
+    
+    while day <= last_day:
+        partition_end = min(day + timedelta(days=days - 1), last_day)
+        partitions.append((day.strftime('%Y-%m-%d'), partition_end.strftime('%Y-%m-%d')))
+        day = partition_end + timedelta(days=1)
+    
+    return partitions or [(start_date, end_date)]
@@ -0,0 +1,253 @@
+"""
+Cost Management dışa aktarımlarından (CSV/Parquet) maliyet okuma modülü.
+Zamanlanmış dışa aktarım dosyalarını parça parça okuyup kaynak başına toplar;
+maliyet zenginleştirmesi için API çağrısı gerekmez.
+"""
+
+import os
+import glob
+import time
+import logging
+import threading
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("CostExport")
+
+EXPORT_CHUNK_ROWS = 500000  # Parça başına okunacak satır sayısı
+
+# Dışa aktarım şemaları (EA, MCA, eski kullanım ve FOCUS) farklı sütun adları kullanır;
+# her standart sütun için ilk eşleşen ad kullanılır (büyük/küçük harf duyarsız)
+EXPORT_COLUMNS = {
+    'resource_id': ('resourceid', 'instanceid'),
+    'cost': ('costinbillingcurrency', 'pretaxcost', 'billedcost', 'cost', 'costinusd'),
+    'resource_type': ('resourcetype',),
+    'resource_group': ('resourcegroup', 'resourcegroupname', 'x_resourcegroupname'),
+    'location': ('resourcelocation', 'location', 'regionname'),
+    'currency': ('billingcurrency', 'billingcurrencycode', 'currency'),
+    'date': ('date', 'usagedatetime', 'usagedate', 'chargeperiodstart')
+}
+
+_METADATA_COLUMNS = ('resource_id', 'resource_type', 'resource_group', 'location', 'currency')
+
+class CostExport:
+    """
+    Bir veya daha fazla dışa aktarım dosyasındaki maliyetleri küçük harfli kaynak
+    ID'sine göre toplayan okuyucu.
+    
+    Dosyalar ilk kullanımda bir kez okunur; sonuç tüm abonelikler arasında paylaşılır.
+    """
+    
+    def __init__(self, path, start_date=None, end_date=None, chunk_rows=EXPORT_CHUNK_ROWS, daily=False):
+        """
+        Okuyucuyu başlatır.
+        
+        Args:
+            path: Dışa aktarım dosyası veya dosyaları içeren dizin (.csv, .csv.gz, .parquet)
+            start_date: Bu tarihten önceki satırları yok say (YYYY-MM-DD, isteğe bağlı)
+            end_date: Bu tarihten sonraki satırları yok say (YYYY-MM-DD, dahil, isteğe bağlı)
+            chunk_rows: Parça başına okunacak satır sayısı
+            daily: True ise maliyetler kaynak ve gün başına toplanır
+        """
+        self.path = path
+        self.start_date = start_date
+        self.end_date = end_date
+        self.chunk_rows = chunk_rows
+        self.daily = daily
+        self.rows_read = 0
+        self.chunks_read = 0
+        self.seconds = 0.0
+        self._table = None  # Kaynak başına toplam maliyet tablosu (indeks: küçük harfli kaynak ID'si)
+        self._lock = threading.Lock()
+    
+    def files(self):
+        """
+        Okunacak dışa aktarım dosyalarını döndürür.
+        
+        Returns:
+            Sıralı dosya yolları listesi
+        """
+        if os.path.isfile(self.path):
+            return [self.path]
+        
+        files = []
+        for pattern in ('*.csv', '*.csv.gz', '*.parquet'):
+            files.extend(glob.glob(os.path.join(self.path, '**', pattern), recursive=True))
+        return sorted(files)
+    
+    def _resolve_columns(self, names):
+        """
+        Dosya sütun adlarını standart sütun adlarına eşler.
+        
+        Args:
+            names: Dosyadaki sütun adları
+        
+        Returns:
+            {dosya sütunu: standart sütun} sözlüğü
+        """
+        by_lower = {name.lower(): name for name in names}
+        mapping = {}
+        for column, aliases in EXPORT_COLUMNS.items():
+            source = next((by_lower[alias] for alias in aliases if alias in by_lower), None)
+            if source:
+                mapping[source] = column
+        
+        missing = {'resource_id', 'cost'} - set(mapping.values())
+        if missing:
+            raise ValueError(f"Dışa aktarım dosyasında gerekli sütunlar bulunamadı: {', '.join(sorted(missing))}")
+        
+        return mapping
+    
+    def _read_csv_chunks(self, path):
+        """
+        CSV dosyasını yalnızca gerekli sütunlarla parça parça okur.
+        """
+        mapping = self._resolve_columns(pd.read_csv(path, nrows=0).columns)
+        dtypes = {source: ('float64' if column == 'cost' else 'string') for source, column in mapping.items()}
+        
+        reader = pd.read_csv(
+            path,
+            usecols=list(mapping),
+            dtype=dtypes,
+            chunksize=self.chunk_rows,
+            # Sıkıştırılmamış dosyalar işletim sistemi sayfa önbelleğinden eşlenerek okunur
+            memory_map=not path.endswith('.gz')
+        )
+        for chunk in reader:
+            yield chunk.rename(columns=mapping)
+    
+    def _read_parquet_chunks(self, path):
+        """
+        Parquet dosyasını satır grupları halinde yalnızca gerekli sütunlarla okur.
+        """
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet dışa aktarımları için pyarrow paketi gereklidir: pip install pyarrow")
+        
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        mapping = self._resolve_columns(parquet_file.schema_arrow.names)
+        
+        for batch in parquet_file.iter_batches(batch_size=self.chunk_rows, columns=list(mapping)):
+            yield batch.to_pandas().rename(columns=mapping)
+    
+    def iter_chunks(self):
+        """
+        Tüm dışa aktarım dosyalarını standart sütunlu DataFrame parçaları halinde döndürür.
+        """
+        for path in self.files():
+            if path.endswith('.parquet'):
+                yield from self._read_parquet_chunks(path)
+            else:
+                yield from self._read_csv_chunks(path)
+    
+    def _aggregate_chunk(self, chunk):
+        """
+        Bir parçayı vektörel olarak kaynak (ve günlük toplamada gün) başına toplar.
+        
+        Returns:
+            Küçük harfli kaynak ID'sine (ve güne) göre indekslenmiş toplam tablosu
+        """
+        chunk = chunk[chunk['resource_id'].notna() & (chunk['resource_id'] != '')]
+        keys = [chunk['resource_id'].str.lower().rename('key')]
+        
+        if 'date' in chunk and (self.start_date or self.end_date or self.daily):
+            # Bir parçada yalnızca birkaç farklı gün bulunur; tarihler tekil değerler üzerinden ayrıştırılır
+            codes, days = pd.factorize(chunk['date'])
+            days = pd.to_datetime(pd.Series(days), errors='coerce', format='mixed').dt.strftime('%Y-%m-%d')
+            # Tarih aralığı verilmediyse tarihi okunamayan satırlar da toplama katılır
+            in_days = days.notna() if (self.start_date or self.end_date) else pd.Series(True, index=days.index)
+            if self.start_date:
+                in_days &= days >= self.start_date
+            if self.end_date:
+                in_days &= days <= self.end_date
+            
+            # Tarihi boş satırların kodu -1'dir; sona eklenen değer yalnızca aralık yoksa True olur
+            mask = np.append(in_days.to_numpy(dtype=bool), not (self.start_date or self.end_date))[codes]
+            chunk = chunk[mask]
+            keys = [keys[0][mask]]
+            
+            if self.daily:
+                day_values = np.append(days.to_numpy(dtype=object), None)[codes[mask]]
+                keys.append(pd.Series(day_values, index=chunk.index, name='usage_date'))
+        
+        aggregations = {'cost': ('cost', 'sum'), 'rows': ('cost', 'size')}
+        for column in _METADATA_COLUMNS:
+            if column in chunk:
+                aggregations[column] = (column, 'first')
+        
+        chunk = chunk.assign(cost=chunk['cost'].fillna(0.0))
+        return chunk.groupby(keys, sort=False, dropna=False).agg(**aggregations)
+    
+    def _combine(self, partials):
+        """
+        Parça toplamlarını tek bir toplam tablosunda birleştirir.
+        """
+        combined = pd.concat(partials)
+        aggregations = {column: ('sum' if column in ('cost', 'rows') else 'first') for column in combined.columns}
+        return combined.groupby(level=list(range(combined.index.nlevels)), sort=False,
+                                dropna=False).agg(aggregations)
+    
+    def load(self):
+        """
+        Dışa aktarım dosyalarını okur ve kaynak başına toplar (yalnızca ilk çağrıda).
+        
+        Returns:
+            Küçük harfli kaynak ID'sine göre toplam tablosu
+        """
+        with self._lock:
+            if self._table is not None:
+                return self._table
+            
+            started = time.perf_counter()
+            partials = []
+            
+            for chunk in self.iter_chunks():
+                self.rows_read += len(chunk)
+                self.chunks_read += 1
+                partials.append(self._aggregate_chunk(chunk))
+                
+                # Ara toplamları sık sık birleştirerek bellek kullanımını sınırlı tut
+                if len(partials) >= 8:
+                    partials = [self._combine(partials)]
+            
+            if partials:
+                table = self._combine(partials)
+            else:
+                table = pd.DataFrame(columns=['cost', 'rows', *_METADATA_COLUMNS])
+            
+            table['subscription_id'] = pd.Series(table.index.get_level_values(0)).str.extract(
+                r'^/subscriptions/([^/]+)', expand=False).fillna('').to_numpy()
+            
+            self._table = table
+            self.seconds = time.perf_counter() - started
+            
+            logger.info(f"Maliyet dışa aktarımı okundu - {len(self.files())} dosya, {self.rows_read} satır, "
+                        f"{self.chunks_read} parça, {len(table)} {'kaynak-gün' if self.daily else 'kaynak'}, "
+                        f"{self.seconds:.2f} sn")
+            return table
+    
+    def resources(self, subscription_id):
+        """
+        Bir aboneliğin kaynak (günlük toplamada kaynak ve gün) başına maliyetlerini döndürür.
+        
+        Args:
+            subscription_id: Azure Abonelik ID'si
+        
+        Returns:
+            Kaynak sözlükleri listesi
+            [{'resource_id', 'cost', 'rows', 'resource_type', 'resource_group', 'location',
+              'currency', 'usage_date'}]
+        """
+        table = self.load()
+        rows = table[table['subscription_id'] == subscription_id.lower()]
+        
+        records = rows.drop(columns=['subscription_id']).reset_index().to_dict('records')
+        for record in records:
+            record.pop('key', None)
+            for column in (*_METADATA_COLUMNS, 'usage_date'):
+                value = record.get(column)
+                # Eksik değerler (NaN, pd.NA) None olarak döndürülür
+                record[column] = value if isinstance(value, str) else None
+        
+        return records
@@ -0,0 +1,225 @@
+"""
+Abonelik ve tarih aralığı başına kaynak maliyetlerini toplayan maliyet dizini modülü.
+"""
+
+import logging
+from collections import defaultdict
+from modules.records import CostEntry
+from modules.resource_id import resource_key
+
+logger = logging.getLogger("CostIndex")
+
+class CostIndex:
+    """
+    Bir aboneliğin belirli tarih aralığındaki maliyetlerini küçük harfli kaynak
+    ID'sine göre toplanmış olarak tutan dizin.
+    
+    Maliyet verisi bir kez okunur; inaktif kaynak maliyetleri, yüksek maliyetli
+    kaynaklar ve diğer tüketiciler aynı dizinden beslenir.
+    """
+    
+    def __init__(self, subscription_id, start_date, end_date, daily=False):
+        """
+        Boş bir maliyet dizini oluşturur.
+        
+        Args:
+            subscription_id: Azure Abonelik ID'si
+            start_date: Başlangıç tarihi (YYYY-MM-DD)
+            end_date: Bitiş tarihi (YYYY-MM-DD)
+            daily: True ise kaynak başına günlük maliyetler de tutulur
+        """
+        self.subscription_id = subscription_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.resources = {}  # {resource_id (küçük harf): CostEntry}
+        self.daily = defaultdict(float) if daily else None  # {(resource_id, YYYY-MM-DD): maliyet}
+        self.rows_read = 0
+        self.pages_read = 0
+        self.seconds = 0.0
+        self.source = None  # Dizini dolduran maliyet kaynağı ('query', 'usage_details', ...)
+    
+    @property
+    def key(self):
+        """
+        Dizinin (abonelik, başlangıç, bitiş) anahtarı.
+        """
+        return cost_index_key(self.subscription_id, self.start_date, self.end_date)
+    
+    def __len__(self):
+        return len(self.resources)
+    
+    def add(self, resource_id, cost, name=None, resource_type=None, resource_group=None, location=None,
+            currency=None, usage_date=None):
+        """
+        Bir kaynağa maliyet ekler.
+        
+        Args:
+            resource_id: Kaynak ID'si
+            cost: Eklenecek maliyet
+            name: Kaynak adı
+            resource_type: Kaynak türü
+            resource_group: Kaynak grubu
+            location: Bölge
+            currency: Para birimi
+            usage_date: Maliyetin ait olduğu gün (YYYY-MM-DD, günlük dizinler için)
+        """
+        key = resource_key(resource_id)
+        resource = self.resources.get(key)
+        
+        if resource is None:
+            # CostEntry tekrarlayan kısa metinleri paylaşır, kaynak başına bellek azalır
+            resource = self.resources[key] = CostEntry(
+                resource_id,
+                name or 'Unknown',
+                resource_type or 'Unknown',
+                resource_group or 'Unknown',
+                location or 'Unknown',
+                0,
+                currency or 'USD'
+            )
+        
+        resource.cost += cost or 0
+        
+        if self.daily is not None and usage_date:
+            self.daily[(key, usage_date)] += cost or 0
+    
+    def add_usage(self, usage):
+        """
+        Consumption API kullanım detayı satırını dizine ekler.
+        
+        Args:
+            usage: UsageDetail nesnesi
+        """
+        self.rows_read += 1
+        
+        if not usage.resource_id:
+            return  # Kaynak ID'si olmayan öğeleri atla
+        
+        usage_date = None
+        if self.daily is not None:
+            # Güncel şemada 'date', eski şemada 'usage_start' alanı kullanılır
+            usage_day = getattr(usage, 'date', None) or getattr(usage, 'usage_start', None)
+            if isinstance(usage_day, str):
+                usage_date = usage_day[:10]
+            else:
+                usage_date = usage_day.strftime('%Y-%m-%d') if usage_day else None
+        
+        self.add(usage.resource_id, usage.pretax_cost, usage.resource_name, usage.resource_type,
+                 usage.resource_group, usage.resource_location, usage.billing_currency, usage_date)
+    
+    def add_page(self, page):
+        """
+        Bir sayfa kullanım detayını dizine ekler.
+        
+        Sayfadaki satırlar toplandıktan sonra sayfaya referans tutulmaz; böylece
+        bellekte en fazla bir sayfa ve kaynak başına bir toplam bulunur.
+        
+        Args:
+            page: UsageDetail nesneleri üreteci veya listesi
+        """
+        for usage in page:
+            self.add_usage(usage)
+        
+        self.pages_read += 1
+    
+    def merge(self, other):
+        """
+        Başka bir dizindeki maliyetleri bu dizine ekler.
+        
+        Artımlı toplamada yeni alınan günlerin dizini, depodan okunan kapanmış
+        günlerin dizinine bu yolla eklenir.
+        
+        Args:
+            other: Eklenecek CostIndex nesnesi
+        """
+        for key, resource in other.resources.items():
+            target = self.resources.get(key)
+            if target is None:
+                self.resources[key] = resource.copy()
+            else:
+                target.cost += resource.cost
+        
+        if self.daily is not None and other.daily:
+            for day_key, cost in other.daily.items():
+                self.daily[day_key] += cost
+        
+        self.rows_read += other.rows_read
+        self.pages_read += other.pages_read
+    
+    def cost(self, resource_id):
+        """
+        Bir kaynağın toplam maliyetini döndürür.
+        
+        Args:
+            resource_id: Kaynak ID'si
+        
+        Returns:
+            Toplam maliyet (kaynak dizinde yoksa 0)
+        """
+        resource = self.resources.get(resource_key(resource_id))
+        return resource.cost if resource else 0
+    
+    def costs(self):
+        """
+        Küçük harfli kaynak ID'sine göre toplam maliyetleri döndürür.
+        
+        Returns:
+            {resource_id (küçük harf): maliyet} sözlüğü
+        """
+        return {key: resource.cost for key, resource in self.resources.items()}
+    
+    def resources_above(self, threshold):
+        """
+        Maliyeti eşiğe eşit veya eşiği aşan kaynakları döndürür.
+        
+        Args:
+            threshold: Maliyet eşiği
+        
+        Returns:
+            Maliyete göre azalan sıralı CostEntry listesi (kopyalar)
+        """
+        resources = [resource.copy() for resource in self.resources.values() if resource.cost >= threshold]
+        resources.sort(key=lambda x: x.cost, reverse=True)
+        return resources
+    
+    def daily_rows(self):
+        """
+        Kaynak başına günlük maliyetleri döndürür.
+        
+        Returns:
+            Satır sözlükleri üreteci {'date', 'resource_id', 'name', 'resource_type',
+            'resource_group', 'location', 'currency', 'cost'} (günlük dizin değilse boş)
+        """
+        for (key, usage_date), cost in (self.daily or {}).items():
+            resource = self.resources[key]
+            yield {
+                'date': usage_date,
+                'resource_id': key,
+                'name': resource.name,
+                'resource_type': resource.type,
+                'resource_group': resource.resource_group,
+                'location': resource.location,
+                'currency': resource.currency,
+                'cost': cost
+            }
+    
+    def stats(self):
+        """
+        Dizin istatistiklerini döndürür.
+        
+        Returns:
+            {'source', 'rows_read', 'pages_read', 'resources', 'seconds'} sözlüğü
+        """
+        return {
+            'source': self.source,
+            'rows_read': self.rows_read,
+            'pages_read': self.pages_read,
+            'resources': len(self.resources),
+            'seconds': self.seconds
+        }
+
+def cost_index_key(subscription_id, start_date, end_date):
+    """
+    Maliyet dizinlerinin paylaşıldığı (abonelik, başlangıç, bitiş) anahtarını oluşturur.
+    """
+    return (subscription_id.lower(), start_date, end_date)
@@ -0,0 +1,373 @@
+"""
+Kaynak başına günlük maliyetleri çalıştırmalar arasında saklayan sütunlu maliyet deposu.
+Veriler abonelik ve aya göre bölümlenmiş Parquet dosyalarında tutulur; gruplama
+sorguları yeni API çağrısı yapmadan yerel veriden yanıtlanır.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from datetime import date, datetime, timedelta, timezone
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+logger = logging.getLogger("CostStore")
+
+# Cost Management bir günün maliyetlerini 72 saate kadar güncelleyebilir; bu süre
+# dolmadan alınan günler açık sayılır ve sonraki çalıştırmalarda yeniden sorgulanır
+COST_CLOSE_LAG = timedelta(days=3)
+
+# Sorgularda gruplama ve süzme için kullanılabilecek sütunlar
+GROUP_COLUMNS = ('subscription_id', 'account', 'resource_id', 'name', 'resource_type', 'resource_group',
+                 'location', 'currency')
+
+# Bölüm sütunları dosya içinde değil dizin adlarında (subscription_id=.../month=...) saklanır
+_FILE_SCHEMA = pa.schema([
+    ('date', pa.string()),
+    ('account', pa.string()),
+    ('resource_id', pa.string()),
+    ('name', pa.string()),
+    ('resource_type', pa.string()),
+    ('resource_group', pa.string()),
+    ('location', pa.string()),
+    ('currency', pa.string()),
+    ('cost', pa.float64())
+])
+
+_PARTITIONING = ds.partitioning(pa.schema([('subscription_id', pa.string()), ('month', pa.string())]),
+                                flavor='hive')
+
+class CostStore:
+    """
+    Günlük kaynak maliyetleri için Parquet tabanlı, abonelik/ay bölümlü depo.
+    
+    Her abonelik için hangi günlerin alındığı ve alındığında kapanmış olup
+    olmadığı bir gün listesinde (_days.json) tutulur; kapanmış günler değişmez
+    kabul edilir ve yeniden sorgulanmaz.
+    """
+    
+    def __init__(self, path):
+        """
+        Depoyu başlatır.
+        
+        Args:
+            path: Deponun kök dizini
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+    
+    def _partition_file(self, subscription_id, month):
+        """
+        Bir abonelik ve ay bölümünün dosya yolunu döndürür.
+        """
+        return os.path.join(self.path, f"subscription_id={subscription_id.lower()}", f"month={month}",
+                            "costs.parquet")
+    
+    def _manifest_file(self, subscription_id):
+        """
+        Bir aboneliğin alınmış gün listesinin dosya yolunu döndürür.
+        
+        '_' ile başlayan dosyalar Arrow veri kümesi taramasında yok sayılır.
+        """
+        return os.path.join(self.path, f"subscription_id={subscription_id.lower()}", "_days.json")
+    
+    def _read_manifest(self, subscription_id):
+        """
+        Bir aboneliğin alınmış günlerini okur.
+        
+        Returns:
+            {gün (YYYY-MM-DD): {'closed': bool, 'fetched_at': zaman damgası}} sözlüğü
+        """
+        path = self._manifest_file(subscription_id)
+        if not os.path.exists(path):
+            return {}
+        
+        try:
+            with open(path, encoding='utf-8') as manifest:
+                return json.load(manifest)
+        except (OSError, ValueError) as e:
+            # Okunamayan liste tüm günlerin yeniden sorgulanmasına yol açar, veri kaybı olmaz
+            logger.warning(f"Maliyet deposu gün listesi okunamadı ({subscription_id}): {str(e)}")
+            return {}
+    
+    def _write_manifest(self, subscription_id, manifest):
+        """
+        Bir aboneliğin alınmış gün listesini yazar.
+        """
+        path = self._manifest_file(subscription_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file, sort_keys=True)
+        os.replace(temp_path, path)
+    
+    @staticmethod
+    def closed_before():
+        """
+        Kapanmış sayılan son günden sonraki günü (UTC) döndürür.
+        """
+        return (datetime.now(timezone.utc) - COST_CLOSE_LAG).date()
+    
+    def plan_fetch(self, subscription_id, start_date, end_date):
+        """
+        Pencere içinde yeniden sorgulanması gereken ilk günü bulur.
+        
+        Kapanmış olarak alınmış günler bir daha sorgulanmaz; açık günler (son
+        birkaç gün) ve hiç alınmamış günler her çalıştırmada sorgulanır.
+        
+        Args:
+            subscription_id: Azure Abonelik ID'si
+            start_date: Pencerenin ilk günü (YYYY-MM-DD)
+            end_date: Pencerenin son günü (YYYY-MM-DD)
+        
+        Returns:
+            Sorgulanması gereken ilk gün (YYYY-MM-DD) veya None (pencere depoda eksiksizse)
+        """
+        with self._lock:
+            manifest = self._read_manifest(subscription_id)
+        
+        day = date.fromisoformat(start_date)
+        end_day = date.fromisoformat(end_date)
+        while day <= end_day:
+            entry = manifest.get(day.isoformat())
+            if not entry or not entry.get('closed'):
+                return day.isoformat()
+            day += timedelta(days=1)
+        
+        return None
+    
+    def write(self, cost_index, account=None, start_date=None, end_date=None):
+        """
+        Günlük maliyet dizinini depoya yazar.
+        
+        Yazılan günler için bölümdeki eski satırlar yenileriyle değiştirilir; diğer
+        günler korunur. Böylece aynı dönem tekrar tekrar yazılabilir. Yazılan günler
+        alınmış olarak işaretlenir.
+        
+        Args:
+            cost_index: Günlük maliyetleri tutan CostIndex nesnesi (daily=True)
+            account: Hesap görünen adı (gruplama için)
+            start_date: Yazılan aralığın ilk günü (YYYY-MM-DD); start_date ve end_date
+                verilirse aralıktaki maliyeti olmayan günler de boş olarak yazılır
+            end_date: Yazılan aralığın son günü (YYYY-MM-DD)
+        
+        Returns:
+            Yazılan satır sayısı
+        """
+        rows = pd.DataFrame(list(cost_index.daily_rows()), columns=[
+            'date', 'resource_id', 'name', 'resource_type', 'resource_group', 'location', 'currency', 'cost'])
+        rows['account'] = account or cost_index.subscription_id
+        
+        if start_date and end_date:
+            rows = rows[(rows['date'] >= start_date) & (rows['date'] <= end_date)]
+            days = [day.strftime('%Y-%m-%d') for day in pd.date_range(start_date, end_date, freq='D')]
+        else:
+            days = sorted(rows['date'].unique())
+        
+        if not days:
+            return 0
+        
+        closed_before = self.closed_before().isoformat()
+        now = time.time()
+        
+        with self._lock:
+            by_month = {}
+            for day in days:
+                by_month.setdefault(day[:7], []).append(day)
+            
+            for month, month_days in sorted(by_month.items()):
+                path = self._partition_file(cost_index.subscription_id, month)
+                part = rows[rows['date'].str[:7] == month]
+                
+                if os.path.exists(path):
+                    existing = pq.read_table(path).to_pandas()
+                    existing = existing[~existing['date'].isin(month_days)]
+                    part = pd.concat([existing, part], ignore_index=True)
+                
+                table = pa.Table.from_pandas(part.sort_values(['date', 'resource_id']), schema=_FILE_SCHEMA,
+                                             preserve_index=False)
+                
+                # Yarım yazılmış dosyaların okunmasını önlemek için önce geçici dosyaya yazılır;
+                # '.' ile başlayan geçici dosyalar Arrow veri kümesi taramasında yok sayılır
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+                pq.write_table(table, temp_path, compression='zstd')
+                os.replace(temp_path, path)
+            
+            manifest = self._read_manifest(cost_index.subscription_id)
+            for day in days:
+                manifest[day] = {'closed': day < closed_before, 'fetched_at': now}
+            self._write_manifest(cost_index.subscription_id, manifest)
+        
+        logger.info(f"Maliyet deposuna yazıldı - {cost_index.subscription_id}, {len(days)} gün, "
+                    f"{len(rows)} günlük satır")
+        return len(rows)
+    
+    def read_daily(self, subscription_id, start_date, end_date):
+        """
+        Bir aboneliğin pencere içindeki günlük maliyet satırlarını okur.
+        
+        Yalnızca aboneliğin pencereye düşen ay bölümleri okunur; okuma eşzamanlı
+        bir yazmayla çakışmaması için depo kilidi altında yapılır.
+        
+        Args:
+            subscription_id: Azure Abonelik ID'si
+            start_date: Pencerenin ilk günü (YYYY-MM-DD)
+            end_date: Pencerenin son günü (YYYY-MM-DD)
+        
+        Returns:
+            Satır sözlükleri listesi {'date', 'resource_id', 'name', 'resource_type',
+            'resource_group', 'location', 'currency', 'cost'}
+        """
+        columns = ['date', 'resource_id', 'name', 'resource_type', 'resource_group', 'location', 'currency', 'cost']
+        rows = []
+        
+        with self._lock:
+            for month in self._months(start_date, end_date):
+                path = self._partition_file(subscription_id, month)
+                if not os.path.exists(path):
+                    continue
+                table = pq.read_table(path, columns=columns,
+                                      filters=[('date', '>=', start_date), ('date', '<=', end_date)])
+                rows.extend(table.to_pylist())
+        
+        return rows
+    
+    @staticmethod
+    def _months(start_date, end_date):
+        """
+        Bir tarih aralığının kapsadığı ayları (YYYY-MM) sırayla döndürür.
+        """
+        year, month = int(start_date[:4]), int(start_date[5:7])
+        last = (int(end_date[:4]), int(end_date[5:7]))
+        months = []
+        while (year, month) <= last:
+            months.append(f"{year}-{month:02d}")
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return months
+    
+    def _dataset(self):
+        """
+        Depodaki tüm bölümleri kapsayan Arrow veri kümesini döndürür.
+        """
+        return ds.dataset(self.path, format='parquet', partitioning=_PARTITIONING,
+                          exclude_invalid_files=True)
+    
+    def _filter(self, start_date, end_date, subscription_ids, filters):
+        """
+        Sorgu koşullarından Arrow süzgeç ifadesi oluşturur.
+        
+        Ay sütunu üzerindeki koşullar okunacak bölümleri daraltır.
+        """
+        conditions = []
+        if start_date:
+            conditions.append(ds.field('month') >= start_date[:7])
+            conditions.append(ds.field('date') >= start_date)
+        if end_date:
+            conditions.append(ds.field('month') <= end_date[:7])
+            conditions.append(ds.field('date') <= end_date)
+        if subscription_ids:
+            conditions.append(ds.field('subscription_id').isin([sub.lower() for sub in subscription_ids]))
+        
+        for column, values in (filters or {}).items():
+            if column not in GROUP_COLUMNS:
+                raise ValueError(f"Bilinmeyen süzgeç sütunu: {column}")
+            values = [values] if isinstance(values, str) else list(values)
+            conditions.append(ds.field(column).isin(values))
+        
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return expression
+    
+    def query(self, group_by=('resource_type',), start_date=None, end_date=None, subscription_ids=None,
+              filters=None, period=None):
+        """
+        Depodaki maliyetleri gruplayarak toplar.
+        
+        Args:
+            group_by: Gruplama sütunları (GROUP_COLUMNS içinden)
+            start_date: Başlangıç günü (YYYY-MM-DD, dahil, isteğe bağlı)
+            end_date: Bitiş günü (YYYY-MM-DD, dahil, isteğe bağlı)
+            subscription_ids: Yalnızca bu aboneliklerin maliyetleri (isteğe bağlı)
+            filters: Ek süzgeçler {sütun: değer veya değerler listesi}
+            period: None (dönem toplamı), 'day' veya 'month'; verilirse sonuç
+                'period' sütunuyla zaman dilimlerine de ayrılır
+        
+        Returns:
+            Gruplama sütunları ve 'cost' sütunu içeren DataFrame (maliyete göre azalan)
+        """
+        group_by = list(group_by or [])
+        unknown = [column for column in group_by if column not in GROUP_COLUMNS]
+        if unknown:
+            raise ValueError(f"Bilinmeyen gruplama sütunu: {', '.join(unknown)}")
+        
+        columns = group_by + ['cost'] + (['date'] if period else [])
+        keys = group_by + (['period'] if period else [])
+        
+        if not os.path.isdir(self.path) or not os.listdir(self.path):
+            return pd.DataFrame(columns=keys + ['cost'])
+        
+        started = time.perf_counter()
+        table = self._dataset().to_table(columns=columns,
+                                         filter=self._filter(start_date, end_date, subscription_ids, filters))
+        
+        if period == 'month':
+            table = table.append_column('period', pc.utf8_slice_codeunits(table['date'], 0, 7))
+        elif period == 'day':
+            table = table.append_column('period', table['date'])
+        elif period:
+            raise ValueError(f"Bilinmeyen dönem: {period}")
+        
+        if keys:
+            result = table.group_by(keys).aggregate([('cost', 'sum')]).rename_columns(keys + ['cost'])
+        else:
+            result = pa.table({'cost': [pc.sum(table['cost']).as_py() or 0.0]})
+        
+        result = result.to_pandas().sort_values(
+            (['period'] if period else []) + ['cost'], ascending=[True] * bool(period) + [False],
+            ignore_index=True)
+        
+        logger.debug(f"Maliyet deposu sorgusu - {table.num_rows} satır, {len(result)} grup, "
+                     f"{(time.perf_counter() - started) * 1000:.1f} ms")
+        return result
+    
+    def month_over_month(self, month, group_by=('resource_type',), subscription_ids=None, filters=None):
+        """
+        Bir ayın maliyetlerini önceki ayla karşılaştırır.
+        
+        Args:
+            month: Karşılaştırılacak ay (YYYY-MM)
+            group_by: Gruplama sütunları
+            subscription_ids: Yalnızca bu aboneliklerin maliyetleri (isteğe bağlı)
+            filters: Ek süzgeçler
+        
+        Returns:
+            Gruplama sütunları, 'previous', 'current', 'change' ve 'change_pct' sütunlu DataFrame
+        """
+        year, month_number = (int(part) for part in month.split('-'))
+        previous = f"{year - 1}-12" if month_number == 1 else f"{year}-{month_number - 1:02d}"
+        
+        costs = self.query(group_by, start_date=f"{previous}-01", end_date=f"{month}-31",
+                           subscription_ids=subscription_ids, filters=filters, period='month')
+        
+        group_by = list(group_by or [])
+        if costs.empty:
+            return pd.DataFrame(columns=group_by + ['previous', 'current', 'change', 'change_pct'])
+        
+        if group_by:
+            pivot = costs.pivot_table(index=group_by, columns='period', values='cost', aggfunc='sum', fill_value=0.0)
+        else:
+            pivot = costs.set_index('period')[['cost']].T
+        pivot = pivot.reindex(columns=[previous, month], fill_value=0.0)
+        pivot.columns = ['previous', 'current']
+        
+        pivot['change'] = pivot['current'] - pivot['previous']
+        pivot['change_pct'] = (pivot['change'] / pivot['previous'].where(pivot['previous'] != 0)) * 100
+        return pivot.reset_index(drop=not group_by).sort_values('change', ascending=False, ignore_index=True)
@@ -0,0 +1,267 @@
+"""
+Cost Management sorgu (Query API) uç noktasını taklit eden yerel sahte sunucu.
+CostQueryClient ve CostAnalyzer'ın sorgu yolunu Azure'a bağlanmadan denemek için kullanılır.
+"""
+
+import json
+import logging
+import re
+import threading
+from collections import defaultdict
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger("FakeCostManagement")
+
+_QUERY_PATH = re.compile(r"^/subscriptions/(?P<subscription>[^/]+)/providers/Microsoft\.CostManagement/query$",
+                         re.IGNORECASE)
+
+_RESOURCE_TYPES = (
+    'microsoft.compute/virtualmachines',
+    'microsoft.storage/storageaccounts',
+    'microsoft.web/sites',
+    'microsoft.sql/servers/databases',
+    'microsoft.documentdb/databaseaccounts',
+    'microsoft.containerservice/managedclusters'
+)
+
+def synthetic_usage_rows(subscription_ids, resource_count=100, days=30, meters_per_resource=4,
+                         start=date(2024, 1, 1)):
+    """
+    Günlük, metre bazında sentetik kullanım satırları üretir.
+    
+    Args:
+        subscription_ids: Abonelik ID'leri listesi
+        resource_count: Abonelik başına kaynak sayısı
+        days: Gün sayısı
+        meters_per_resource: Kaynak başına günlük metre (satır) sayısı
+        start: İlk gün
+    
+    Returns:
+        Kullanım satırı sözlükleri listesi
+    """
+    rows = []
+    for subscription_id in subscription_ids:
+        for index in range(resource_count):
+            resource_type = _RESOURCE_TYPES[index % len(_RESOURCE_TYPES)]
+            resource_group = f"rg-{index % 10}"
+            provider, kind = resource_type.split('/', 1)
+            resource_id = (f"/subscriptions/{subscription_id}/resourcegroups/{resource_group}"
+                           f"/providers/{provider}/{kind}/res-{index}")
+            
+            for day in range(days):
+                for meter in range(meters_per_resource):
+                    rows.append({
+                        'SubscriptionId': subscription_id.lower(),
+                        'ResourceId': resource_id,
+                        'ResourceType': resource_type,
+                        'ResourceGroupName': resource_group,
+                        'ResourceLocation': 'eastus' if index % 2 else 'westeurope',
+                        'ServiceName': resource_type.split('/')[0],
+                        'MeterCategory': f"meter-{meter}",
+                        'Date': (start + timedelta(days=day)).isoformat(),
+                        'Cost': round(0.05 * (index % 17 + 1) * (meter + 1), 4),
+                        'Currency': 'USD',
+                        'Tags': {'env': 'prod' if index % 3 else 'dev'}
+                    })
+    
+    return rows
+
+class FakeCostManagement:
+    """
+    Kullanım satırlarını istekteki gruplama ve ayrıntı düzeyine göre toplayıp
+    Query API biçiminde sayfalar halinde döndüren yerel HTTP sunucusu.
+    """
+    
+    def __init__(self, usage_rows, host="127.0.0.1", port=0, page_size=1000, throttle_first=0,
+                 retry_after=1):
+        """
+        Sahte uç noktayı başlatır.
+        
+        Args:
+            usage_rows: synthetic_usage_rows biçiminde kullanım satırları
+            host: Dinlenecek adres
+            port: Dinlenecek port (0 ise boş bir port seçilir)
+            page_size: Sayfa başına satır sayısı
+            throttle_first: 429 ile reddedilecek ilk istek sayısı
+            retry_after: 429 yanıtlarındaki QPU bekleme süresi (saniye)
+        """
+        self.page_size = page_size
+        self.throttle_first = throttle_first
+        self.retry_after = retry_after
+        self.requests_served = 0
+        self.requests_throttled = 0
+        self._rows = defaultdict(list)  # subscription_id -> [satır]
+        for row in usage_rows:
+            self._rows[row['SubscriptionId'].lower()].append(row)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+    
+    @property
+    def endpoint(self):
+        """
+        CostQueryClient'a verilecek temel adres.
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        """
+        Sunucuyu arka plan iş parçacığında başlatır.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """
+        Sunucuyu durdurur.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    def aggregate(self, subscription_id, body):
+        """
+        Bir aboneliğin kullanım satırlarını sorgu gövdesine göre toplar.
+        
+        Args:
+            subscription_id: Abonelik ID'si
+            body: Query API istek gövdesi
+        
+        Returns:
+            (sütun tanımları listesi, satır listesi)
+        """
+        dataset = body.get('dataset') or {}
+        granularity = dataset.get('granularity') or 'None'
+        grouping = dataset.get('grouping') or []
+        period = body.get('timePeriod') or {}
+        start = (period.get('from') or '0000-00-00')[:10]
+        end = (period.get('to') or '9999-99-99')[:10]
+        
+        totals = defaultdict(float)
+        for row in self._rows.get(subscription_id.lower(), []):
+            if not start <= row['Date'] <= end:
+                continue
+            
+            key = []
+            if granularity == 'Daily':
+                key.append(int(row['Date'].replace('-', '')))
+            elif granularity == 'Monthly':
+                key.append(f"{row['Date'][:7]}-01T00:00:00")
+            
+            for group in grouping:
+                if group.get('type') == 'TagKey':
+                    key.extend([group['name'], row['Tags'].get(group['name'])])
+                else:
+                    key.append(row.get(group['name']))
+            
+            key.append(row['Currency'])
+            totals[tuple(key)] += row['Cost']
+        
+        columns = [{'name': 'Cost', 'type': 'Number'}]
+        if granularity == 'Daily':
+            columns.append({'name': 'UsageDate', 'type': 'Number'})
+        elif granularity == 'Monthly':
+            columns.append({'name': 'BillingMonth', 'type': 'Datetime'})
+        for group in grouping:
+            if group.get('type') == 'TagKey':
+                columns.extend([{'name': 'TagKey', 'type': 'String'}, {'name': 'TagValue', 'type': 'String'}])
+            else:
+                columns.append({'name': group['name'], 'type': 'String'})
+        columns.append({'name': 'Currency', 'type': 'String'})
+        
+        rows = [[round(cost, 6), *key] for key, cost in sorted(totals.items(), key=lambda item: str(item[0]))]
+        return columns, rows
+    
+    def _make_handler(self):
+        """
+        Sunucuya bağlı istek işleyici sınıfını oluşturur.
+        """
+        endpoint = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                url = urlparse(self.path)
+                match = _QUERY_PATH.match(url.path)
+                if not match:
+                    self.send_error(404)
+                    return
+                
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b'{}')
+                
+                with endpoint._lock:
+                    throttled = endpoint.requests_throttled < endpoint.throttle_first
+                    if throttled:
+                        endpoint.requests_throttled += 1
+                    else:
+                        endpoint.requests_served += 1
+                
+                if throttled:
+                    payload = json.dumps({'error': {'code': '429', 'message': 'Too many requests'}}).encode('utf-8')
+                    self.send_response(429)
+                    self.send_header('x-ms-ratelimit-microsoft.costmanagement-qpu-retry-after',
+                                     str(endpoint.retry_after))
+                else:
+                    query = parse_qs(url.query)
+                    offset = int((query.get('$skiptoken') or ['0'])[0])
+                    columns, rows = endpoint.aggregate(match.group('subscription'), body)
+                    page = rows[offset:offset + endpoint.page_size]
+                    
+                    next_link = None
+                    if offset + endpoint.page_size < len(rows):
+                        api_version = (query.get('api-version') or [''])[0]
+                        next_link = (f"{endpoint.endpoint}{url.path}?api-version={api_version}"
+                                     f"&$skiptoken={offset + endpoint.page_size}")
+                    
+                    payload = json.dumps({
+                        'properties': {'nextLink': next_link, 'columns': columns, 'rows': page}
+                    }).encode('utf-8')
+                    self.send_response(200)
+                
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+        
+        return Handler
+
+def compare_payloads(resource_count=500, days=30, meters_per_resource=4, group_by=None, granularity="None"):
+    """
+    Query API ile alınan satır sayısını ham kullanım satırı sayısıyla karşılaştırır.
+    
+    Returns:
+        Ölçüm sonuçları sözlüğü
+    """
+    from modules.azure_client import CostQueryClient
+    
+    subscription_id = "00000000-0000-0000-0000-000000000000"
+    usage_rows = synthetic_usage_rows([subscription_id], resource_count, days, meters_per_resource)
+    
+    with FakeCostManagement(usage_rows) as fake:
+        client = CostQueryClient(None, endpoint=fake.endpoint)
+        pages = list(client.query(subscription_id, '2024-01-01', '2024-12-31', group_by=group_by,
+                                  granularity=granularity))
+        
+        return {
+            'usage_rows': len(usage_rows),
+            'query_rows': sum(len(page) for page in pages),
+            'query_pages': len(pages),
+            'total_cost': round(sum(row['Cost'] for page in pages for row in page), 2)
+        }
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    logger.info(compare_payloads())
+    logger.info(compare_payloads(group_by=['ResourceType'], granularity='Daily'))
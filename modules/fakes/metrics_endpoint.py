@@ -0,0 +1,232 @@
+"""
+Azure Monitor metrics:getBatch uç noktasını taklit eden yerel sahte sunucu.
+Toplu metrik sorgularının verimini Azure'a bağlanmadan ölçmek için kullanılır.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+logger = logging.getLogger("FakeMetricsEndpoint")
+
+_BATCH_PATH = re.compile(r"^/subscriptions/(?P<subscription>[^/]+)/metrics:getBatch$")
+_DURATION = re.compile(r"^P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?)?$")
+
+def parse_interval(interval):
+    """
+    Basit ISO 8601 sürelerini (P1D, PT1H, PT5M) timedelta'ya dönüştürür.
+    """
+    match = _DURATION.match(interval or '')
+    if not match or not any(match.groupdict().values()):
+        return timedelta(days=1)
+    
+    parts = {key: int(value or 0) for key, value in match.groupdict().items()}
+    return timedelta(days=parts['days'], hours=parts['hours'], minutes=parts['minutes'])
+
+def synthetic_value(resource_id, metric_name, index):
+    """
+    Kaynak ve metrik için deterministik sentetik bir değer üretir.
+    """
+    seed = zlib.crc32(f"{resource_id.lower()}|{metric_name}".encode('utf-8'))
+    base = (seed % 10000) / 100.0
+    return round(base * (1 + ((index * seed) % 7 - 3) / 100.0), 4)
+
+class FakeMetricsEndpoint:
+    """
+    metrics:getBatch isteklerine sentetik zaman serileriyle yanıt veren yerel HTTP sunucusu.
+    """
+    
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0):
+        """
+        Sahte uç noktayı başlatır.
+        
+        Args:
+            host: Dinlenecek adres
+            port: Dinlenecek port (0 ise boş bir port seçilir)
+            latency: Her isteğe eklenecek yapay gecikme (saniye)
+        """
+        self.latency = latency
+        self.requests_served = 0
+        self.resources_served = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+    
+    @property
+    def endpoint(self):
+        """
+        MetricsBatchClient'a verilecek uç nokta adresi.
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        """
+        Sunucuyu arka plan iş parçacığında başlatır.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """
+        Sunucuyu durdurur.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    def build_response(self, subscription_id, params, resource_ids):
+        """
+        Bir getBatch isteği için yanıt gövdesini oluşturur.
+        
+        Args:
+            subscription_id: İstekteki abonelik ID'si
+            params: Sorgu parametreleri sözlüğü
+            resource_ids: İstek gövdesindeki kaynak ID'leri
+        
+        Returns:
+            Azure Monitor biçiminde yanıt sözlüğü
+        """
+        start_time = datetime.fromisoformat(params['starttime'])
+        end_time = datetime.fromisoformat(params['endtime'])
+        interval = params.get('interval', 'P1D')
+        step = parse_interval(interval)
+        metric_names = [name for name in params.get('metricnames', '').split(',') if name]
+        aggregations = [agg.lower() for agg in params.get('aggregation', 'Average').split(',') if agg]
+        
+        timestamps = []
+        current = start_time
+        while current < end_time:
+            timestamps.append(current.isoformat())
+            current += step
+        
+        values = []
+        for resource_id in resource_ids:
+            metrics = []
+            for metric_name in metric_names:
+                data = []
+                for index, timestamp in enumerate(timestamps):
+                    point = {'timeStamp': timestamp}
+                    for aggregation in aggregations:
+                        point[aggregation] = synthetic_value(resource_id, metric_name, index)
+                    data.append(point)
+                
+                metrics.append({
+                    'id': f"{resource_id}/providers/Microsoft.Insights/metrics/{metric_name}",
+                    'type': 'Microsoft.Insights/metrics',
+                    'name': {'value': metric_name, 'localizedValue': metric_name},
+                    'unit': 'Unspecified',
+                    'timeseries': [{'metadatavalues': [], 'data': data}]
+                })
+            
+            values.append({
+                'starttime': params['starttime'],
+                'endtime': params['endtime'],
+                'interval': interval,
+                'namespace': params.get('metricnamespace'),
+                'resourceid': resource_id,
+                'value': metrics
+            })
+        
+        return {'values': values}
+    
+    def _make_handler(self):
+        """
+        Sunucuya bağlı istek işleyici sınıfını oluşturur.
+        """
+        endpoint = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                url = urlparse(self.path)
+                match = _BATCH_PATH.match(url.path)
+                if not match:
+                    self.send_error(404)
+                    return
+                
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b'{}')
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                resource_ids = body.get('resourceids', [])
+                
+                if endpoint.latency:
+                    time.sleep(endpoint.latency)
+                
+                payload = json.dumps(endpoint.build_response(
+                    match.group('subscription'), params, resource_ids)).encode('utf-8')
+                
+                with endpoint._lock:
+                    endpoint.requests_served += 1
+                    endpoint.resources_served += len(resource_ids)
+                
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+        
+        return Handler
+
+def measure_throughput(resource_count=500, latency=0.05, batch_size=None):
+    """
+    Toplu ve tekil metrik sorgularının verimini sahte uç nokta üzerinde karşılaştırır.
+    
+    Args:
+        resource_count: Sorgulanacak sentetik kaynak sayısı
+        latency: Her isteğe eklenecek yapay gecikme (saniye)
+        batch_size: Parça boyutu (None ise METRICS_BATCH_MAX_RESOURCES)
+    
+    Returns:
+        Ölçüm sonuçları sözlüğü
+    """
+    from modules.azure_client import MetricsBatchClient, METRICS_BATCH_MAX_RESOURCES
+    
+    batch_size = batch_size or METRICS_BATCH_MAX_RESOURCES
+    subscription_id = "00000000-0000-0000-0000-000000000000"
+    namespace = "Microsoft.Compute/virtualMachines"
+    resource_ids = [
+        f"/subscriptions/{subscription_id}/resourceGroups/rg-bench/providers/{namespace}/vm-{i}"
+        for i in range(resource_count)
+    ]
+    end_time = datetime.now()
+    start_time = end_time - timedelta(days=30)
+    results = {}
+    
+    with FakeMetricsEndpoint(latency=latency) as fake:
+        client = MetricsBatchClient(None, endpoint=fake.endpoint)
+        
+        for mode, size in (('batch', batch_size), ('single', 1)):
+            started = time.perf_counter()
+            for i in range(0, len(resource_ids), size):
+                client.query(subscription_id, 'eastus', namespace, resource_ids[i:i + size],
+                             ['Percentage CPU'], start_time, end_time)
+            elapsed = time.perf_counter() - started
+            
+            results[mode] = {
+                'seconds': elapsed,
+                'resources_per_second': resource_count / elapsed if elapsed else 0.0
+            }
+        
+        results['requests_served'] = fake.requests_served
+    
+    return results
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    for mode, result in measure_throughput().items():
+        logger.info(f"{mode}: {result}")
@@ -0,0 +1,231 @@
+"""
+Azure Resource Graph sorgu uç noktasını kayıtlı yanıtlarla taklit eden yerel sahte sunucu.
+ResourceInventory'yi Azure'a bağlanmadan denemek için kullanılır.
+"""
+
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+logger = logging.getLogger("FakeResourceGraph")
+
+_RESOURCES_PATH = "/providers/Microsoft.ResourceGraph/resources"
+
+# Sentetik satırlarda kullanılan kaynak türleri ve türe özgü sütunlar
+_SYNTHETIC_TYPES = {
+    'Microsoft.Compute/virtualMachines': {'vmSize': 'Standard_D2s_v3', 'powerState': 'PowerState/running'},
+    'Microsoft.Storage/storageAccounts': {'sku': {'name': 'Standard_LRS', 'tier': 'Standard'}},
+    'Microsoft.Web/sites': {'state': 'Running', 'serverFarmId': None},
+    'Microsoft.Sql/servers/databases': {'status': 'Online', 'sku': {'name': 'S0', 'tier': 'Standard'}},
+    'Microsoft.DocumentDB/databaseAccounts': {'offerType': 'Standard'},
+    'Microsoft.ContainerService/managedClusters': {
+        'provisioningState': 'Succeeded',
+        'agentPoolProfiles': [{'name': 'nodepool1', 'count': 3, 'vmSize': 'Standard_D4s_v3'}]
+    }
+}
+
+def synthetic_rows(subscription_ids, per_type=5, location='eastus'):
+    """
+    Abonelikler için envanter sorgusunun döndüreceği biçimde sentetik satırlar üretir.
+    
+    Args:
+        subscription_ids: Abonelik ID'leri listesi
+        per_type: Abonelik ve kaynak türü başına üretilecek satır sayısı
+        location: Kaynakların bölgesi
+    
+    Returns:
+        Satır sözlükleri listesi
+    """
+    rows = []
+    for subscription_id in subscription_ids:
+        resource_group = 'rg-synthetic'
+        for resource_type, columns in _SYNTHETIC_TYPES.items():
+            provider, *types = resource_type.split('/')
+            for index in range(per_type):
+                name = f"{types[-1].lower()}-{index}"
+                if len(types) == 2:
+                    # Alt kaynaklar (örn. SQL veritabanları) üst kaynak adıyla birlikte adreslenir
+                    segments = f"{types[0]}/server-{index}/{types[1]}/{name}"
+                else:
+                    segments = f"{types[0]}/{name}"
+                
+                row = {
+                    'id': f"/subscriptions/{subscription_id}/resourceGroups/{resource_group}"
+                          f"/providers/{provider}/{segments}",
+                    'name': name,
+                    'type': resource_type.lower(),
+                    'location': location,
+                    'subscriptionId': subscription_id,
+                    'resourceGroup': resource_group
+                }
+                row.update(columns)
+                rows.append(row)
+    
+    return rows
+
+def load_recording(path):
+    """
+    Kaydedilmiş Resource Graph satırlarını okur.
+    
+    Args:
+        path: record_rows ile oluşturulmuş JSON dosyasının yolu
+    
+    Returns:
+        Satır sözlükleri listesi
+    """
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def record_rows(inventory, subscription_ids, path):
+    """
+    Gerçek Resource Graph yanıtlarını daha sonra çevrimdışı kullanmak üzere kaydeder.
+    
+    Args:
+        inventory: ResourceInventory nesnesi
+        subscription_ids: Abonelik ID'leri listesi
+        path: Yazılacak JSON dosyasının yolu
+    
+    Returns:
+        Kaydedilen satır sayısı
+    """
+    rows = list(inventory.iter_rows(subscription_ids))
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(rows, f)
+    return len(rows)
+
+class FakeResourceGraph:
+    """
+    Resource Graph sorgularına kayıtlı satırları sayfalar halinde döndüren yerel HTTP sunucusu.
+    
+    KQL sorgusu yorumlanmaz; satırlar yalnızca istekteki aboneliklere göre süzülür.
+    """
+    
+    def __init__(self, rows, host="127.0.0.1", port=0):
+        """
+        Sahte uç noktayı başlatır.
+        
+        Args:
+            rows: Döndürülecek satırlar (kayıt veya synthetic_rows çıktısı)
+            host: Dinlenecek adres
+            port: Dinlenecek port (0 ise boş bir port seçilir)
+        """
+        self.rows = list(rows)
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+    
+    @property
+    def endpoint(self):
+        """
+        ResourceInventory'ye verilecek temel adres.
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        """
+        Sunucuyu arka plan iş parçacığında başlatır.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """
+        Sunucuyu durdurur.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    def build_response(self, body):
+        """
+        Bir sorgu isteği için yanıt gövdesini oluşturur.
+        
+        Args:
+            body: İstek gövdesi (subscriptions, query, options)
+        
+        Returns:
+            Resource Graph biçiminde yanıt sözlüğü
+        """
+        subscriptions = {subscription_id.lower() for subscription_id in body.get('subscriptions', [])}
+        options = body.get('options') or {}
+        top = int(options.get('$top') or 1000)
+        offset = int(options.get('$skipToken') or 0)
+        
+        matching = [row for row in self.rows if (row.get('subscriptionId') or '').lower() in subscriptions]
+        page = matching[offset:offset + top]
+        
+        response = {
+            'totalRecords': len(matching),
+            'count': len(page),
+            'resultTruncated': 'false',
+            'data': page
+        }
+        if offset + top < len(matching):
+            response['$skipToken'] = str(offset + top)
+        
+        return response
+    
+    def _make_handler(self):
+        """
+        Sunucuya bağlı istek işleyici sınıfını oluşturur.
+        """
+        endpoint = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if urlparse(self.path).path != _RESOURCES_PATH:
+                    self.send_error(404)
+                    return
+                
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b'{}')
+                payload = json.dumps(endpoint.build_response(body)).encode('utf-8')
+                
+                with endpoint._lock:
+                    endpoint.requests_served += 1
+                
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+        
+        return Handler
+
+def measure_inventory(subscription_count=200, per_type=5):
+    """
+    Çok abonelikli bir kiracının envanterinin kaç sorguda yüklendiğini ölçer.
+    
+    Returns:
+        Ölçüm sonuçları sözlüğü
+    """
+    from modules.inventory import ResourceInventory
+    
+    subscription_ids = [f"{index:08d}-0000-0000-0000-000000000000" for index in range(subscription_count)]
+    
+    with FakeResourceGraph(synthetic_rows(subscription_ids, per_type)) as fake:
+        inventory = ResourceInventory(None, endpoint=fake.endpoint).load(subscription_ids)
+        
+        return {
+            'subscriptions': subscription_count,
+            'resources': inventory.rows,
+            'graph_calls': inventory.calls,
+            'seconds': inventory.seconds
+        }
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    logger.info(measure_inventory())
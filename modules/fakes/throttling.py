@@ -0,0 +1,240 @@
+"""
+Azure Resource Manager istek kısıtlamasını (throttling) taklit eden yerel sahte sunucu.
+RequestScheduler'ın 429 yanıtları ve x-ms-ratelimit-* başlıkları karşısındaki
+davranışını Azure'a bağlanmadan denemek için kullanılır.
+"""
+
+import json
+import logging
+import math
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+logger = logging.getLogger("ThrottlingSimulator")
+
+_SUBSCRIPTION_PATH = re.compile(r"^/subscriptions/(?P<subscription>[^/]+)")
+
+class TokenBucket:
+    """
+    ARM'nin kapsam başına kullandığı belirteç kovası.
+    """
+    
+    def __init__(self, capacity, refill_per_second, clock=time.monotonic):
+        """
+        Kovayı dolu olarak başlatır.
+        
+        Args:
+            capacity: Kovanın alabileceği en fazla istek sayısı
+            refill_per_second: Saniyede eklenen istek sayısı
+            clock: Monoton saat işlevi
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock()
+    
+    def take(self):
+        """
+        Kovadan bir istek hakkı almaya çalışır.
+        
+        Returns:
+            (izin verildi mi, kalan hak sayısı, izin yoksa beklenmesi gereken süre)
+        """
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+        
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True, int(self.tokens), 0.0
+        
+        return False, 0, (1 - self.tokens) / self.refill_per_second
+
+class ThrottlingSimulator:
+    """
+    Abonelik ve kiracı kovalarına göre 200 ya da 429 yanıtı veren yerel HTTP sunucusu.
+    """
+    
+    def __init__(self, host="127.0.0.1", port=0, subscription_capacity=250, subscription_refill=25.0,
+                 tenant_capacity=1250, tenant_refill=125.0, latency=0.0):
+        """
+        Simülatörü başlatır.
+        
+        Args:
+            host: Dinlenecek adres
+            port: Dinlenecek port (0 ise boş bir port seçilir)
+            subscription_capacity: Abonelik başına okuma kovası kapasitesi
+            subscription_refill: Abonelik kovasının saniyedeki yenilenme hızı
+            tenant_capacity: Kiracı okuma kovası kapasitesi
+            tenant_refill: Kiracı kovasının saniyedeki yenilenme hızı
+            latency: Her isteğe eklenecek yapay gecikme (saniye)
+        """
+        self.subscription_capacity = subscription_capacity
+        self.subscription_refill = subscription_refill
+        self.latency = latency
+        self.requests_served = 0
+        self.requests_throttled = 0
+        self._tenant_bucket = TokenBucket(tenant_capacity, tenant_refill)
+        self._subscription_buckets = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+    
+    @property
+    def endpoint(self):
+        """
+        İsteklerin gönderileceği temel adres.
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        """
+        Sunucuyu arka plan iş parçacığında başlatır.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """
+        Sunucuyu durdurur.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    def admit(self, subscription_id):
+        """
+        Bir isteği kovalara göre kabul eder ya da kısıtlar.
+        
+        Args:
+            subscription_id: İstekteki abonelik ID'si
+        
+        Returns:
+            (HTTP durum kodu, yanıt başlıkları sözlüğü)
+        """
+        with self._lock:
+            bucket = self._subscription_buckets.get(subscription_id)
+            if bucket is None:
+                bucket = self._subscription_buckets[subscription_id] = TokenBucket(
+                    self.subscription_capacity, self.subscription_refill)
+            
+            tenant_allowed, tenant_remaining, tenant_wait = self._tenant_bucket.take()
+            if not tenant_allowed:
+                self.requests_throttled += 1
+                return 429, {
+                    'Retry-After': str(math.ceil(tenant_wait)),
+                    'x-ms-ratelimit-remaining-tenant-reads': '0'
+                }
+            
+            allowed, remaining, wait = bucket.take()
+            if not allowed:
+                # Reddedilen istek kiracı kovasından düşülmez
+                self._tenant_bucket.tokens += 1
+                self.requests_throttled += 1
+                return 429, {
+                    'Retry-After': str(math.ceil(wait)),
+                    'x-ms-ratelimit-remaining-subscription-reads': '0',
+                    'x-ms-ratelimit-remaining-tenant-reads': str(tenant_remaining)
+                }
+            
+            self.requests_served += 1
+            return 200, {
+                'x-ms-ratelimit-remaining-subscription-reads': str(remaining),
+                'x-ms-ratelimit-remaining-tenant-reads': str(tenant_remaining)
+            }
+    
+    def _make_handler(self):
+        """
+        Sunucuya bağlı istek işleyici sınıfını oluşturur.
+        """
+        simulator = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                match = _SUBSCRIPTION_PATH.match(urlparse(self.path).path)
+                if not match:
+                    self.send_error(404)
+                    return
+                
+                if simulator.latency:
+                    time.sleep(simulator.latency)
+                
+                status, headers = simulator.admit(match.group('subscription').lower())
+                payload = json.dumps({'value': []} if status == 200 else {
+                    'error': {'code': 'TooManyRequests', 'message': 'Throttled'}}).encode('utf-8')
+                
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+        
+        return Handler
+
+def simulate(request_count=400, workers=32, subscription_capacity=50, subscription_refill=20.0, use_scheduler=True):
+    """
+    Eşzamanlı okuma isteklerini simülatöre gönderir ve kısıtlama sonuçlarını ölçer.
+    
+    Args:
+        request_count: Gönderilecek istek sayısı
+        workers: Eşzamanlı iş parçacığı sayısı
+        subscription_capacity: Simülatörün abonelik kovası kapasitesi
+        subscription_refill: Simülatörün abonelik kovası yenilenme hızı
+        use_scheduler: True ise istekler RequestScheduler üzerinden zamanlanır
+    
+    Returns:
+        Ölçüm sonuçları sözlüğü
+    """
+    from azure.core.pipeline import PipelineClient
+    from azure.core.pipeline.policies import RetryPolicy
+    from azure.core.rest import HttpRequest
+    from modules.azure_client import RequestScheduler, ThrottlingPolicy
+    
+    subscription_id = "00000000-0000-0000-0000-000000000000"
+    scheduler = RequestScheduler(low_watermark=workers, refill_per_second=subscription_refill)
+    
+    with ThrottlingSimulator(subscription_capacity=subscription_capacity,
+                             subscription_refill=subscription_refill) as simulator:
+        policies = [RetryPolicy(retry_total=20)]
+        if use_scheduler:
+            policies.append(ThrottlingPolicy(scheduler))
+        client = PipelineClient(base_url=simulator.endpoint, policies=policies)
+        url = f"{simulator.endpoint}/subscriptions/{subscription_id}/resources?api-version=2021-04-01"
+        
+        def send(_):
+            response = client.send_request(HttpRequest("GET", url))
+            return response.status_code == 200
+        
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            succeeded = sum(executor.map(send, range(request_count)))
+        elapsed = time.perf_counter() - started
+        
+        return {
+            'succeeded': succeeded,
+            'failed': request_count - succeeded,
+            'throttled_responses': simulator.requests_throttled,
+            'seconds': elapsed
+        }
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    for use_scheduler in (False, True):
+        logger.info(f"scheduler={use_scheduler}: {simulate(use_scheduler=use_scheduler)}")
@@ -0,0 +1,149 @@
+"""
+Consumption API kullanım detaylarını taklit eden sentetik sayfa üreteci ve bellek ölçümü.
+CostIndex'in sayfa sayfa toplama sırasında bellek kullanımının satır sayısından
+bağımsız kaldığını Azure'a bağlanmadan doğrulamak için kullanılır.
+"""
+
+import gc
+import logging
+import time
+import tracemalloc
+
+logger = logging.getLogger("UsageDetailsBenchmark")
+
+_RESOURCE_TYPES = (
+    'Microsoft.Compute/virtualMachines',
+    'Microsoft.Storage/storageAccounts',
+    'Microsoft.Web/sites',
+    'Microsoft.Sql/servers/databases',
+    'Microsoft.DocumentDB/databaseAccounts',
+    'Microsoft.ContainerService/managedClusters'
+)
+
+class SyntheticUsage:
+    """
+    UsageDetail nesnesinin CostIndex tarafından okunan alanlarını taşıyan sentetik satır.
+    """
+    
+    __slots__ = ('resource_id', 'pretax_cost', 'resource_name', 'resource_type', 'resource_group',
+                 'resource_location', 'billing_currency', 'usage_start', 'meter_id')
+    
+    def __init__(self, resource_id, pretax_cost, resource_name, resource_type, resource_group,
+                 resource_location, billing_currency, usage_start, meter_id):
+        self.resource_id = resource_id
+        self.pretax_cost = pretax_cost
+        self.resource_name = resource_name
+        self.resource_type = resource_type
+        self.resource_group = resource_group
+        self.resource_location = resource_location
+        self.billing_currency = billing_currency
+        self.usage_start = usage_start
+        self.meter_id = meter_id
+
+class SyntheticUsagePager:
+    """
+    ItemPaged arayüzünü (by_page) taklit eden, satırları istendikçe üreten sayfalayıcı.
+    """
+    
+    def __init__(self, row_count, resource_count=10000, page_size=1000,
+                 subscription_id="00000000-0000-0000-0000-000000000000"):
+        """
+        Sayfalayıcıyı başlatır.
+        
+        Args:
+            row_count: Üretilecek toplam kullanım satırı sayısı
+            resource_count: Satırların dağıtılacağı farklı kaynak sayısı
+            page_size: Sayfa başına satır sayısı (Consumption API varsayılanı 1000)
+            subscription_id: Satırların abonelik ID'si
+        """
+        self.row_count = row_count
+        self.resource_count = resource_count
+        self.page_size = page_size
+        self.subscription_id = subscription_id
+    
+    def _make_row(self, index):
+        """
+        Sıra numarasından deterministik bir kullanım satırı üretir.
+        """
+        resource_index = index % self.resource_count
+        resource_type = _RESOURCE_TYPES[resource_index % len(_RESOURCE_TYPES)]
+        resource_group = f"rg-{resource_index % 50}"
+        name = f"res-{resource_index}"
+        
+        return SyntheticUsage(
+            resource_id=f"/subscriptions/{self.subscription_id}/resourceGroups/{resource_group}"
+                        f"/providers/{resource_type}/{name}",
+            pretax_cost=0.01 * (index % 97),
+            resource_name=name,
+            resource_type=resource_type,
+            resource_group=resource_group,
+            resource_location='eastus',
+            billing_currency='USD',
+            usage_start=f"2024-01-{index % 28 + 1:02d}",
+            meter_id=f"meter-{index % 400}"
+        )
+    
+    def by_page(self):
+        """
+        Satırları sayfa listeleri halinde üretir.
+        """
+        for start in range(0, self.row_count, self.page_size):
+            yield [self._make_row(index) for index in range(start, min(start + self.page_size, self.row_count))]
+    
+    def __iter__(self):
+        for page in self.by_page():
+            yield from page
+
+def measure_aggregation(row_count, resource_count=10000, materialize=False):
+    """
+    Kullanım satırlarını CostIndex'e toplarken en yüksek bellek kullanımını ölçer.
+    
+    Args:
+        row_count: Kullanım satırı sayısı
+        resource_count: Farklı kaynak sayısı
+        materialize: True ise satırlar önce list() ile belleğe alınır (eski davranış)
+    
+    Returns:
+        Ölçüm sonuçları sözlüğü
+    """
+    from modules.cost_index import CostIndex
+    
+    pager = SyntheticUsagePager(row_count, resource_count)
+    cost_index = CostIndex(pager.subscription_id, '2024-01-01', '2024-01-31')
+    
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    
+    if materialize:
+        for usage in list(pager):
+            cost_index.add_usage(usage)
+    else:
+        for page in pager.by_page():
+            cost_index.add_page(page)
+    
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return {
+        'rows': cost_index.rows_read,
+        'resources': len(cost_index),
+        'peak_mb': peak / (1024 * 1024),
+        'seconds': elapsed
+    }
+
+def benchmark(row_counts=(50000, 500000, 5000000), resource_count=10000):
+    """
+    Farklı satır sayılarında sayfa sayfa toplamanın bellek kullanımını ölçer.
+    
+    Returns:
+        Satır sayısına göre ölçüm sonuçları listesi
+    """
+    return [measure_aggregation(row_count, resource_count) for row_count in row_counts]
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    for result in benchmark():
+        logger.info(f"akış: {result}")
+    logger.info(f"list(): {measure_aggregation(500000, materialize=True)}")
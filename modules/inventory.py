@@ -0,0 +1,215 @@
+"""
+Azure Resource Graph tabanlı kaynak envanteri modülü.
+Tüm aboneliklerin analiz edilecek kaynaklarını, hizmet başına liste çağrıları
+yerine birkaç sayfalı Resource Graph sorgusuyla toplar.
+"""
+
+import time
+import logging
+from collections import defaultdict
+from types import SimpleNamespace
+from azure.core.pipeline import PipelineClient
+from azure.core.pipeline.policies import BearerTokenCredentialPolicy, RetryPolicy
+from azure.core.rest import HttpRequest
+from modules.azure_client import ThrottlingPolicy
+
+logger = logging.getLogger("ResourceInventory")
+
+RESOURCE_GRAPH_ENDPOINT = "https://management.azure.com"
+RESOURCE_GRAPH_SCOPE = "https://management.azure.com/.default"
+RESOURCE_GRAPH_API_VERSION = "2022-10-01"
+RESOURCE_GRAPH_MAX_SUBSCRIPTIONS = 1000  # Tek sorguda gönderilebilecek en fazla abonelik sayısı
+RESOURCE_GRAPH_PAGE_SIZE = 1000  # Sayfa başına en fazla satır
+
+# Analizörlerin kullandığı kaynak türleri (Resource Graph küçük harfli tür adları döndürür)
+VIRTUAL_MACHINES = 'microsoft.compute/virtualmachines'
+STORAGE_ACCOUNTS = 'microsoft.storage/storageaccounts'
+WEB_APPS = 'microsoft.web/sites'
+SQL_DATABASES = 'microsoft.sql/servers/databases'
+COSMOS_ACCOUNTS = 'microsoft.documentdb/databaseaccounts'
+AKS_CLUSTERS = 'microsoft.containerservice/managedclusters'
+
+INVENTORY_TYPES = (VIRTUAL_MACHINES, STORAGE_ACCOUNTS, WEB_APPS, SQL_DATABASES, COSMOS_ACCOUNTS, AKS_CLUSTERS)
+
+# Analizörlerin SDK nesnelerinden okuduğu alanlar tek sorguda düz sütunlar olarak alınır
+INVENTORY_QUERY = """
+Resources
+| where type in~ ({types})
+| extend vmSize = tostring(properties.hardwareProfile.vmSize),
+         powerState = tostring(properties.extended.instanceView.powerState.code),
+         state = tostring(properties.state),
+         serverFarmId = tostring(properties.serverFarmId),
+         status = tostring(properties.status),
+         offerType = tostring(properties.databaseAccountOfferType),
+         provisioningState = tostring(properties.provisioningState),
+         agentPoolProfiles = properties.agentPoolProfiles
+| project id, name, type, location, subscriptionId, resourceGroup, sku, vmSize, powerState, state,
+          serverFarmId, status, offerType, provisioningState, agentPoolProfiles
+| order by id asc
+""".format(types=', '.join(f"'{resource_type}'" for resource_type in INVENTORY_TYPES))
+
+class GraphResource:
+    """
+    Resource Graph satırını analizörlerin beklediği SDK nesnesi arayüzüyle sunan adaptör.
+    """
+    
+    def __init__(self, row):
+        """
+        Adaptörü bir sorgu satırından oluşturur.
+        
+        Args:
+            row: Resource Graph satırı (objectArray biçiminde sözlük)
+        """
+        sku = row.get('sku') or {}
+        
+        self.id = row.get('id')
+        self.name = row.get('name')
+        self.type = (row.get('type') or '').lower()
+        self.location = row.get('location')
+        self.subscription_id = (row.get('subscriptionId') or '').lower()
+        self.resource_group = row.get('resourceGroup')
+        self.sku = SimpleNamespace(name=sku.get('name'), tier=sku.get('tier')) if sku else None
+        self.hardware_profile = SimpleNamespace(vm_size=row.get('vmSize') or None)
+        self.power_state = row.get('powerState') or None
+        self.state = row.get('state') or None
+        self.server_farm_id = row.get('serverFarmId') or None
+        self.status = row.get('status') or None
+        self.database_account_offer_type = row.get('offerType') or None
+        self.provisioning_state = row.get('provisioningState') or None
+        self.agent_pool_profiles = [
+            SimpleNamespace(name=pool.get('name'), count=pool.get('count') or 0, vm_size=pool.get('vmSize'))
+            for pool in row.get('agentPoolProfiles') or []
+        ]
+
+class ResourceInventory:
+    """
+    Birden fazla aboneliğin kaynaklarını Resource Graph ile toplayan ve
+    abonelik/kaynak türüne göre dizinleyen envanter.
+    """
+    
+    def __init__(self, credential, endpoint=None, scheduler=None, page_size=RESOURCE_GRAPH_PAGE_SIZE):
+        """
+        Envanteri başlatır.
+        
+        Args:
+            credential: Azure kimlik bilgisi nesnesi
+            endpoint: Resource Graph temel adresi (None ise Azure Resource Manager)
+            scheduler: İstekleri zamanlayacak RequestScheduler (isteğe bağlı)
+            page_size: Sayfa başına istenecek satır sayısı
+        """
+        self.endpoint = (endpoint or RESOURCE_GRAPH_ENDPOINT).rstrip('/')
+        self.page_size = page_size
+        self.calls = 0
+        self.rows = 0
+        self.seconds = 0.0
+        self._resources = defaultdict(list)  # (subscription_id, type) -> [GraphResource]
+        self._loaded = set()
+        
+        policies = [RetryPolicy()]
+        # Yerel (http) sahte uç noktalar için kimlik doğrulama gerekmez
+        if self.endpoint.startswith("https://"):
+            policies.insert(0, BearerTokenCredentialPolicy(credential, RESOURCE_GRAPH_SCOPE))
+        if scheduler:
+            policies.append(ThrottlingPolicy(scheduler, kind='graph'))
+        self._client = PipelineClient(base_url=self.endpoint, policies=policies)
+    
+    def iter_rows(self, subscription_ids, query=INVENTORY_QUERY):
+        """
+        Sorgu sonuçlarını abonelik parçaları ve sayfalar halinde döndürür.
+        
+        Args:
+            subscription_ids: Abonelik ID'leri listesi
+            query: Resource Graph (KQL) sorgusu
+        
+        Returns:
+            Satır sözlükleri üreteci
+        """
+        subscription_ids = list(subscription_ids)
+        
+        for i in range(0, len(subscription_ids), RESOURCE_GRAPH_MAX_SUBSCRIPTIONS):
+            chunk = subscription_ids[i:i + RESOURCE_GRAPH_MAX_SUBSCRIPTIONS]
+            skip_token = None
+            
+            while True:
+                options = {'$top': self.page_size, 'resultFormat': 'objectArray'}
+                if skip_token:
+                    options['$skipToken'] = skip_token
+                
+                request = HttpRequest(
+                    "POST",
+                    f"{self.endpoint}/providers/Microsoft.ResourceGraph/resources",
+                    params={'api-version': RESOURCE_GRAPH_API_VERSION},
+                    json={'subscriptions': chunk, 'query': query, 'options': options}
+                )
+                response = self._client.send_request(request)
+                response.raise_for_status()
+                self.calls += 1
+                
+                data = response.json()
+                for row in data.get('data', []):
+                    yield row
+                
+                skip_token = data.get('$skipToken')
+                if not skip_token:
+                    break
+                
+                self._respect_quota(response.headers)
+    
+    def _respect_quota(self, headers):
+        """
+        Kullanıcı kotası tükendiyse kota yenilenene kadar bekler.
+        
+        Resource Graph kısıtlaması x-ms-user-quota-remaining ve
+        x-ms-user-quota-resets-after (ss:dd:sn) başlıklarıyla bildirilir.
+        """
+        remaining = headers.get('x-ms-user-quota-remaining')
+        resets_after = headers.get('x-ms-user-quota-resets-after')
+        if remaining is None or resets_after is None or int(remaining) > 0:
+            return
+        
+        hours, minutes, seconds = (float(part) for part in resets_after.split(':'))
+        delay = hours * 3600 + minutes * 60 + seconds
+        logger.warning(f"Resource Graph kotası tükendi, {delay:.1f} sn bekleniyor")
+        time.sleep(delay)
+    
+    def load(self, subscription_ids):
+        """
+        Aboneliklerin envanterini yükler ve dizinler.
+        
+        Args:
+            subscription_ids: Abonelik ID'leri listesi
+        
+        Returns:
+            Envanter nesnesinin kendisi
+        """
+        subscription_ids = [subscription_id.lower() for subscription_id in subscription_ids]
+        started = time.perf_counter()
+        
+        for row in self.iter_rows(subscription_ids):
+            resource = GraphResource(row)
+            self._resources[(resource.subscription_id, resource.type)].append(resource)
+            self.rows += 1
+        
+        self._loaded.update(subscription_ids)
+        self.seconds += time.perf_counter() - started
+        
+        logger.info(f"Resource Graph envanteri yüklendi - {len(subscription_ids)} abonelik, "
+                    f"{self.rows} kaynak, {self.calls} sorgu, {self.seconds:.2f} sn")
+        return self
+    
+    def get(self, subscription_id, resource_type):
+        """
+        Bir aboneliğin belirli türdeki kaynaklarını döndürür.
+        
+        Args:
+            subscription_id: Abonelik ID'si
+            resource_type: Kaynak türü (örn. VIRTUAL_MACHINES)
+        
+        Returns:
+            GraphResource listesi veya None (abonelik envantere yüklenmediyse)
+        """
+        subscription_id = subscription_id.lower()
+        if subscription_id not in self._loaded:
+            return None
+        
+        return list(self._resources.get((subscription_id, resource_type.lower()), []))
@@ -0,0 +1,364 @@
+"""
+Metrik zaman serileri için kalıcı, SQLite tabanlı önbellek modülü.
+"""
+
+import os
+import json
+import time
+import logging
+import sqlite3
+import threading
+from datetime import datetime, date, timedelta, timezone
+from modules.resource_id import resource_key
+
+logger = logging.getLogger("MetricCache")
+
+# Bir günün kapanmış (değişmez) sayılması için gün bitiminden sonra beklenen süre
+DAILY_CLOSE_LAG = timedelta(hours=2)
+
+# Günlük nokta tablosunun sürümü; 1'den itibaren günler UTC gece yarısına hizalıdır,
+# 2'den itibaren günlük serilerin son erişim zamanı daily_series tablosunda tutulur
+DAILY_SCHEMA_VERSION = 2
+
+class MetricCache:
+    """
+    Metrik serilerini (resource_id, metric, zaman aralığı, interval, aggregation)
+    anahtarıyla diskte saklayan, TTL ve LRU tahliyesi destekleyen önbellek.
+    """
+    
+    def __init__(self, path, ttl_seconds=6 * 3600, max_entries=200000, daily_retention_days=400):
+        """
+        Önbelleği başlatır.
+        
+        Args:
+            path: SQLite veritabanı dosyasının yolu
+            ttl_seconds: Açık (bugünü içeren) zaman aralıkları için geçerlilik süresi
+            max_entries: En fazla saklanacak kayıt sayısı (aralık kayıtları ve günlük seriler
+                birlikte), aşılırsa en eski erişilenler silinir
+            daily_retention_days: Günlük serilerin saklanacağı gün sayısı
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.daily_retention_days = daily_retention_days
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS metric_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_metric_cache_last_access ON metric_cache (last_access)")
+        # Artımlı sorgular için kaynak başına günlük seri noktaları
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS daily_points ("
+            " series_key TEXT NOT NULL,"
+            " day TEXT NOT NULL,"
+            " value REAL,"
+            " closed INTEGER NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " PRIMARY KEY (series_key, day))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_daily_points_day ON daily_points (day)")
+        # LRU tahliyesi için günlük seri başına son erişim zamanı
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS daily_series ("
+            " series_key TEXT PRIMARY KEY,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_daily_series_last_access ON daily_series (last_access)")
+        
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            # Eski sürümlerde yerel saate hizalı yazılmış günlük noktalar UTC günleriyle karışmasın
+            self._conn.execute("DELETE FROM daily_points")
+        if version < 2:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO daily_series (series_key, last_access)"
+                " SELECT series_key, MAX(fetched_at) FROM daily_points GROUP BY series_key")
+        if version < DAILY_SCHEMA_VERSION:
+            self._conn.execute(f"PRAGMA user_version = {DAILY_SCHEMA_VERSION}")
+        self._conn.commit()
+    
+    @staticmethod
+    def make_key(resource_id, metric_name, start_time, end_time, interval, aggregation):
+        """
+        Önbellek anahtarını oluşturur. Zaman aralığı günlük kovalara yuvarlanır,
+        böylece aynı gün içindeki tekrar çalıştırmalar aynı kaydı kullanır.
+        
+        Returns:
+            Önbellek anahtarı
+        """
+        bucket = f"{start_time:%Y-%m-%d}/{end_time:%Y-%m-%d}"
+        return '|'.join([resource_key(resource_id), metric_name.lower(), bucket, interval, aggregation.lower()])
+    
+    def _expires_at(self, end_time):
+        """
+        Kaydın son geçerlilik zamanını hesaplar. Tamamen geçmişte kalan
+        (kapanmış) günlük aralıklar değişmeyeceği için süresiz saklanır.
+        """
+        end_day = end_time.date() if isinstance(end_time, datetime) else end_time
+        if end_day < datetime.now(timezone.utc).date():
+            return None
+        
+        return time.time() + self.ttl_seconds
+    
+    def get(self, key):
+        """
+        Önbellekten bir seri okur.
+        
+        Args:
+            key: Önbellek anahtarı
+        
+        Returns:
+            Kayıtlı seri veya None (kayıt yoksa ya da süresi dolduysa)
+        """
+        now = time.time()
+        
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM metric_cache WHERE key = ?", (key,)).fetchone()
+            
+            if row is None or (row[1] is not None and row[1] < now):
+                if row is not None:
+                    self._conn.execute("DELETE FROM metric_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            
+            self._conn.execute("UPDATE metric_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        
+        return json.loads(row[0])
+    
+    def put(self, key, series, end_time):
+        """
+        Bir seriyi önbelleğe yazar.
+        
+        Args:
+            key: Önbellek anahtarı
+            series: Kaydedilecek seri ([zaman damgası, değer] çiftleri listesi)
+            end_time: Serinin zaman aralığının bitişi (TTL hesabı için)
+        """
+        self.put_many([(key, series, end_time)])
+    
+    def put_many(self, items):
+        """
+        Birden fazla seriyi tek işlemde önbelleğe yazar.
+        
+        Args:
+            items: (key, series, end_time) demetleri listesi
+        """
+        if not items:
+            return
+        
+        now = time.time()
+        rows = [(key, json.dumps(series), self._expires_at(end_time), now) for key, series, end_time in items]
+        
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO metric_cache (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                rows)
+            self._evict()
+            self._conn.commit()
+    
+    def _evict(self):
+        """
+        Kayıt sayısı sınırı aşıldıysa en uzun süredir erişilmeyen kayıtları siler.
+        
+        Aralık kayıtları ve günlük seriler aynı sınırı paylaşır; bir günlük seri
+        tahliye edildiğinde tüm günlük noktaları silinir.
+        """
+        overflow = self._count_entries() - self.max_entries
+        if overflow <= 0:
+            return
+        
+        victims = self._conn.execute(
+            "SELECT 0, key, last_access FROM metric_cache"
+            " UNION ALL SELECT 1, series_key, last_access FROM daily_series"
+            " ORDER BY last_access ASC LIMIT ?", (overflow,)).fetchall()
+        
+        keys = [(key,) for daily, key, _ in victims if not daily]
+        series_keys = [(key,) for daily, key, _ in victims if daily]
+        self._conn.executemany("DELETE FROM metric_cache WHERE key = ?", keys)
+        self._conn.executemany("DELETE FROM daily_points WHERE series_key = ?", series_keys)
+        self._conn.executemany("DELETE FROM daily_series WHERE series_key = ?", series_keys)
+        self.evictions += len(victims)
+    
+    def _count_entries(self):
+        """
+        Aralık kayıtları ve günlük serilerin toplam sayısını döndürür.
+        """
+        return (self._conn.execute("SELECT COUNT(*) FROM metric_cache").fetchone()[0] +
+                self._conn.execute("SELECT COUNT(*) FROM daily_series").fetchone()[0])
+    
+    @staticmethod
+    def daily_key(resource_id, metric_name, aggregation):
+        """
+        Günlük seri anahtarını oluşturur.
+        
+        Returns:
+            Seri anahtarı
+        """
+        return '|'.join([resource_key(resource_id), metric_name.lower(), aggregation.lower()])
+    
+    @staticmethod
+    def closed_before():
+        """
+        Kapanmış sayılan son günden sonraki günü (UTC) döndürür.
+        """
+        return (datetime.now(timezone.utc) - DAILY_CLOSE_LAG).date()
+    
+    def plan_daily_fetch(self, series_key, start_day, end_day):
+        """
+        Bir günlük serinin pencere içinde yeniden sorgulanması gereken ilk gününü bulur.
+        
+        Kapanmış günler yerelde varsa bir daha sorgulanmaz. Açık günler (bugün)
+        TTL süresi içinde alınmışsa yeniden sorgulanmaz.
+        
+        Args:
+            series_key: daily_key ile oluşturulan seri anahtarı
+            start_day: Pencerenin ilk günü
+            end_day: Pencerenin son günü
+        
+        Returns:
+            Sorgulanması gereken ilk gün veya None (seri eksiksizse)
+        """
+        closed_before = self.closed_before()
+        stale_before = time.time() - self.ttl_seconds
+        
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, closed, fetched_at FROM daily_points"
+                " WHERE series_key = ? AND day BETWEEN ? AND ?",
+                (series_key, start_day.isoformat(), end_day.isoformat())).fetchall()
+        
+        stored = {row[0]: (row[1], row[2]) for row in rows}
+        fetch_from = None
+        day = start_day
+        while day <= end_day:
+            entry = stored.get(day.isoformat())
+            if entry is None or (not entry[0] and (day < closed_before or entry[1] < stale_before)):
+                fetch_from = day
+                break
+            day += timedelta(days=1)
+        
+        with self._lock:
+            if fetch_from is None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        
+        return fetch_from
+    
+    def read_daily_series(self, series_key, start_day, end_day):
+        """
+        Pencere içindeki günlük seri noktalarını okur ve serinin son erişim zamanını günceller.
+        
+        Returns:
+            [gün, değer] çiftleri listesi (gün sırasına göre)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, value FROM daily_points"
+                " WHERE series_key = ? AND day BETWEEN ? AND ? ORDER BY day",
+                (series_key, start_day.isoformat(), end_day.isoformat())).fetchall()
+            self._conn.execute("UPDATE daily_series SET last_access = ? WHERE series_key = ?",
+                               (time.time(), series_key))
+            self._conn.commit()
+        
+        return [[day, value] for day, value in rows]
+    
+    def put_daily_many(self, items):
+        """
+        Yeni alınan günlük noktaları yerel serilerle birleştirir.
+        
+        Günler UTC tarihidir. Sorgu aralığında yanıtta bulunmayan günler boş değerle
+        kaydedilir, böylece veri üretmeyen kaynaklar her çalıştırmada yeniden
+        sorgulanmaz; aralık dışına düşen noktalar yazılmaz.
+        
+        Args:
+            items: (series_key, series, fetch_from, end_day) demetleri listesi
+                (fetch_from UTC gece yarısından başlayan ilk tam gün olmalıdır)
+        """
+        if not items:
+            return
+        
+        now = time.time()
+        closed_before = self.closed_before()
+        rows = []
+        
+        for series_key, series, fetch_from, end_day in items:
+            first_key, last_key = fetch_from.isoformat(), end_day.isoformat()
+            values = {}
+            for timestamp, value in series:
+                if timestamp and first_key <= timestamp[:10] <= last_key:
+                    values[timestamp[:10]] = value
+            
+            day = fetch_from
+            while day <= end_day:
+                values.setdefault(day.isoformat(), None)
+                day += timedelta(days=1)
+            
+            for day_key, value in values.items():
+                rows.append((series_key, day_key, value,
+                             1 if date.fromisoformat(day_key) < closed_before else 0, now))
+        
+        cutoff = (closed_before - timedelta(days=self.daily_retention_days)).isoformat()
+        
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO daily_points (series_key, day, value, closed, fetched_at)"
+                " VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO daily_series (series_key, last_access) VALUES (?, ?)",
+                [(item[0], now) for item in items])
+            expired = self._conn.execute("DELETE FROM daily_points WHERE day < ?", (cutoff,)).rowcount
+            if expired:
+                # Tüm noktaları saklama süresini aşan seriler sınır hesabından çıkarılır
+                self._conn.execute(
+                    "DELETE FROM daily_series WHERE series_key NOT IN (SELECT series_key FROM daily_points)")
+            self._evict()
+            self._conn.commit()
+    
+    def stats(self):
+        """
+        Önbellek isabet/ıskalama sayaçlarını döndürür.
+        
+        Returns:
+            İstatistik sözlüğü
+        """
+        with self._lock:
+            entries = self._count_entries()
+            daily_series = self._conn.execute("SELECT COUNT(*) FROM daily_series").fetchone()[0]
+            hits, misses, evictions = self.hits, self.misses, self.evictions
+        
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'evictions': evictions,
+            'entries': entries,
+            'daily_series': daily_series,
+            'hit_ratio': hits / lookups if lookups else 0.0
+        }
+    
+    def close(self):
+        """
+        Veritabanı bağlantısını kapatır.
+        """
+        with self._lock:
+            self._conn.close()
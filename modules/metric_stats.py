@@ -0,0 +1,165 @@
+"""
+Metrik zaman serileri için vektörel istatistik modülü.
+"""
+
+import re
+import logging
+import warnings
+import numpy as np
+
+logger = logging.getLogger("MetricStats")
+
+STAT_NAMES = ('mean', 'max', 'p95', 'p99', 'idle_fraction', 'trend_slope', 'count')
+
+_SECONDS_PER_DAY = 86400.0
+
+# Azure Monitor zaman aralıkları (ISO 8601 süre, örn. PT5M, PT1H, P1D)
+_ISO_INTERVAL = re.compile(r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?)?$", re.IGNORECASE)
+
+def interval_days(interval):
+    """
+    Metrik zaman aralığının uzunluğunu gün cinsinden döndürür.
+    
+    Args:
+        interval: ISO 8601 süre (örn. P1D, PT1H, PT5M)
+    
+    Returns:
+        Gün cinsinden aralık uzunluğu (tanınmayan aralıklar için 1.0)
+    """
+    match = _ISO_INTERVAL.match(interval or '')
+    if not match or not any(match.groups()):
+        logger.warning(f"Tanınmayan metrik aralığı, günlük kabul ediliyor: {interval}")
+        return 1.0
+    
+    days, hours, minutes = (int(part or 0) for part in match.groups())
+    return (days * _SECONDS_PER_DAY + hours * 3600 + minutes * 60) / _SECONDS_PER_DAY
+
+def series_to_arrays(series):
+    """
+    [[zaman damgası, değer]] biçimindeki bir seriyi NumPy dizilerine dönüştürür.
+    
+    Args:
+        series: [zaman damgası, değer] çiftleri listesi (değer None olabilir; zaman
+            damgası olmayan noktalar, önbelleğe yazarken olduğu gibi atlanır)
+    
+    Returns:
+        (timestamps: datetime64[s] dizisi, values: float64 dizisi, eksik değerler NaN)
+    """
+    series = [point for point in series or () if point[0]]
+    if not series:
+        return np.empty(0, dtype='datetime64[s]'), np.empty(0, dtype=np.float64)
+    
+    timestamps, values = zip(*series)
+    # Saat dilimi eki (Z, +00:00) NumPy tarafından desteklenmediği için kırpılır
+    timestamps = np.array([timestamp[:19] for timestamp in timestamps], dtype='datetime64[s]')
+    values = np.array(values, dtype=np.float64)
+    return timestamps, values
+
+def stack_series(series_list):
+    """
+    Birden fazla seriyi NaN ile doldurulmuş iki boyutlu matrislere yerleştirir.
+    
+    Args:
+        series_list: Seri listesi (None olanlar boş seri sayılır)
+    
+    Returns:
+        (times: gün cinsinden göreli zaman matrisi, values: değer matrisi), boyut N x T
+    """
+    arrays = [series_to_arrays(series) for series in series_list]
+    width = max((len(values) for _, values in arrays), default=0)
+    
+    times = np.full((len(arrays), width), np.nan)
+    values = np.full((len(arrays), width), np.nan)
+    
+    for row, (row_times, row_values) in enumerate(arrays):
+        if len(row_values):
+            seconds = (row_times - row_times[0]).astype(np.float64)
+            times[row, :len(row_values)] = seconds / _SECONDS_PER_DAY
+            values[row, :len(row_values)] = row_values
+    
+    return times, values
+
+def compute_series_stats(series_list, idle_threshold=None):
+    """
+    Birden fazla serinin istatistiklerini tek vektörel geçişte hesaplar.
+    
+    Args:
+        series_list: Seri listesi ([[zaman damgası, değer]] veya None)
+        idle_threshold: İnaktiflik eşiği (skaler veya seri başına dizi); verilmezse
+            idle_fraction NaN döner
+    
+    Returns:
+        İstatistik adına göre dizi sözlüğü {stat: np.ndarray}, her dizi seri sırasıyla
+        hizalıdır. Verisi olmayan seriler için değerler NaN, count 0'dır.
+    """
+    times, values = stack_series(series_list)
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=1)
+    
+    stats = {'count': count}
+    
+    with warnings.catch_warnings():
+        # Tamamen boş satırlar için "Mean of empty slice" uyarıları beklenen durumdur
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        
+        if values.shape[1]:
+            stats['mean'] = np.nanmean(values, axis=1)
+            stats['max'] = np.nanmax(values, axis=1)
+            stats['p95'], stats['p99'] = np.nanpercentile(values, [95, 99], axis=1)
+        else:
+            for name in ('mean', 'max', 'p95', 'p99'):
+                stats[name] = np.full(len(series_list), np.nan)
+        
+        # Eşik altındaki noktaların oranı (saatlik serilerde boşta geçen saat oranı)
+        if idle_threshold is None:
+            stats['idle_fraction'] = np.full(len(series_list), np.nan)
+        else:
+            threshold = np.asarray(idle_threshold, dtype=np.float64)
+            if threshold.ndim:
+                threshold = threshold[:, np.newaxis]
+            idle = (values < threshold) & valid
+            stats['idle_fraction'] = np.where(count > 0, idle.sum(axis=1) / np.maximum(count, 1), np.nan)
+        
+        # En küçük kareler eğimi (birim/gün), geçerli noktalar üzerinden
+        time_mean = np.nanmean(np.where(valid, times, np.nan), axis=1, keepdims=True)
+        value_mean = np.nanmean(values, axis=1, keepdims=True) if values.shape[1] else time_mean
+        time_delta = np.where(valid, times - time_mean, 0.0)
+        value_delta = np.where(valid, values - value_mean, 0.0)
+        denominator = (time_delta ** 2).sum(axis=1)
+        stats['trend_slope'] = np.where(
+            denominator > 0, (time_delta * value_delta).sum(axis=1) / np.where(denominator > 0, denominator, 1.0),
+            np.nan)
+    
+    return stats
+
+def series_means(series_list):
+    """
+    Birden fazla serinin ortalamalarını vektörel olarak hesaplar.
+    
+    Returns:
+        Ortalama değerler listesi (verisi olmayan seriler için None)
+    """
+    if not series_list:
+        return []
+    
+    means = compute_series_stats(series_list)['mean']
+    return [None if np.isnan(mean) else float(mean) for mean in means]
+
+def stats_by_index(stats, index):
+    """
+    Vektörel istatistiklerden tek bir serinin değerlerini sözlük olarak çıkarır.
+    
+    Args:
+        stats: compute_series_stats çıktısı
+        index: Seri sırası
+    
+    Returns:
+        {stat: değer} sözlüğü (NaN değerler None olarak döner)
+    """
+    result = {}
+    for name in STAT_NAMES:
+        value = float(stats[name][index])
+        result[name] = None if np.isnan(value) else value
+    
+    result['count'] = int(stats['count'][index])
+    return result
@@ -0,0 +1,480 @@
+"""
+Azure Retail Prices veri kümesinin yerel anlık görüntüsünden (JSON/CSV) oluşturulan fiyat kataloğu.
+Fiyatlar (hizmet, SKU, bölge, sayaç, fiyat türü) anahtarıyla sözlükte tutulur; öneri kuralları
+boyut, katman, ayrılmış kapasite ve Spot alternatiflerinin fiyatlarını API çağrısı yapmadan okur.
+"""
+
+import os
+import re
+import glob
+import json
+import time
+import logging
+import threading
+from bisect import bisect_left
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("PriceCatalog")
+
+# Fiyat türleri; ayrılmış kapasite fiyatları tüketim fiyatıyla aynı birime çevrilir
+CONSUMPTION = 'consumption'
+SPOT = 'spot'
+LOW_PRIORITY = 'low_priority'
+DEVTEST = 'devtest'
+RESERVATION_1Y = 'reservation_1y'
+RESERVATION_3Y = 'reservation_3y'
+
+HOURS_PER_YEAR = 8760
+
+# Anlık görüntü biçimleri API alan adlarını kullanır; her standart sütun için ilk eşleşen ad
+# kullanılır (büyük/küçük harf duyarsız)
+CATALOG_COLUMNS = {
+    'service': ('servicename',),
+    'arm_sku': ('armskuname',),
+    'sku': ('skuname',),
+    'region': ('armregionname',),
+    'meter': ('metername',),
+    'price_type': ('type',),
+    'term': ('reservationterm',),
+    'price': ('retailprice', 'unitprice'),
+    'unit': ('unitofmeasure',),
+    'product': ('productname',),
+    'tier_minimum': ('tierminimumunits',)
+}
+
+_REQUIRED_COLUMNS = {'service', 'region', 'meter', 'price'}
+
+# Depolama SKU'larının replikasyon adları (ARM biçiminde, örn. Standard_RAGRS)
+STORAGE_REPLICATIONS = ('lrs', 'grs', 'ragrs', 'zrs', 'gzrs', 'ragzrs')
+
+# Boyut ailesi kalıpları: aile adı ve boyut numarası (örn. standard_d4s_v3 -> standard_d#s_v3, 4)
+SKU_FAMILY_PATTERNS = (
+    re.compile(r'^(standard_[a-z]+)(\d+)([a-z]*(?:_v\d+)?)$'),  # VM: standard_d4s_v3
+    re.compile(r'^(.+_)(\d+)()$'),  # vCore: gp_gen5_4
+    re.compile(r'^([a-z]+)(\d+)()$')  # DTU: s3, p1
+)
+
+_KEY_DIMENSIONS = ('service', 'sku', 'region', 'meter', 'price_type')
+
+def region_key(region):
+    """
+    Bölge adını katalogdaki biçime çevirir (örn. 'West Europe' -> 'westeurope').
+    """
+    return region.replace(' ', '').lower() if region else ''
+
+def sku_family(sku):
+    """
+    SKU'nun boyut ailesini ve boyut numarasını döndürür.
+    
+    Args:
+        sku: Küçük harfli SKU adı
+    
+    Returns:
+        (aile, boyut) demeti veya aile kalıbına uymuyorsa None
+    """
+    for pattern in SKU_FAMILY_PATTERNS:
+        match = pattern.match(sku)
+        if match:
+            return f"{match.group(1)}#{match.group(3)}", int(match.group(2))
+    return None
+
+class PriceCatalog:
+    """
+    Perakende fiyatlarının (hizmet, SKU, bölge, sayaç, fiyat türü) anahtarlı, sıkıştırılmış dizini.
+    
+    Anahtar bileşenleri boyut başına tamsayı kodlarına çevrilir ve tek bir tamsayıda
+    birleştirilir; fiyat araması birkaç sözlük erişimidir. Sayaç verilmeyen aramalar
+    için her (hizmet, SKU, bölge, fiyat türü) birleşiminin birincil sayacı, boyut
+    alternatifleri için de aile başına boyut sırasıyla SKU listesi tutulur.
+    
+    Windows VM satırları atlanır; VM fiyatları Linux taban fiyatlarıdır.
+    """
+    
+    def __init__(self, path, services=None):
+        """
+        Kataloğu başlatır; dosyalar ilk kullanımda bir kez okunur.
+        
+        Args:
+            path: Anlık görüntü dosyası veya dosyaları içeren dizin (.json, .jsonl, .csv, .csv.gz)
+            services: Yalnızca bu hizmetlerin fiyatlarını dizinle (örn. {'Virtual Machines'}; None ise tümü)
+        """
+        self.path = path
+        self.services = {service.lower() for service in services} if services else None
+        self.rows_read = 0
+        self.seconds = 0.0
+        self._codes = None  # Boyut başına {normalize değer: kod}
+        self._shifts = None  # Boyut başına bit kaydırma miktarı
+        self._prices = None  # {birleşik anahtar: birim fiyat}
+        self._primary = None  # {sayaçsız birleşik anahtar: birincil sayaç birim fiyatı}
+        self._families = None  # {(hizmet, bölge, fiyat türü, aile): [(boyut, SKU)]}
+        self._sku_names = None  # {küçük harfli SKU: özgün SKU adı}
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        self.load()
+        return len(self._prices)
+    
+    def files(self):
+        """
+        Okunacak anlık görüntü dosyalarını döndürür.
+        
+        Returns:
+            Sıralı dosya yolları listesi
+        """
+        if os.path.isfile(self.path):
+            return [self.path]
+        
+        files = []
+        for pattern in ('*.json', '*.jsonl', '*.csv', '*.csv.gz'):
+            files.extend(glob.glob(os.path.join(self.path, '**', pattern), recursive=True))
+        return sorted(files)
+    
+    def _resolve_columns(self, names):
+        """
+        Dosya sütun adlarını standart sütun adlarına eşler.
+        
+        Args:
+            names: Dosyadaki sütun adları
+        
+        Returns:
+            {dosya sütunu: standart sütun} sözlüğü
+        """
+        by_lower = {name.lower(): name for name in names}
+        mapping = {}
+        for column, aliases in CATALOG_COLUMNS.items():
+            source = next((by_lower[alias] for alias in aliases if alias in by_lower), None)
+            if source:
+                mapping[source] = column
+        
+        missing = _REQUIRED_COLUMNS - set(mapping.values())
+        if missing:
+            raise ValueError(f"Fiyat dosyasında gerekli sütunlar bulunamadı: {', '.join(sorted(missing))}")
+        
+        return mapping
+    
+    def _read_file(self, path):
+        """
+        Bir anlık görüntü dosyasını standart sütunlu DataFrame olarak okur.
+        
+        JSON dosyaları API sayfası ({"Items": [...]}), öğe listesi veya satır başına
+        bir öğe (JSON Lines) biçiminde olabilir.
+        """
+        if path.endswith('.csv') or path.endswith('.csv.gz'):
+            mapping = self._resolve_columns(pd.read_csv(path, nrows=0).columns)
+            frame = pd.read_csv(path, usecols=list(mapping), dtype={
+                source: ('float64' if column in ('price', 'tier_minimum') else 'string')
+                for source, column in mapping.items()
+            })
+            return frame.rename(columns=mapping)
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.endswith('.jsonl'):
+                items = [json.loads(line) for line in f if line.strip()]
+            else:
+                data = json.load(f)
+                items = (data.get('Items') or data.get('items') or []) if isinstance(data, dict) else data
+        
+        frame = pd.DataFrame(items)
+        if frame.empty:
+            return pd.DataFrame(columns=list(CATALOG_COLUMNS))
+        mapping = self._resolve_columns(frame.columns)
+        return frame[list(mapping)].rename(columns=mapping)
+    
+    def load(self):
+        """
+        Anlık görüntü dosyalarını okur ve dizinler (yalnızca ilk çağrıda).
+        
+        Returns:
+            Kataloğun kendisi
+        """
+        if self._prices is not None:
+            return self
+        
+        with self._lock:
+            if self._prices is not None:
+                return self
+            
+            started = time.perf_counter()
+            frames = []
+            for path in self.files():
+                frame = self._read_file(path)
+                self.rows_read += len(frame)
+                if self.services is not None:
+                    # Kullanılmayan hizmetlerin satırları normalize edilmeden atılır
+                    frame = frame[frame['service'].str.strip().str.lower().isin(self.services).fillna(False)]
+                frames.append(frame)
+            frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=list(CATALOG_COLUMNS))
+            
+            self._build(_normalize(frame))
+            self.seconds = time.perf_counter() - started
+            
+            logger.info(f"Fiyat kataloğu okundu - {len(frames)} dosya, {self.rows_read} satır, "
+                        f"{len(self._prices)} fiyat, {len(self._families)} boyut ailesi, {self.seconds:.2f} sn")
+            return self
+    
+    def _build(self, frame):
+        """
+        Normalize edilmiş satırlardan fiyat, birincil sayaç ve boyut ailesi dizinlerini oluşturur.
+        """
+        codes = {}
+        self._codes = {}
+        for dimension in _KEY_DIMENSIONS:
+            # Kod 0 bilinmeyen/boş değerler için ayrılmıştır
+            values, uniques = pd.factorize(frame[dimension])
+            codes[dimension] = values.astype(np.int64) + 1
+            self._codes[dimension] = {value: code for code, value in enumerate(uniques.tolist(), start=1)}
+        
+        self._shifts = {}
+        shift = 0
+        for dimension in reversed(_KEY_DIMENSIONS):
+            self._shifts[dimension] = shift
+            shift += max(1, (len(self._codes[dimension]) + 1).bit_length())
+        if shift > 62:
+            # Birleşik anahtar 64 bite sığmıyorsa Python tamsayılarıyla hesaplanır
+            codes = {dimension: values.astype(object) for dimension, values in codes.items()}
+        
+        keys = sum(codes[dimension] << self._shifts[dimension] for dimension in _KEY_DIMENSIONS) \
+            if len(frame) else np.zeros(0, dtype=np.int64)
+        primary_keys = keys - (codes['meter'] << self._shifts['meter']) if len(frame) else keys
+        prices = frame['price'].to_numpy(dtype=float)
+        
+        # Aynı anahtarın kademeli fiyatlarından en düşük kademe kullanılır
+        order = np.lexsort((frame['tier_minimum'].to_numpy(dtype=float),))
+        unique_keys, first = np.unique(keys[order], return_index=True)
+        price_index = dict(zip(unique_keys.tolist(), prices[order][first].tolist()))
+        
+        # Birincil sayaç: depolamada sıcak katmanın 'data stored' sayacı, diğer hizmetlerde ilk sayaç
+        order = np.lexsort((frame['tier_minimum'].to_numpy(dtype=float), frame['meter_rank'].to_numpy()))
+        unique_keys, first = np.unique(primary_keys[order], return_index=True)
+        self._primary = dict(zip(unique_keys.tolist(), prices[order][first].tolist()))
+        
+        self._sku_names = dict(zip(frame['sku'].tolist(), frame['sku_name'].tolist()))
+        
+        families = {}
+        rows = frame.iloc[order[first]][['service', 'sku', 'region', 'price_type']]
+        for service, sku, region, price_type in rows.itertuples(index=False, name=None):
+            family = sku_family(sku)
+            if family:
+                families.setdefault((service, region, price_type, family[0]), []).append((family[1], sku))
+        for members in families.values():
+            members.sort()
+        self._families = families
+        # Yükleme tamamlandı işareti olarak en son atanır
+        self._prices = price_index
+    
+    def _key(self, service, sku, region, meter=None, price_type=CONSUMPTION):
+        """
+        Arama değerlerini birleşik anahtara çevirir; katalogda olmayan bileşen varsa None döndürür.
+        """
+        values = {
+            'service': (service or '').lower(),
+            'sku': (sku or '').lower(),
+            'region': region_key(region),
+            'price_type': price_type
+        }
+        if meter is not None:
+            values['meter'] = meter.lower()
+        
+        key = 0
+        for dimension, value in values.items():
+            code = self._codes[dimension].get(value)
+            if code is None:
+                return None
+            key |= code << self._shifts[dimension]
+        return key
+    
+    def price(self, service, sku, region, meter=None, price_type=CONSUMPTION):
+        """
+        Birim fiyatı döndürür.
+        
+        Args:
+            service: Hizmet adı (örn. 'Virtual Machines')
+            sku: ARM SKU adı (örn. 'Standard_D4s_v3')
+            region: Bölge (örn. 'westeurope')
+            meter: Sayaç adı (None ise birincil sayaç)
+            price_type: Fiyat türü (CONSUMPTION, SPOT, RESERVATION_1Y, ...)
+        
+        Returns:
+            Birim fiyat veya katalogda yoksa None
+        """
+        self.load()
+        key = self._key(service, sku, region, meter, price_type)
+        if key is None:
+            return None
+        return (self._prices if meter is not None else self._primary).get(key)
+    
+    def alternatives(self, service, sku, region, price_type=CONSUMPTION):
+        """
+        SKU ile aynı boyut ailesindeki, bölgede fiyatı bulunan SKU'ları döndürür.
+        
+        Args:
+            service: Hizmet adı
+            sku: ARM SKU adı
+            region: Bölge
+            price_type: Fiyat türü
+        
+        Returns:
+            Boyut sırasıyla [(SKU adı, birim fiyat)] listesi (aile yoksa boş)
+        """
+        self.load()
+        service, sku = (service or '').lower(), (sku or '').lower()
+        family = sku_family(sku)
+        if not family:
+            return []
+        
+        members = self._families.get((service, region_key(region), price_type, family[0]), [])
+        return [(self._sku_names.get(member, member), self.price(service, member, region, price_type=price_type))
+                for _, member in members]
+    
+    def smaller(self, service, sku, region, price_type=CONSUMPTION):
+        """
+        Aynı ailede bir alt boyuttaki SKU'yu döndürür (örn. Standard_D4s_v3 -> Standard_D2s_v3).
+        
+        Returns:
+            (SKU adı, birim fiyat) demeti veya alt boyut yoksa None
+        """
+        self.load()
+        service, sku = (service or '').lower(), (sku or '').lower()
+        family = sku_family(sku)
+        if not family:
+            return None
+        
+        members = self._families.get((service, region_key(region), price_type, family[0]))
+        if not members:
+            return None
+        
+        index = bisect_left(members, (family[1], ''))
+        if index == 0:
+            return None
+        member = members[index - 1][1]
+        return self._sku_names.get(member, member), self.price(service, member, region, price_type=price_type)
+
+def _normalize(frame):
+    """
+    Anlık görüntü satırlarını anahtar boyutlarına göre normalize eder.
+    
+    Dönüşümler satırlar yerine her sütunun farklı değerleri üzerinden yapılır.
+    
+    Returns:
+        service, sku, sku_name, region, meter, price_type, meter_rank, price ve
+        tier_minimum sütunlu DataFrame
+    """
+    for column in CATALOG_COLUMNS:
+        if column not in frame:
+            frame[column] = None
+    
+    frame = frame[pd.to_numeric(frame['price'], errors='coerce').notna()]
+    text = {column: _distinct(frame[column], lambda value: value.strip())
+            for column in ('service', 'arm_sku', 'sku', 'region', 'price_type', 'term', 'unit', 'product')}
+    text['meter'] = frame['meter'].to_numpy(dtype=object)
+    
+    # Windows lisans ücreti içeren VM satırları Linux taban fiyatlarıyla karışmasın
+    keep = ~_distinct(text['product'], lambda value: 'windows' in value.lower()).astype(bool)
+    keep &= text['service'] != ''
+    text = {column: values[keep] for column, values in text.items()}
+    frame = frame[keep]
+    
+    service = _distinct(text['service'], str.lower)
+    # Sayaç adları en çok farklı değere sahip sütundur; tüm sayaç dönüşümleri tek geçiştedir
+    meter, variant, meter_rank = _distinct(text['meter'], _meter_parts)
+    
+    # Spot ve düşük öncelikli fiyatlar tüketim satırlarıdır; sayaç adındaki son ek fiyat türünü belirler
+    price_type = _distinct(text['price_type'] + '|' + text['term'], _price_type)
+    price_type = np.where((variant != '') & (price_type == CONSUMPTION), variant, price_type)
+    
+    # Blob depolama satırlarında ARM SKU adı çoğunlukla boştur; 'Hot GRS' -> 'Standard_GRS'
+    blob = (service == 'storage') & _distinct(text['product'], lambda value: 'blob' in value.lower()).astype(bool)
+    sku_name = np.where(text['arm_sku'] != '', text['arm_sku'], text['sku'])
+    sku_name = np.where(blob & (text['arm_sku'] == ''), _distinct(text['sku'], _storage_sku), sku_name)
+    
+    price = frame['price'].to_numpy(dtype=float)
+    # Ayrılmış kapasite fiyatı tüm dönem içindir; tüketim satırıyla aynı birime (saat veya ay) bölünür
+    years = _distinct(price_type, lambda value: {RESERVATION_1Y: 1, RESERVATION_3Y: 3}.get(value, 0)).astype(float)
+    hourly = _distinct(text['unit'], lambda value: 'hour' in value.lower()).astype(bool)
+    reserved = years > 0
+    price = np.where(reserved, price / np.where(hourly, HOURS_PER_YEAR, 12) / np.where(reserved, years, 1), price)
+    
+    return pd.DataFrame({
+        'service': service,
+        'sku': _distinct(sku_name, str.lower),
+        'sku_name': sku_name,
+        'region': _distinct(text['region'], region_key),
+        'meter': meter,
+        'price_type': price_type,
+        'meter_rank': meter_rank.astype(np.int64),
+        'price': price,
+        'tier_minimum': pd.to_numeric(frame['tier_minimum'], errors='coerce').fillna(0.0).to_numpy(dtype=float)
+    })
+
+def _distinct(values, func):
+    """
+    İşlevi yalnızca farklı değerlere uygular ve sonucu satırlara dağıtır.
+    
+    Args:
+        values: Metin dizisi veya Series (eksik değerler '' sayılır)
+        func: Tek bir metin değerini dönüştüren işlev (birden çok sonuç için demet döndürebilir)
+    
+    Returns:
+        numpy dizisi (işlev demet döndürüyorsa her sonuç için bir dizi)
+    """
+    # Nesne dizisi üzerinde factorize tekil değerleri de düz dizi olarak döndürür
+    values = pd.Series(values, dtype=object).fillna('').to_numpy(dtype=object)
+    codes, uniques = pd.factorize(values)
+    results = [func(value if isinstance(value, str) else str(value)) for value in uniques.tolist()]
+    if results and isinstance(results[0], tuple):
+        return tuple(_spread(list(column), codes) for column in zip(*results))
+    return _spread(results, codes)
+
+def _spread(results, codes):
+    """
+    Tekil değer sonuçlarını satırlara dağıtır; metin dışı sonuçlar düz sayı/mantık dizisi olur.
+    """
+    if results and not isinstance(results[0], str):
+        array = np.asarray(results)
+    else:
+        array = np.empty(len(results), dtype=object)
+        array[:] = results
+    return array[codes] if len(codes) else np.zeros(0, dtype=array.dtype)
+
+def _meter_parts(meter):
+    """
+    Sayaç adını (küçük harfli taban ad, fiyat türü son eki, birincil sayaç sırası) demetine ayırır.
+    
+    Spot/düşük öncelik son eki taban addan çıkarılır; sayaç verilmeyen aramalarda sırası
+    küçük olan sayaç (depolamada sıcak katmanın 'data stored' sayacı) birincildir.
+    """
+    meter = meter.strip().lower()
+    variant = ''
+    for suffix, price_type in ((' spot', SPOT), (' low priority', LOW_PRIORITY)):
+        if meter.endswith(suffix):
+            meter, variant = meter[:-len(suffix)], price_type
+            break
+    
+    if meter.endswith('data stored'):
+        rank = 0 if meter.startswith('hot') else 1
+    else:
+        rank = 2
+    return meter, variant, rank
+
+def _price_type(value):
+    """
+    'type|reservationTerm' değerini fiyat türüne çevirir.
+    """
+    kind, _, term = value.lower().partition('|')
+    if kind == 'reservation':
+        years = re.match(r'\d+', term)
+        return f"reservation_{years.group(0)}y" if years else 'reservation'
+    if kind == 'devtestconsumption':
+        return DEVTEST
+    return kind or CONSUMPTION
+
+def _storage_sku(sku_name):
+    """
+    Blob depolama SKU adını ARM biçimine çevirir (örn. 'Hot RA-GRS' -> 'Standard_RAGRS').
+    """
+    words = sku_name.replace('-', '').split()
+    if not words or words[-1].lower() not in STORAGE_REPLICATIONS:
+        return sku_name
+    tier = 'Premium' if any(word.lower() == 'premium' for word in words) else 'Standard'
+    return f"{tier}_{words[-1].upper()}"
@@ -0,0 +1,328 @@
+"""
+Analiz hattında taşınan kaynak, maliyet ve öneri kayıtları.
+Kayıtlar __slots__ kullanır ve tekrarlayan kısa metinleri (tür, bölge, kaynak grubu)
+paylaşır; sözlüğe dönüştürme yalnızca rapor ve arayüz sınırında yapılır.
+"""
+
+import sys
+from functools import lru_cache
+
+def _intern(value):
+    """
+    Metin değerlerini paylaşılan örneğe dönüştürür; diğer değerleri olduğu gibi döndürür.
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+@lru_cache(maxsize=None)
+def _slot_names(cls):
+    """
+    Sınıf hiyerarşisindeki tüm slot adlarını tanım sırasıyla döndürür.
+    """
+    names = []
+    for base in reversed(cls.__mro__):
+        names.extend(base.__dict__.get('__slots__', ()))
+    return tuple(names)
+
+@lru_cache(maxsize=None)
+def _field_names(cls):
+    """
+    Sınıfın dışa açık alan adlarını döndürür: sınıf '_fields' tanımlıyorsa bu sıra,
+    tanımlamıyorsa alt çizgiyle başlamayan slot adları.
+    """
+    fields = getattr(cls, '_fields', None)
+    if fields is None:
+        fields = tuple(name for name in _slot_names(cls) if not name.startswith('_'))
+    return fields
+
+def _present(value):
+    """
+    Eksik değerleri (NaN veya boş metin) None'a çevirir.
+    """
+    return None if value != value or value == '' else value
+
+class Record:
+    """
+    Slot tabanlı kayıtların ortak temel sınıfı.
+    """
+    
+    __slots__ = ()
+    
+    def detail(self, name, default=None):
+        """
+        Bir alanı veya ek ayrıntıyı okur.
+        
+        Args:
+            name: Alan veya ayrıntı adı
+            default: Değer yoksa döndürülecek varsayılan
+        
+        Returns:
+            Alan değeri, ek ayrıntı değeri veya default
+        """
+        if name in _field_names(type(self)) and name != 'details':
+            value = getattr(self, name)
+            return default if value is None else value
+        
+        details = getattr(self, 'details', None)
+        return details.get(name, default) if details else default
+    
+    def copy(self):
+        """
+        Kaydın sığ bir kopyasını döndürür.
+        """
+        clone = object.__new__(type(self))
+        for name in _slot_names(type(self)):
+            value = getattr(self, name)
+            setattr(clone, name, dict(value) if name == 'details' and value else value)
+        return clone
+    
+    def to_dict(self):
+        """
+        Kaydı rapor ve arayüz için sözlüğe dönüştürür; ek ayrıntılar üst düzey anahtar olur.
+        
+        Returns:
+            Alan adına göre değer sözlüğü
+        """
+        result = {}
+        for name in _field_names(type(self)):
+            value = getattr(self, name)
+            if name == 'details':
+                result.update(value or {})
+            else:
+                result[name] = value
+        return result
+    
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{k}={v!r}' for k, v in self.to_dict().items())})"
+
+class Resource(Record):
+    """
+    Analizörlerin bulduğu inaktif kaynak kaydı.
+    """
+    
+    __slots__ = ('id', 'name', 'type', 'resource_group', 'location', 'size', 'state', 'reason', 'cost',
+                 'metrics', 'details')
+    
+    def __init__(self, id, name, type, resource_group, location, size="Unknown", state=None, reason=None,
+                 cost=0.0, metrics=None, details=None):
+        """
+        Kaynak kaydını oluşturur.
+        
+        Args:
+            id: Kaynak ID'si
+            name: Kaynak adı
+            type: Kaynak türü
+            resource_group: Kaynak grubu
+            location: Bölge
+            size: Boyut/SKU bilgisi
+            state: Kaynağın durumu
+            reason: İnaktiflik nedeni
+            cost: Maliyet (CostAnalyzer tarafından doldurulur)
+            metrics: Metrik adına göre istatistikler
+            details: Türe özgü ek ayrıntılar (örn. App Service planı)
+        """
+        self.id = id
+        self.name = name
+        self.type = _intern(type)
+        self.resource_group = _intern(resource_group)
+        self.location = _intern(location)
+        self.size = _intern(size)
+        self.state = _intern(state)
+        self.reason = _intern(reason)
+        self.cost = cost
+        self.metrics = metrics or {}
+        self.details = details
+    
+    def set_detail(self, name, value):
+        """
+        Kayda türe özgü bir ek ayrıntı ekler.
+        
+        Args:
+            name: Ayrıntı adı
+            value: Ayrıntı değeri
+        """
+        if self.details is None:
+            self.details = {}
+        self.details[name] = value
+
+class CostEntry(Record):
+    """
+    Maliyet dizinindeki kaynak başına toplam maliyet kaydı.
+    """
+    
+    __slots__ = ('id', 'name', 'type', 'resource_group', 'location', 'cost', 'currency', 'size')
+    
+    def __init__(self, id, name, type, resource_group, location, cost=0.0, currency='USD', size=None):
+        """
+        Maliyet kaydını oluşturur.
+        
+        Args:
+            id: Kaynak ID'si
+            name: Kaynak adı
+            type: Kaynak türü
+            resource_group: Kaynak grubu
+            location: Bölge
+            cost: Toplam maliyet
+            currency: Para birimi
+            size: Boyut/SKU bilgisi (envanterden doldurulur, isteğe bağlı)
+        """
+        self.id = id
+        self.name = name
+        self.type = _intern(type)
+        self.resource_group = _intern(resource_group)
+        self.location = _intern(location)
+        self.cost = cost
+        self.currency = _intern(currency)
+        self.size = _intern(size)
+
+class Recommendation(Record):
+    """
+    Bir kaynak için üretilen optimizasyon önerisi kaydı.
+    
+    Toplu oluşturulan önerilerde tasarruf ve ayrıntı sözlükleri kuralın paylaşılan
+    sütunlarından ilk erişimde oluşturulur.
+    """
+    
+    __slots__ = ('resource_id', 'resource_name', 'resource_type', 'resource_group', 'issue', 'cost_impact',
+                 'recommendations', '_potential_savings', '_resource_details', 'inactive_days',
+                 'estimated_effort', 'risk_level', 'recommendation_type', '_columns', '_row')
+    
+    _fields = ('resource_id', 'resource_name', 'resource_type', 'resource_group', 'issue', 'cost_impact',
+               'recommendations', 'potential_savings', 'resource_details', 'inactive_days',
+               'estimated_effort', 'risk_level', 'recommendation_type')
+    
+    def __init__(self, resource, issue, cost_impact, recommendations, potential_savings, estimated_effort,
+                 risk_level, recommendation_type, resource_details=None, inactive_days=None):
+        """
+        Öneri kaydını bir kaynak veya maliyet kaydından oluşturur.
+        
+        Args:
+            resource: Önerinin ait olduğu Resource veya CostEntry kaydı
+            issue: Sorun açıklaması
+            cost_impact: Aylık maliyet etkisi
+            recommendations: Öneri metinleri listesi
+            potential_savings: Tahmini tasarruf sözlüğü
+            estimated_effort: Tahmini efor
+            risk_level: Risk seviyesi
+            recommendation_type: Öneri türü
+            resource_details: Karara esas kaynak ayrıntıları (isteğe bağlı)
+            inactive_days: İnaktif gün sayısı (isteğe bağlı)
+        """
+        self.resource_id = resource.id
+        self.resource_name = resource.name
+        self.resource_type = resource.type
+        self.resource_group = resource.resource_group
+        self.issue = issue
+        self.cost_impact = cost_impact
+        self.recommendations = recommendations
+        self._potential_savings = potential_savings
+        self._resource_details = resource_details
+        self.inactive_days = inactive_days
+        self.estimated_effort = _intern(estimated_effort)
+        self.risk_level = _intern(risk_level)
+        self.recommendation_type = _intern(recommendation_type)
+        self._columns = None
+        self._row = None
+    
+    @classmethod
+    def bulk(cls, resources, issues, cost_impacts, recommendations, potential_savings, resource_details,
+             inactive_days, estimated_effort, risk_level, recommendation_type):
+        """
+        Aynı kuraldan gelen öneri kayıtlarını toplu olarak oluşturur.
+        
+        Efor, risk ve öneri türü tüm kayıtlarda aynıdır; bu metinler bir kez paylaşılır.
+        Tasarruf ve ayrıntı sütunları kayıtlar arasında paylaşılır ve sözlükler ilk
+        erişimde oluşturulur. Liste argümanları resources ile aynı sırada ve uzunlukta olmalıdır.
+        
+        Args:
+            resources: Resource veya CostEntry kayıtları
+            issues: Sorun açıklamaları
+            cost_impacts: Aylık maliyet etkileri
+            recommendations: Öneri metinleri listeleri
+            potential_savings: {tasarruf adı: değer listesi}; eksik değerler (NaN) None olur
+            resource_details: {ayrıntı adı: değer listesi} veya None; eksik değerler (NaN, '') None olur
+            inactive_days: İnaktif gün sayıları veya None
+            estimated_effort: Tahmini efor
+            risk_level: Risk seviyesi
+            recommendation_type: Öneri türü
+        
+        Returns:
+            Recommendation listesi
+        """
+        estimated_effort = _intern(estimated_effort)
+        risk_level = _intern(risk_level)
+        recommendation_type = _intern(recommendation_type)
+        columns = (potential_savings, resource_details)
+        days = inactive_days if inactive_days is not None else [None] * len(resources)
+        new = object.__new__
+        
+        results = []
+        for row, (resource, issue, cost_impact, options, row_days) in enumerate(
+                zip(resources, issues, cost_impacts, recommendations, days)):
+            recommendation = new(cls)
+            recommendation.resource_id = resource.id
+            recommendation.resource_name = resource.name
+            recommendation.resource_type = resource.type
+            recommendation.resource_group = resource.resource_group
+            recommendation.issue = issue
+            recommendation.cost_impact = cost_impact
+            recommendation.recommendations = options
+            recommendation._potential_savings = None
+            recommendation._resource_details = None
+            recommendation.inactive_days = row_days
+            recommendation.estimated_effort = estimated_effort
+            recommendation.risk_level = risk_level
+            recommendation.recommendation_type = recommendation_type
+            recommendation._columns = columns
+            recommendation._row = row
+            results.append(recommendation)
+        return results
+    
+    def _materialize(self):
+        """
+        Paylaşılan sütunlardan bu önerinin tasarruf ve ayrıntı sözlüklerini oluşturur.
+        """
+        if self._columns is None:
+            return
+        savings, details = self._columns
+        row = self._row
+        self._potential_savings = {name: _present(values[row]) for name, values in savings.items()}
+        self._resource_details = (
+            {name: _present(values[row]) for name, values in details.items()} if details is not None else None
+        )
+        self._columns = None
+    
+    @property
+    def potential_savings(self):
+        """
+        Tahmini tasarruf sözlüğü.
+        """
+        self._materialize()
+        return self._potential_savings
+    
+    @potential_savings.setter
+    def potential_savings(self, value):
+        self._materialize()
+        self._potential_savings = value
+    
+    @property
+    def resource_details(self):
+        """
+        Karara esas kaynak ayrıntıları (yoksa None).
+        """
+        self._materialize()
+        return self._resource_details
+    
+    @resource_details.setter
+    def resource_details(self, value):
+        self._materialize()
+        self._resource_details = value
+    
+    def to_dict(self):
+        """
+        Öneriyi rapor ve arayüz için sözlüğe dönüştürür; boş isteğe bağlı alanlar atlanır.
+        """
+        result = super().to_dict()
+        for name in ('resource_details', 'inactive_days'):
+            if result[name] is None:
+                del result[name]
+        return result
@@ -16,78 +16,63 @@ class ReportGenerator:
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
     
-    def generate_inactive_resource_report(self, inactive_resources_by_account):
+    def _write_resource_report(self, table, kind, file_name):
+        """
+        Tablodaki bir kayıt türünü hesap ID'siyle birlikte CSV dosyasına yazar.
+        
+        Returns:
+            Dosya yolu veya None (kayıt yoksa)
+        """
+        rows = table.select(kind, columns=['subscription_id', 'name', 'type', 'resource_group', 'cost'])
+        if rows.empty:
+            return None
+        
+        file_path = os.path.join(self.output_dir, file_name)
+        rows.rename(columns={'subscription_id': 'account_id'}).to_csv(file_path, index=False, encoding='utf-8')
+        return file_path
+    
+    def _account_totals(self, table, kind):
+        """
+        Bir kayıt türünün hesap başına sayısını ve toplam maliyetini döndürür.
+        
+        Returns:
+            Tablodaki tüm abonelikleri ekleme sırasıyla içeren 'count' ve 'cost' sütunlu DataFrame
+        """
+        totals = table.totals(by=('subscription_id', 'kind'))
+        if kind in totals.index.get_level_values('kind'):
+            totals = totals.xs(kind, level='kind')
+            totals.index = totals.index.astype(object)
+        else:
+            totals = totals.iloc[0:0].droplevel('kind')
+        return totals.reindex(table.subscriptions, fill_value=0)
+    
+    def generate_inactive_resource_report(self, table):
         """
         İnaktif kaynaklar raporu oluşturur.
         
         Args:
-            inactive_resources_by_account: Hesap bazlı inaktif kaynaklar sözlüğü
-                {account_id: [resources]}
+            table: Analiz sonuçlarını içeren ResourceTable
         """
         logger.info("İnaktif kaynaklar raporu oluşturuluyor...")
         
-        # Tüm hesaplardan kaynakları birleştir
-        all_resources = []
-        for account_id, resources in inactive_resources_by_account.items():
-            for resource in resources:
-                # Kaynak bilgilerine hesap ID'sini ekle
-                resource_copy = resource.copy()
-                resource_copy['account_id'] = account_id
-                all_resources.append(resource_copy)
-        
-        if not all_resources:
+        file_path = self._write_resource_report(table, 'inactive', "inactive_resources.csv")
+        if not file_path:
             logger.info("İnaktif kaynak bulunamadı, rapor oluşturulmadı.")
             return
         
-        file_path = os.path.join(self.output_dir, "inactive_resources.csv")
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['account_id', 'name', 'type', 'resource_group', 'cost'])
-            for r in all_resources:
-                writer.writerow([
-                    r.get('account_id'), 
-                    r.get('name'), 
-                    r.get('type'), 
-                    r.get('resource_group'), 
-                    r.get('cost')
-                ])
-        
         logger.info(f"İnaktif kaynaklar raporu oluşturuldu: {file_path}")
     
-    def generate_high_cost_report(self, high_cost_resources_by_account):
+    def generate_high_cost_report(self, table):
         """
         Yüksek maliyetli kaynaklar raporu oluşturur.
         
         Args:
-            high_cost_resources_by_account: Hesap bazlı yüksek maliyetli kaynaklar sözlüğü
-                {account_id: [resources]}
+            table: Analiz sonuçlarını içeren ResourceTable
         """
         logger.info("Yüksek maliyet raporu oluşturuluyor...")
         
-        # Tüm hesaplardan kaynakları birleştir
-        all_resources = []
-        for account_id, resources in high_cost_resources_by_account.items():
-            for resource in resources:
-                resource_copy = resource.copy()
-                resource_copy['account_id'] = account_id
-                all_resources.append(resource_copy)
-        
-        if not all_resources:
+        if not self._write_resource_report(table, 'high_cost', "high_cost_resources.csv"):
             logger.info("Yüksek maliyetli kaynak bulunamadı, rapor oluşturulmadı.")
-            return
-        
-        file_path = os.path.join(self.output_dir, "high_cost_resources.csv")
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['account_id', 'name', 'type', 'resource_group', 'cost'])
-            for r in all_resources:
-                writer.writerow([
-                    r.get('account_id'),
-                    r.get('name'), 
-                    r.get('type'), 
-                    r.get('resource_group'), 
-                    r.get('cost')
-                ])
     
     def generate_recommendations_report(self, recommendations_by_account):
         """
@@ -99,15 +84,8 @@ class ReportGenerator:
         """
         logger.info("Öneriler raporu oluşturuluyor...")
         
-        # Tüm hesaplardan önerileri birleştir
-        all_recommendations = []
-        for account_id, recommendations in recommendations_by_account.items():
-            for rec in recommendations:
-                rec_copy = rec.copy()
-                rec_copy['account_id'] = account_id
-                all_recommendations.append(rec_copy)
-        
-        if not all_recommendations:
+        # Kayıtlar kopyalanmadan hesap ID'siyle birlikte yazılır
+        if not any(recommendations_by_account.values()):
             logger.info("Optimizasyon önerisi bulunamadı, rapor oluşturulmadı.")
             return
         
@@ -115,24 +93,20 @@ class ReportGenerator:
         with open(file_path, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
             writer.writerow(['account_id', 'resource_name', 'resource_type', 'issue', 'cost_impact'])
-            for r in all_recommendations:
-                writer.writerow([
-                    r.get('account_id'),
-                    r.get('resource_name'), 
-                    r.get('resource_type'), 
-                    r.get('issue'), 
-                    r.get('cost_impact')
-                ])
+            for account_id, recommendations in recommendations_by_account.items():
+                for r in recommendations:
+                    writer.writerow([account_id, r.resource_name, r.resource_type, r.issue, r.cost_impact])
     
-    def generate_charts(self, inactive_resources_by_account):
+    def generate_charts(self, table):
         """
         Analiz sonuçlarından grafikler oluşturur.
         """
         logger.info("Grafikler oluşturuluyor...")
         
         # Hesap başına inaktif kaynak sayısı grafiği
-        account_ids = list(inactive_resources_by_account.keys())
-        resource_counts = [len(resources) for resources in inactive_resources_by_account.values()]
+        counts = self._account_totals(table, 'inactive')['count']
+        account_ids = counts.index.tolist()
+        resource_counts = counts.tolist()
         
         if not resource_counts or sum(resource_counts) == 0:
             logger.info("Grafik oluşturmak için yeterli veri yok.")
@@ -152,74 +126,41 @@ class ReportGenerator:
         
         logger.info(f"Hesap bazlı inaktif kaynaklar grafiği oluşturuldu: {chart_path}")
     
-    def generate_summary_report(self, inactive_resources_by_account, high_cost_resources_by_account, recommendations_by_account, account_configs):
+    def generate_summary_report(self, table, recommendations_by_account, account_configs):
         """
         Özet HTML raporu oluşturur.
         
         Args:
-            inactive_resources_by_account: Hesap bazlı inaktif kaynaklar
-            high_cost_resources_by_account: Hesap bazlı yüksek maliyetli kaynaklar
+            table: Analiz sonuçlarını içeren ResourceTable
             recommendations_by_account: Hesap bazlı öneriler
             account_configs: Hesap yapılandırmaları {account_id: AccountConfig}
         """
         logger.info("Özet rapor oluşturuluyor...")
         
-        # Hesap bazlı istatistikler
-        account_stats = {}
-        
-        total_inactive = 0
-        total_high_cost = 0
-        total_recommendations = 0
-        total_inactive_cost = 0
-        total_high_cost_cost = 0
+        # Hesap bazlı istatistikler tablo üzerinde tek gruplamayla hesaplanır
+        inactive_totals = self._account_totals(table, 'inactive')
+        high_cost_totals = self._account_totals(table, 'high_cost')
         
-        for account_id, resources in inactive_resources_by_account.items():
-            if account_id not in account_stats:
-                account_stats[account_id] = {
-                    'inactive_count': 0,
-                    'high_cost_count': 0,
-                    'recommendations_count': 0,
-                    'inactive_cost': 0,
-                    'high_cost_cost': 0,
-                    'display_name': account_configs.get(account_id, {}).get('display_name', account_id)
-                }
-            
-            account_stats[account_id]['inactive_count'] = len(resources)
-            account_stats[account_id]['inactive_cost'] = sum(r.get('cost', 0) for r in resources)
-            
-            total_inactive += len(resources)
-            total_inactive_cost += account_stats[account_id]['inactive_cost']
+        account_ids = list(table.subscriptions)
+        account_ids.extend(account_id for account_id in recommendations_by_account if account_id not in account_ids)
         
-        for account_id, resources in high_cost_resources_by_account.items():
-            if account_id not in account_stats:
-                account_stats[account_id] = {
-                    'inactive_count': 0,
-                    'high_cost_count': 0,
-                    'recommendations_count': 0,
-                    'inactive_cost': 0,
-                    'high_cost_cost': 0,
-                    'display_name': account_configs.get(account_id, {}).get('display_name', account_id)
-                }
-            
-            account_stats[account_id]['high_cost_count'] = len(resources)
-            account_stats[account_id]['high_cost_cost'] = sum(r.get('cost', 0) for r in resources)
-            
-            total_high_cost += len(resources)
-            total_high_cost_cost += account_stats[account_id]['high_cost_cost']
+        account_stats = {}
+        for account_id in account_ids:
+            in_table = account_id in table.subscriptions
+            account_stats[account_id] = {
+                'inactive_count': int(inactive_totals.at[account_id, 'count']) if in_table else 0,
+                'high_cost_count': int(high_cost_totals.at[account_id, 'count']) if in_table else 0,
+                'recommendations_count': len(recommendations_by_account.get(account_id, [])),
+                'inactive_cost': float(inactive_totals.at[account_id, 'cost']) if in_table else 0,
+                'high_cost_cost': float(high_cost_totals.at[account_id, 'cost']) if in_table else 0,
+                'display_name': account_configs.get(account_id, {}).get('display_name', account_id)
+            }
         
-        for account_id, recommendations in recommendations_by_account.items():
-            if account_id not in account_stats:
-                account_stats[account_id] = {
-                    'inactive_count': 0,
-                    'high_cost_count': 0,
-                    'recommendations_count': 0,
-                    'inactive_cost': 0,
-                    'high_cost_cost': 0,
-                    'display_name': account_configs.get(account_id, {}).get('display_name', account_id)
-                }
-            
-            account_stats[account_id]['recommendations_count'] = len(recommendations)
-            total_recommendations += len(recommendations)
+        total_inactive = int(inactive_totals['count'].sum())
+        total_high_cost = int(high_cost_totals['count'].sum())
+        total_recommendations = sum(len(recs) for recs in recommendations_by_account.values())
+        total_inactive_cost = float(inactive_totals['cost'].sum())
+        total_high_cost_cost = float(high_cost_totals['cost'].sum())
         
         # HTML içeriğini oluştur
         html_content = f"""
@@ -282,26 +223,16 @@ class ReportGenerator:
                 </tr>
         """
         
-        # Tüm hesaplardan en yüksek maliyetli inaktif kaynakları topla
-        all_inactive = []
-        for account_id, resources in inactive_resources_by_account.items():
-            for r in resources:
-                r_copy = r.copy()
-                r_copy['account_id'] = account_id
-                r_copy['account_name'] = account_stats[account_id]['display_name']
-                all_inactive.append(r_copy)
-        
-        # Maliyete göre sırala
-        all_inactive.sort(key=lambda x: x.get('cost', 0), reverse=True)
-        
-        # İlk 10 kaynağı göster
-        for r in all_inactive[:10]:
+        # Tüm hesaplardan en yüksek maliyetli 10 inaktif kaynağı göster
+        top_inactive = table.top(10, kind='inactive')
+        for account_id, name, resource_type, cost in zip(top_inactive['subscription_id'], top_inactive['name'],
+                                                         top_inactive['type'], top_inactive['cost']):
             html_content += f"""
                 <tr>
-                    <td>{r['account_name']}</td>
-                    <td>{r.get('name', 'Bilinmiyor')}</td>
-                    <td>{r.get('type', 'Bilinmiyor')}</td>
-                    <td>${r.get('cost', 0):.2f}</td>
+                    <td>{account_stats[account_id]['display_name']}</td>
+                    <td>{name or 'Bilinmiyor'}</td>
+                    <td>{resource_type or 'Bilinmiyor'}</td>
+                    <td>${cost or 0:.2f}</td>
                 </tr>
             """
         
@@ -320,20 +251,18 @@ class ReportGenerator:
         
         logger.info(f"Özet rapor oluşturuldu: {file_path}")
     
-    def generate_visualization(self, inactive_resources_by_account):
+    def generate_visualization(self, table):
         """
         Çoklu hesap bazlı görselleştirmeler oluşturur.
         """
         logger.info("Görselleştirmeler oluşturuluyor...")
         # Hesap başına inaktif kaynak dağılımı grafiği
         try:
-            if not inactive_resources_by_account:
+            if not table.subscriptions:
                 return
                 
             # Hesap başına maliyet grafiği
-            account_costs = {}
-            for account_id, resources in inactive_resources_by_account.items():
-                account_costs[account_id] = sum(r.get('cost', 0) for r in resources)
+            account_costs = self._account_totals(table, 'inactive')['cost'].to_dict()
             
             plt.figure(figsize=(10, 6))
             plt.bar(account_costs.keys(), account_costs.values())
@@ -0,0 +1,193 @@
+"""
+Azure kaynak ID'lerini bir kez ayrıştırıp önbellekte tutan yapısal kaynak ID'si modülü.
+Kaynak grubu, tür ve ad çıkarma ile maliyet ve metrik birleştirmelerinde kullanılan
+küçük harfli anahtar aynı ayrıştırmadan gelir.
+"""
+
+import sys
+from functools import lru_cache
+
+RESOURCE_ID_CACHE_SIZE = 131072  # Önbellekte tutulacak en fazla ayrıştırılmış ID sayısı
+
+class ResourceId:
+    """
+    Ayrıştırılmış Azure kaynak ID'si.
+    
+    Örnek: /subscriptions/<abonelik>/resourceGroups/<grup>/providers/Microsoft.Sql/servers/<sunucu>/databases/<vt>
+    için provider 'Microsoft.Sql', types ('servers', 'databases'), names ('<sunucu>', '<vt>') olur.
+    Örnekler değişmezdir ve parse() ile önbellekten paylaşılır.
+    """
+    
+    __slots__ = ('id', 'key', 'subscription_id', 'resource_group', 'provider', 'types', 'names')
+    
+    def __init__(self, id, subscription_id=None, resource_group=None, provider=None, types=(), names=()):
+        """
+        Kaynak ID'sini oluşturur; doğrudan değil parse() üzerinden kullanılması önerilir.
+        
+        Args:
+            id: Özgün kaynak ID'si
+            subscription_id: Abonelik ID'si
+            resource_group: Kaynak grubu adı
+            provider: Sağlayıcı ad alanı (örn. Microsoft.Compute)
+            types: Üst kaynaktan alt kaynağa tür adları
+            names: types ile aynı sırada kaynak adları
+        """
+        self.id = id
+        self.key = sys.intern(id.lower())
+        self.subscription_id = subscription_id
+        self.resource_group = resource_group
+        self.provider = sys.intern(provider) if provider else None
+        self.types = tuple(sys.intern(name) for name in types)
+        self.names = tuple(names)
+    
+    @staticmethod
+    def parse(resource_id):
+        """
+        Kaynak ID'sini ayrıştırır; aynı ID için önbellekteki örneği döndürür.
+        
+        Args:
+            resource_id: Azure kaynak ID'si veya ResourceId
+        
+        Returns:
+            ResourceId nesnesi
+        """
+        if isinstance(resource_id, ResourceId):
+            return resource_id
+        return _parse(resource_id)
+    
+    @property
+    def type(self):
+        """
+        Tam kaynak türü (örn. Microsoft.Sql/servers/databases) veya None.
+        """
+        if not self.provider or not self.types:
+            return None
+        return _join_type(self.provider, self.types)
+    
+    @property
+    def type_key(self):
+        """
+        Kural ve envanter eşleştirmelerinde kullanılan küçük harfli kaynak türü ('' tür yoksa).
+        """
+        if not self.provider or not self.types:
+            return ''
+        return _type_key(self.provider, self.types)
+    
+    @property
+    def name(self):
+        """
+        Kaynak adı (ID'nin son ad bölümü).
+        """
+        if self.names:
+            return self.names[-1]
+        return self.id.rstrip('/').split('/')[-1]
+    
+    @property
+    def parent(self):
+        """
+        Alt kaynaklar için üst kaynağın ResourceId'si, üst düzey kaynaklar için None.
+        """
+        if len(self.types) < 2 or len(self.names) != len(self.types):
+            return None
+        
+        # Üst kaynağın ID'si, bu kaynağın '/<tür>/<ad>' son ekinin çıkarılmış halidir
+        suffix = f"/{self.types[-1]}/{self.names[-1]}"
+        return _parse(self.id.rstrip('/')[:-len(suffix)])
+    
+    @property
+    def parents(self):
+        """
+        En yakın üst kaynaktan en üsttekine doğru üst kaynakların ResourceId demeti.
+        """
+        chain = []
+        parent = self.parent
+        while parent is not None:
+            chain.append(parent)
+            parent = parent.parent
+        return tuple(chain)
+    
+    def __eq__(self, other):
+        if isinstance(other, ResourceId):
+            return self.key == other.key
+        if isinstance(other, str):
+            return self.key == other.lower()
+        return NotImplemented
+    
+    def __hash__(self):
+        return hash(self.key)
+    
+    def __str__(self):
+        return self.id
+    
+    def __repr__(self):
+        return f"ResourceId({self.id!r})"
+
+@lru_cache(maxsize=256)
+def _join_type(provider, types):
+    """
+    Sağlayıcı ve tür adlarından tam kaynak türünü oluşturur (paylaşılan metin olarak).
+    """
+    return sys.intern('/'.join((provider,) + types))
+
+@lru_cache(maxsize=256)
+def _type_key(provider, types):
+    """
+    Küçük harfli tam kaynak türünü oluşturur (paylaşılan metin olarak).
+    """
+    return sys.intern(_join_type(provider, types).lower())
+
+@lru_cache(maxsize=RESOURCE_ID_CACHE_SIZE)
+def _parse(resource_id):
+    """
+    Kaynak ID'sini tek geçişte ayrıştırır.
+    """
+    parts = resource_id.strip('/').split('/')
+    subscription_id = resource_group = provider = None
+    types = []
+    names = []
+    
+    i = 0
+    count = len(parts)
+    while i < count:
+        segment = parts[i].lower()
+        if segment == 'subscriptions' and i + 1 < count and subscription_id is None:
+            subscription_id = parts[i + 1]
+            i += 2
+        elif segment == 'resourcegroups' and i + 1 < count and resource_group is None:
+            resource_group = parts[i + 1]
+            i += 2
+        elif segment == 'providers' and i + 1 < count:
+            provider = parts[i + 1]
+            types, names = [], []
+            i += 2
+            # Sağlayıcıdan sonra tür/ad çiftleri gelir; uzantı kaynaklarında
+            # (örn. .../providers/Microsoft.Insights/...) son sağlayıcı geçerlidir
+            while i < count:
+                if parts[i].lower() == 'providers' and i + 1 < count:
+                    provider = parts[i + 1]
+                    types, names = [], []
+                else:
+                    types.append(parts[i])
+                    if i + 1 < count:
+                        names.append(parts[i + 1])
+                i += 2
+            break
+        else:
+            i += 1
+    
+    return ResourceId(resource_id, subscription_id, resource_group, provider, types, names)
+
+def resource_key(resource_id):
+    """
+    Birleştirmelerde kullanılan küçük harfli kaynak anahtarını döndürür.
+    
+    Args:
+        resource_id: Azure kaynak ID'si veya ResourceId
+    
+    Returns:
+        Küçük harfli kaynak ID'si ('' boş ID için)
+    """
+    if isinstance(resource_id, ResourceId):
+        return resource_id.key
+    # Sık çağrılan yol: önbellekteki ayrıştırma doğrudan kullanılır
+    return _parse(resource_id).key if resource_id else ''
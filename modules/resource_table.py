@@ -0,0 +1,251 @@
+"""
+Analiz sonuçlarını tüm hat boyunca paylaşılan sütunlu bir tabloda tutan modül.
+Maliyet zenginleştirme, raporlama ve arayüz aynı tablo üzerinde vektörel çalışır.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+from modules.resource_id import ResourceId
+
+logger = logging.getLogger("ResourceTable")
+
+# Kayıtların metriklerinden okunan sütunlar; ilk bulunan metriğin ortalaması alınır (yoksa NaN)
+METRIC_COLUMNS = {
+    'cpu': ('Percentage CPU', 'node_cpu_usage_percentage'),
+    'memory': ('node_memory_working_set_percentage',),
+    'dtu': ('dtu_consumption_percent',)
+}
+
+# Kayıt ayrıntılarından okunan sütunlar ve varsayılanları
+DETAIL_COLUMNS = {
+    'inactive_days': 0,
+    'plan_app_count': 0,
+    'reserved_instance': False
+}
+
+# Tablo sütunları; 'record' sütunu tabloya eklenen kayıt nesnelerinin kendisini tutar
+COLUMNS = ('subscription_id', 'account', 'kind', 'id', 'name', 'type', 'arm_type', 'resource_group', 'location',
+           'size', 'state', 'reason', 'cost', *METRIC_COLUMNS, *DETAIL_COLUMNS, 'record')
+
+# Az sayıda farklı değer alan sütunlar kategorik tutulur
+CATEGORICAL_COLUMNS = ('subscription_id', 'account', 'kind', 'type', 'arm_type', 'resource_group', 'location',
+                       'size', 'state', 'reason')
+
+class ResourceTable:
+    """
+    İnaktif ve yüksek maliyetli kaynak kayıtlarını abonelik, hesap ve tür
+    bilgisiyle birlikte sütunlu olarak tutan tablo.
+    
+    Kayıtlar kopyalanmaz; tablo aynı Resource/CostEntry nesnelerine başvurur ve
+    maliyet birleştirmesi sonucu bu nesnelere de yazılır.
+    """
+    
+    def __init__(self):
+        """
+        Boş bir tablo oluşturur.
+        """
+        self.subscriptions = []  # Tabloya eklenen abonelikler (kaydı olmayanlar dahil), ekleme sırasıyla
+        self._chunks = []
+        self._frame = None
+    
+    def __len__(self):
+        return len(self.frame)
+    
+    def append(self, records, subscription_id, account=None, kind='inactive'):
+        """
+        Kayıtları tabloya ekler.
+        
+        Metrik ortalamaları ve kural ayrıntıları ekleme sırasında sütunlara okunur;
+        kural motoru kayıt nesnelerini yeniden dolaşmaz.
+        
+        Args:
+            records: Resource veya CostEntry kayıtları listesi
+            subscription_id: Kayıtların abonelik ID'si
+            account: Hesap görünen adı
+            kind: Kayıt türü ('inactive' veya 'high_cost')
+        """
+        if subscription_id not in self.subscriptions:
+            self.subscriptions.append(subscription_id)
+        
+        records = list(records)
+        if not records:
+            return
+        
+        columns = {
+            'subscription_id': subscription_id,
+            'account': account or subscription_id,
+            'kind': kind
+        }
+        for column in ('id', 'name', 'type', 'resource_group', 'location', 'size', 'state', 'reason', 'cost'):
+            columns[column] = [getattr(record, column, None) for record in records]
+        # Analizörler görünen tür adı (örn. "Virtual Machine") yazar; kurallar ID'den gelen ARM türünü kullanır
+        columns['arm_type'] = [ResourceId.parse(record.id).type_key if record.id else '' for record in records]
+        columns.update(_record_features(records))
+        columns['record'] = records
+        
+        self._chunks.append(pd.DataFrame(columns, columns=list(COLUMNS)))
+        self._frame = None
+    
+    @property
+    def frame(self):
+        """
+        Tüm kayıtları içeren DataFrame (kategorik sütunlarla, ilk erişimde birleştirilir).
+        """
+        if self._frame is None:
+            if self._chunks:
+                frame = pd.concat(self._chunks, ignore_index=True) if len(self._chunks) > 1 else self._chunks[0]
+            else:
+                frame = pd.DataFrame(columns=list(COLUMNS))
+            
+            frame['cost'] = pd.to_numeric(frame['cost'], errors='coerce').fillna(0.0).astype('float64')
+            for column in METRIC_COLUMNS:
+                frame[column] = frame[column].astype('float64')
+            for column in CATEGORICAL_COLUMNS:
+                frame[column] = frame[column].astype('category')
+            
+            self._chunks = [frame]
+            self._frame = frame
+        
+        return self._frame
+    
+    @classmethod
+    def concat(cls, tables):
+        """
+        Tabloları verilen sırayla tek tabloda birleştirir.
+        
+        Args:
+            tables: ResourceTable listesi (None öğeler atlanır)
+        
+        Returns:
+            Yeni ResourceTable
+        """
+        table = cls()
+        for part in tables:
+            if part is None:
+                continue
+            for subscription_id in part.subscriptions:
+                if subscription_id not in table.subscriptions:
+                    table.subscriptions.append(subscription_id)
+            if len(part.frame):
+                table._chunks.append(part.frame.astype({column: 'object' for column in CATEGORICAL_COLUMNS}))
+        return table
+    
+    def _mask(self, kind=None, subscription_id=None):
+        """
+        Tür ve abonelik koşullarına uyan satırların maskesini döndürür.
+        """
+        frame = self.frame
+        mask = pd.Series(True, index=frame.index)
+        if kind is not None:
+            mask &= frame['kind'] == kind
+        if subscription_id is not None:
+            mask &= frame['subscription_id'] == subscription_id
+        return mask
+    
+    def select(self, kind=None, subscription_id=None, columns=None):
+        """
+        Koşullara uyan satırları döndürür.
+        
+        Args:
+            kind: Kayıt türü (isteğe bağlı)
+            subscription_id: Abonelik ID'si (isteğe bağlı)
+            columns: Döndürülecek sütunlar (None ise 'record' dışındaki tüm sütunlar)
+        
+        Returns:
+            DataFrame
+        """
+        columns = list(columns or [column for column in COLUMNS if column != 'record'])
+        return self.frame.loc[self._mask(kind, subscription_id), columns]
+    
+    def records(self, kind=None, subscription_id=None):
+        """
+        Koşullara uyan kayıt nesnelerini ekleme sırasıyla döndürür (kopyalanmaz).
+        
+        Returns:
+            Resource veya CostEntry listesi
+        """
+        return self.frame.loc[self._mask(kind, subscription_id), 'record'].tolist()
+    
+    def join_costs(self, costs, kind=None, subscription_id=None):
+        """
+        Küçük harfli kaynak ID'sine göre maliyetleri vektörel olarak birleştirir.
+        
+        Maliyeti bulunmayan kaynaklar 0 olur. Sonuç kayıt nesnelerine de yazılır.
+        
+        Args:
+            costs: {küçük harfli kaynak ID'si: maliyet} eşlemesi veya Series
+            kind: Yalnızca bu türdeki satırlar (isteğe bağlı)
+            subscription_id: Yalnızca bu aboneliğin satırları (isteğe bağlı)
+        
+        Returns:
+            Maliyeti güncellenen satır sayısı
+        """
+        frame = self.frame
+        mask = self._mask(kind, subscription_id)
+        if not mask.any():
+            return 0
+        
+        values = frame.loc[mask, 'id'].str.lower().map(costs).fillna(0.0).astype('float64')
+        frame.loc[mask, 'cost'] = values
+        
+        for record, cost in zip(frame.loc[mask, 'record'], values.tolist()):
+            record.cost = cost
+        
+        return int(mask.sum())
+    
+    def totals(self, by=('subscription_id', 'kind')):
+        """
+        Kayıt sayısı ve toplam maliyeti gruplara göre hesaplar.
+        
+        Args:
+            by: Gruplama sütunları
+        
+        Returns:
+            'count' ve 'cost' sütunlu DataFrame (indeks: gruplama sütunları)
+        """
+        return self.frame.groupby(list(by), observed=True).agg(count=('cost', 'size'), cost=('cost', 'sum'))
+    
+    def top(self, n=10, kind=None, by='cost'):
+        """
+        En yüksek değerli n satırı döndürür.
+        
+        Args:
+            n: Satır sayısı
+            kind: Kayıt türü (isteğe bağlı)
+            by: Sıralama sütunu
+        
+        Returns:
+            DataFrame
+        """
+        return self.select(kind).nlargest(n, by)
+
+def _record_features(records):
+    """
+    Kayıtların metrik ortalamalarını ve ayrıntı değerlerini tek geçişte sütunlara okur.
+    
+    Args:
+        records: Resource veya CostEntry kayıtları listesi
+    
+    Returns:
+        Sütun adına göre değer dizileri sözlüğü
+    """
+    count = len(records)
+    columns = {name: np.full(count, np.nan) for name in METRIC_COLUMNS}
+    columns.update({name: [default] * count for name, default in DETAIL_COLUMNS.items()})
+    
+    for index, record in enumerate(records):
+        metrics = getattr(record, 'metrics', None)
+        if metrics:
+            for name, metric_names in METRIC_COLUMNS.items():
+                for metric_name in metric_names:
+                    stats = metrics.get(metric_name)
+                    if stats and stats.get('mean') is not None:
+                        columns[name][index] = stats['mean']
+                        break
+        
+        if getattr(record, 'details', None):
+            for name, default in DETAIL_COLUMNS.items():
+                columns[name][index] = record.detail(name, default)
+    
+    return columns
@@ -0,0 +1,767 @@
+"""
+Kaynak türüne göre optimizasyon öneri kuralları ve kuralları sütunlu kaynak tablosu
+üzerinde toplu değerlendiren kural motoru.
+"""
+
+import logging
+import string
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+from modules.records import Recommendation
+from modules.resource_table import METRIC_COLUMNS, DETAIL_COLUMNS
+from modules.price_catalog import region_key, SPOT, RESERVATION_1Y, RESERVATION_3Y
+from modules.inventory import (VIRTUAL_MACHINES, STORAGE_ACCOUNTS, WEB_APPS, SQL_DATABASES, COSMOS_ACCOUNTS,
+                               AKS_CLUSTERS)
+
+logger = logging.getLogger("RuleEngine")
+
+APP_SERVICE_PLANS = 'microsoft.web/serverfarms'
+
+# Fiyat kataloğundan fiyatı okunan kaynak türleri ve Retail Prices hizmet adları
+PRICED_SERVICES = {
+    VIRTUAL_MACHINES: 'Virtual Machines',
+    STORAGE_ACCOUNTS: 'Storage',
+    SQL_DATABASES: 'SQL Database'
+}
+
+# Katalogdan gelen birim fiyat özellikleri (fiyat bilinmiyorsa NaN)
+PRICE_FEATURES = ('price', 'resize_price', 'reserved_price', 'reserved_3y_price', 'spot_price', 'lrs_price',
+                  'standard_price')
+
+_FORMATTER = string.Formatter()
+
+class Rule:
+    """
+    Bir kaynak türü ve kayıt türü için bildirimsel öneri kuralı.
+    
+    Koşullar ve tasarruf formülleri özellik tablosunu (DataFrame) alıp satır başına
+    dizi döndüren işlevlerdir; böylece bir kural tüm eşleşen kaynaklara tek seferde uygulanır.
+    """
+    
+    def __init__(self, resource_type, kind, recommendation_type, issue, options, savings, when=None,
+                 details=(), estimated_effort='Orta', risk_level='Düşük', inactive_days=False):
+        """
+        Kuralı oluşturur.
+        
+        Args:
+            resource_type: Küçük harfli ARM kaynak türü (None ise tüm türler için genel kural)
+            kind: Kayıt türü ('inactive' veya 'high_cost')
+            recommendation_type: Öneri türü
+            issue: Sorun metni şablonu (özellik adları {ad} biçiminde kullanılabilir)
+            options: (öneri metni, koşul) çiftleri listesi; koşul None ise her zaman eklenir
+            savings: {tasarruf adı: formül} sözlüğü
+            when: Kuralın uygulanma koşulu (None ise türdeki tüm kaynaklar)
+            details: Öneriye eklenecek kaynak ayrıntısı özellik adları
+            estimated_effort: Tahmini efor
+            risk_level: Risk seviyesi
+            inactive_days: True ise öneriye inaktif gün sayısı eklenir
+        """
+        self.resource_type = resource_type
+        self.kind = kind
+        self.recommendation_type = recommendation_type
+        self.issue = issue
+        self.options = list(options)
+        self.savings = dict(savings)
+        self.when = when
+        self.details = tuple(details)
+        self.estimated_effort = estimated_effort
+        self.risk_level = risk_level
+        self.inactive_days = inactive_days
+    
+    def matches(self, features):
+        """
+        Kuralın uygulandığı satırların maskesini döndürür.
+        """
+        if self.when is None:
+            return np.ones(len(features), dtype=bool)
+        return np.asarray(self.when(features), dtype=bool)
+    
+    def build(self, features, records):
+        """
+        Eşleşen satırlar için öneri kayıtlarını toplu olarak oluşturur.
+        
+        Args:
+            features: Eşleşen satırların özellik tablosu
+            records: Aynı sırada Resource veya CostEntry kayıtları
+        
+        Returns:
+            Recommendation listesi (records ile aynı sırada)
+        """
+        count = len(records)
+        cost = features['cost'].to_numpy(dtype=float)
+        issues = _render(self.issue, features)
+        options = self._render_options(features)
+        
+        # Tasarruf ve ayrıntı sözlükleri öneri başına ilk erişimde bu sütunlardan oluşturulur
+        savings = {
+            name: np.broadcast_to(np.asarray(formula(features), dtype=float), (count,)).tolist()
+            for name, formula in self.savings.items()
+        }
+        details = {name: features[name].tolist() for name in self.details} if self.details else None
+        
+        inactive_days = features['inactive_days'].tolist() if self.inactive_days else None
+        
+        return Recommendation.bulk(records, issues, cost.tolist(), options, savings, details, inactive_days,
+                                   self.estimated_effort, self.risk_level, self.recommendation_type)
+    
+    def _render_options(self, features):
+        """
+        Satır başına öneri metni listelerini oluşturur.
+        
+        Koşul birleşimi ve şablon metinleri aynı olan satırlar aynı listeyi paylaşır; her liste
+        bir kez oluşturulur.
+        """
+        count = len(features)
+        # Koşul birleşimini bir tamsayı koduna çevir
+        codes = np.zeros(count, dtype=np.int64)
+        for bit, (_, when) in enumerate(self.options):
+            mask = np.ones(count, dtype=bool) if when is None else np.asarray(when(features), dtype=bool)
+            codes |= mask.astype(np.int64) << bit
+        
+        keys, sizes, texts = [codes], [1 << len(self.options)], {}
+        for bit, (text, _) in enumerate(self.options):
+            if _fields(text):
+                texts[bit], inverse = _render_codes(text, features)
+                keys.append(inverse)
+                sizes.append(len(texts[bit]))
+        
+        combinations, inverse = _combine(keys, sizes)
+        lists = []
+        for row in combinations.tolist():
+            code, indices = row[0], dict(zip(texts, row[1:]))
+            lists.append([texts[bit][indices[bit]] if bit in texts else text
+                          for bit, (text, _) in enumerate(self.options) if code >> bit & 1])
+        return [lists[index] for index in inverse.tolist()]
+
+class RuleRegistry:
+    """
+    Kuralları (kayıt türü, ARM kaynak türü) anahtarıyla tutan kayıt defteri.
+    """
+    
+    def __init__(self):
+        """
+        Boş bir kayıt defteri oluşturur.
+        """
+        self._rules = defaultdict(list)  # {(kind, resource_type): [Rule]}
+    
+    def register(self, rule):
+        """
+        Kuralı kayıt defterine ekler; aynı türün kuralları ekleme sırasıyla denenir.
+        
+        Args:
+            rule: Rule nesnesi
+        
+        Returns:
+            Eklenen kural
+        """
+        self._rules[(rule.kind, rule.resource_type)].append(rule)
+        return rule
+    
+    def rules_for(self, kind, resource_type):
+        """
+        Bir türün kurallarını döndürür; türe özgü kurallardan sonra genel kurallar gelir.
+        
+        Args:
+            kind: Kayıt türü
+            resource_type: Küçük harfli ARM kaynak türü
+        
+        Returns:
+            Rule listesi
+        """
+        specific = self._rules.get((kind, resource_type), []) if resource_type else []
+        return specific + self._rules.get((kind, None), [])
+    
+    def resource_types(self, kind):
+        """
+        Kural tanımlı kaynak türlerini döndürür.
+        """
+        return sorted(resource_type for rule_kind, resource_type in self._rules
+                      if rule_kind == kind and resource_type)
+
+class RuleEngine:
+    """
+    Kaynak tablosundaki kayıtları kurallara göre tür grupları halinde toplu değerlendiren motor.
+    """
+    
+    def __init__(self, registry=None, catalog=None):
+        """
+        Motoru başlatır.
+        
+        Args:
+            registry: RuleRegistry (None ise varsayılan kurallar)
+            catalog: Tasarrufların birim fiyatlardan hesaplanacağı PriceCatalog (None ise sabit oranlar)
+        """
+        self.registry = registry or default_registry()
+        self.catalog = catalog
+    
+    def evaluate(self, table, kind, subscription_id=None):
+        """
+        Tablodaki bir kayıt türü için önerileri üretir.
+        
+        Her kaynağa, türünün koşulu sağlanan ilk kuralı uygulanır; türe özgü kural
+        eşleşmezse genel kural kullanılır.
+        
+        Args:
+            table: ResourceTable
+            kind: Kayıt türü ('inactive' veya 'high_cost')
+            subscription_id: Yalnızca bu aboneliğin kayıtları (isteğe bağlı)
+        
+        Returns:
+            Tablo sırasıyla Recommendation listesi
+        """
+        frame = table.select(kind, subscription_id,
+                             columns=['arm_type', 'name', 'location', 'size', 'state', 'reason', 'cost',
+                                      *METRIC_COLUMNS, *DETAIL_COLUMNS, 'record'])
+        if frame.empty:
+            return []
+        
+        features = build_features(frame, self.catalog)
+        records = frame['record'].to_numpy(dtype=object)
+        results = [None] * len(frame)
+        
+        for resource_type, positions in features.groupby('arm_type', observed=True, sort=False).indices.items():
+            pending = np.asarray(positions)
+            for rule in self.registry.rules_for(kind, resource_type):
+                if not len(pending):
+                    break
+                group = features.iloc[pending]
+                mask = rule.matches(group)
+                if not mask.any():
+                    continue
+                
+                matched = pending[mask]
+                for position, recommendation in zip(matched.tolist(),
+                                                    rule.build(group[mask], records[matched].tolist())):
+                    results[position] = recommendation
+                pending = pending[~mask]
+        
+        return [recommendation for recommendation in results if recommendation is not None]
+
+def build_features(frame, catalog=None):
+    """
+    Kurallarda kullanılan özellik tablosunu oluşturur.
+    
+    Metin özellikleri kategorik tutulur ve türetilmiş değerler (küçük harf, SKU parçaları)
+    satırlar yerine farklı değerler üzerinden hesaplanır. Metrik ve ayrıntı özellikleri
+    tablonun ekleme sırasında doldurulan sütunlarından alınır.
+    
+    Args:
+        frame: Metrik ve ayrıntı sütunlarını içeren kaynak tablosu seçimi
+        catalog: Birim fiyat özellikleri için PriceCatalog (isteğe bağlı)
+    
+    Returns:
+        Özellik adına göre sütunları olan DataFrame (frame ile aynı sırada, 0'dan indeksli)
+    """
+    features = pd.DataFrame({
+        column: _text_column(frame[column]).array
+        for column in ('arm_type', 'name', 'location', 'size', 'state', 'reason')
+    })
+    features['cost'] = frame['cost'].to_numpy(dtype=float)
+    features['size_key'] = _derive(features['size'], str.lower)
+    features['state_key'] = _derive(features['state'], str.lower)
+    
+    # Depolama SKU'su 'Standard_GRS' biçimindedir: katman ve replikasyon
+    features['tier'] = _derive(features['size'], lambda size: size.partition('_')[0])
+    features['replication'] = _derive(features['size'], lambda size: size.partition('_')[2])
+    
+    # AKS kayıtlarında boyut "<n> node" biçimindedir
+    features['node_count'] = _derive(features['size'], _node_count, categorical=False)
+    
+    for column in (*METRIC_COLUMNS, *DETAIL_COLUMNS):
+        features[column] = frame[column].to_numpy()
+    
+    _add_price_features(features, catalog)
+    return features
+
+def _add_price_features(features, catalog):
+    """
+    Kaynağın ve alternatiflerinin birim fiyatlarını özellik olarak ekler.
+    
+    Fiyatlar her farklı (tür, boyut, bölge) birleşimi için katalogdan bir kez okunur;
+    katalog yoksa veya fiyat bulunamazsa değerler NaN, alt boyut SKU'su '' olur.
+    """
+    region = _derive(features['location'], region_key)
+    combinations, inverse = _unique_codes([features['arm_type'].array, features['size'].array, region])
+    
+    values = {name: np.full(len(combinations), np.nan) for name in PRICE_FEATURES}
+    resize_sku = np.full(len(combinations), '', dtype=object)
+    
+    if catalog is not None:
+        types = features['arm_type'].cat.categories
+        sizes = features['size'].cat.categories
+        regions = region.categories
+        for index, (type_code, size_code, region_code) in enumerate(combinations.tolist()):
+            service = PRICED_SERVICES.get(types[type_code])
+            if not service or not sizes[size_code] or not regions[region_code]:
+                continue
+            
+            prices = _catalog_prices(catalog, service, sizes[size_code], regions[region_code])
+            resize_sku[index] = prices.pop('resize_sku', None) or ''
+            for name, value in prices.items():
+                if value is not None:
+                    values[name][index] = value
+    
+    for name, column in values.items():
+        features[name] = column[inverse]
+    features['resize_sku'] = pd.Categorical(resize_sku[inverse])
+
+def _catalog_prices(catalog, service, size, region):
+    """
+    Bir SKU'nun ve türüne göre alternatiflerinin birim fiyatlarını katalogdan okur.
+    
+    Returns:
+        Özellik adına göre fiyat sözlüğü (bulunamayanlar None) ve 'resize_sku'
+    """
+    prices = {'price': catalog.price(service, size, region)}
+    
+    if service == PRICED_SERVICES[STORAGE_ACCOUNTS]:
+        # Depolama SKU'su 'Standard_GRS' biçimindedir: aynı katmanda LRS ve Standard katmanında aynı replikasyon
+        tier, _, replication = size.partition('_')
+        prices['lrs_price'] = catalog.price(service, f"{tier}_LRS", region)
+        prices['standard_price'] = catalog.price(service, f"Standard_{replication}", region)
+        return prices
+    
+    smaller = catalog.smaller(service, size, region)
+    if smaller:
+        prices['resize_sku'], prices['resize_price'] = smaller
+    prices['reserved_price'] = catalog.price(service, size, region, price_type=RESERVATION_1Y)
+    
+    if service == PRICED_SERVICES[VIRTUAL_MACHINES]:
+        prices['reserved_3y_price'] = catalog.price(service, size, region, price_type=RESERVATION_3Y)
+        prices['spot_price'] = catalog.price(service, size, region, price_type=SPOT)
+    return prices
+
+def _text_column(series):
+    """
+    Metin sütununu eksik değerleri '' olan kategorik sütuna dönüştürür.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype('category')
+    if series.isna().any():
+        if '' not in series.cat.categories:
+            series = series.cat.add_categories([''])
+        series = series.fillna('')
+    return series
+
+def _derive(series, func, categorical=True):
+    """
+    Kategorik bir sütundan türetilmiş sütun oluşturur; işlev yalnızca farklı değerlere uygulanır.
+    
+    Args:
+        series: Kategorik sütun
+        func: Tek bir değeri dönüştüren işlev
+        categorical: True ise kategorik, False ise düz dizi döndürülür
+    """
+    values = [func(str(category)) for category in series.cat.categories]
+    codes = series.cat.codes.to_numpy()
+    if not categorical:
+        return np.asarray(values)[codes] if values else np.zeros(len(series), dtype=int)
+    
+    inverse, uniques = pd.factorize(pd.Series(values, dtype=object))
+    return pd.Categorical.from_codes(np.asarray(inverse)[codes] if len(values) else codes,
+                                     categories=pd.Index(uniques, dtype=object))
+
+def _node_count(size):
+    count, _, unit = size.partition(' ')
+    return int(count) if unit == 'node' and count.isdigit() else 0
+
+def _fields(template):
+    """
+    Şablondaki alan adlarını döndürür.
+    """
+    return [field for _, field, _, _ in _FORMATTER.parse(template) if field]
+
+def _render(template, features):
+    """
+    Şablonu satır başına özellik değerleriyle doldurur.
+    """
+    rendered, inverse = _render_codes(template, features)
+    return rendered[inverse].tolist()
+
+def _render_codes(template, features):
+    """
+    Şablonu her farklı alan değeri birleşimi için bir kez doldurur.
+    
+    Kategorik alanlarda kategori kodları, diğer alanlarda pd.factorize kodları kullanılır.
+    
+    Returns:
+        (oluşturulan metinler dizisi, satır başına metin indeksi) demeti
+    """
+    fields = list(dict.fromkeys(_fields(template)))
+    if not fields:
+        return np.array([template], dtype=object), np.zeros(len(features), dtype=np.int64)
+    
+    codes, values = [], []
+    for field in fields:
+        column = features[field]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes.append(column.cat.codes.to_numpy())
+            values.append(column.cat.categories)
+        else:
+            field_codes, uniques = pd.factorize(column, use_na_sentinel=False)
+            codes.append(field_codes)
+            values.append(uniques)
+    
+    combinations, inverse = _combine(codes, [len(field_values) for field_values in values])
+    rendered = np.array([
+        template.format(**{field: values[i][code] for i, (field, code) in enumerate(zip(fields, row))})
+        for row in combinations.tolist()
+    ], dtype=object)
+    return rendered, inverse
+
+def _unique_codes(columns):
+    """
+    Kategorik sütunların farklı kod birleşimlerini ve satır başına birleşim indeksini döndürür.
+    
+    Args:
+        columns: pd.Categorical listesi
+    
+    Returns:
+        (birleşim başına kod satırları dizisi, satır başına birleşim indeksi) demeti
+    """
+    return _combine([column.codes for column in columns], [len(column.categories) for column in columns])
+
+def _combine(codes, sizes):
+    """
+    Tamsayı kod dizilerinin farklı birleşimlerini ve satır başına birleşim indeksini döndürür.
+    
+    Kodlar tek bir tamsayıda birleştirilerek tek boyutlu olarak tekilleştirilir
+    (np.unique(axis=0) satır sıralamasından çok daha hızlıdır).
+    
+    Args:
+        codes: Aynı uzunlukta kod dizileri listesi (eksik değer kodu -1 olabilir)
+        sizes: Her dizinin farklı kod sayısı
+    
+    Returns:
+        (birleşim başına kod satırları dizisi, satır başına birleşim indeksi) demeti
+    """
+    sizes = [size + 1 for size in sizes]  # Eksik değer kodu -1 için +1
+    combined = np.zeros(len(codes[0]), dtype=np.int64)
+    for column, size in zip(codes, sizes):
+        combined = combined * size + (np.asarray(column, dtype=np.int64) + 1)
+    
+    uniques, inverse = np.unique(combined, return_inverse=True)
+    rows = []
+    for size in reversed(sizes):
+        uniques, remainder = np.divmod(uniques, size)
+        rows.append(remainder - 1)
+    return np.stack(rows[::-1], axis=1), np.asarray(inverse).reshape(-1)
+
+def _cost(factor, when=None):
+    """
+    Maliyetin bir oranı olarak tasarruf formülü oluşturur; koşul verilirse yalnızca koşulu
+    sağlayan satırlar için hesaplanır.
+    """
+    if when is None:
+        return lambda f: f['cost'].to_numpy() * factor
+    return lambda f: np.where(np.asarray(when(f), dtype=bool), f['cost'].to_numpy() * factor, 0.0)
+
+def _price_delta(alternative, factor=None, when=None, scale=1.0):
+    """
+    Alternatif birim fiyata geçişin tasarruf formülünü oluşturur: maliyet * (1 - alternatif / mevcut fiyat).
+    
+    Aynı kullanımda maliyet birim fiyatla orantılı olduğundan fark kaynağın gerçek maliyetine
+    uygulanır. Fiyatlardan biri katalogda yoksa maliyetin sabit oranı (factor; None ise bilinmiyor)
+    kullanılır. scale sonucu çarpar (örn. yıllık tasarruf için 12).
+    """
+    def formula(f):
+        cost = f['cost'].to_numpy()
+        price = f['price'].to_numpy()
+        alternative_price = f[alternative].to_numpy()
+        # NaN karşılaştırmaları False döndürür; iki fiyat da bilinmelidir
+        known = (price > 0) & (alternative_price >= 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            exact = cost * np.clip(1.0 - alternative_price / price, 0.0, 1.0)
+        savings = np.where(known, exact, np.nan if factor is None else cost * factor) * scale
+        if when is not None:
+            savings = np.where(np.asarray(when(f), dtype=bool), savings, 0.0)
+        return savings
+    return formula
+
+def _unknown(feature):
+    return lambda f: f[feature].isna().to_numpy()
+
+def _resize_known(f):
+    return (f['resize_sku'] != '').to_numpy()
+
+def _size_prefix(*prefixes):
+    return lambda f: f['size_key'].str.startswith(prefixes).to_numpy()
+
+def _replication_geo(f):
+    return f['replication'].str.lower().isin(['grs', 'ra-grs', 'ragrs', 'gzrs', 'ragzrs']).to_numpy()
+
+def _premium(f):
+    return (f['tier'].str.lower() == 'premium').to_numpy()
+
+def _below(feature, threshold):
+    # Metriği olmayan (NaN) satırlar koşulu sağlamaz
+    return lambda f: (f[feature] < threshold).to_numpy()
+
+def default_registry():
+    """
+    Altı hizmet türü ve genel kaynaklar için varsayılan kuralları içeren kayıt defterini oluşturur.
+    
+    Returns:
+        RuleRegistry
+    """
+    registry = RuleRegistry()
+    add = registry.register
+    
+    # --- İnaktif kaynaklar ---
+    add(Rule(
+        VIRTUAL_MACHINES, 'inactive', 'İnaktif VM',
+        issue="Bu sanal makine deallocate durumda; yalnızca disk ve IP maliyeti oluşuyor.",
+        when=lambda f: (f['state_key'] == 'deallocated').to_numpy(),
+        options=[
+            ("Artık gerekmiyorsa VM'i ve disklerini silin", None),
+            ("Diskin anlık görüntüsünü alıp yönetilen diski silmeyi değerlendirin", None),
+            ("Disk türünü Premium'dan Standard'a düşürün", None)
+        ],
+        savings={'monthly': _cost(1.0), 'yearly': _cost(12.0)},
+        details=('size',), estimated_effort='Düşük', risk_level='Orta', inactive_days=True
+    ))
+    add(Rule(
+        VIRTUAL_MACHINES, 'inactive', 'İnaktif VM',
+        issue="Bu sanal makine inaktif durumdadır: {reason}.",
+        options=[
+            ("VM'i tamamen silin (3 aydan uzun süredir inaktif)", lambda f: (f['inactive_days'] > 90).to_numpy()),
+            ("VM'i deallocate edin (yalnızca depolama maliyeti ödersiniz)",
+             lambda f: (f['inactive_days'] <= 90).to_numpy()),
+            ("Reserved Instance satın aldıysanız, başka bir VM'e taşıyın",
+             lambda f: f['reserved_instance'].astype(bool).to_numpy()),
+            ("Daha düşük maliyetli B serisi VM'lere geçiş yapın", _size_prefix('standard_d', 'standard_e', 'standard_f')),
+            ("Start/Stop çizelgesi tanımlayarak çalışma saatlerini optimize edin", None),
+            ("Disk türünü Premium'dan Standard'a düşürmeyi değerlendirin", None)
+        ],
+        savings={
+            'monthly': _cost(1.0),
+            'yearly': _cost(12.0),
+            'deallocate_savings': _cost(0.9)  # VM deallocate edilirse yaklaşık %90 tasarruf
+        },
+        details=('size', 'cpu'), estimated_effort='Orta', risk_level='Düşük', inactive_days=True
+    ))
+    add(Rule(
+        STORAGE_ACCOUNTS, 'inactive', 'İnaktif Storage',
+        issue="Bu depolama hesabı aktif olarak kullanılmıyor ({reason}).",
+        options=[
+            ("Boş veya çok az kullanılan konteynerler/blobları temizleyin", None),
+            ("Standard depolama katmanına geçiş yapın (%60'a kadar tasarruf)", _premium),
+            ("Daha düşük yedekleme seviyesine geçin (GRS -> LRS, %50'ye kadar tasarruf)", _replication_geo),
+            ("Erişim katmanını Hot'tan Cool/Archive'a değiştirerek maliyeti azaltın", None)
+        ],
+        savings={
+            'monthly': _cost(1.0),
+            'yearly': _cost(12.0),
+            'tier_change_savings': _price_delta('standard_price', 0.6, when=_premium)
+        },
+        details=('tier', 'replication', 'price'), estimated_effort='Orta', risk_level='Düşük'
+    ))
+    add(Rule(
+        WEB_APPS, 'inactive', 'İnaktif App Service',
+        issue="Bu App Service uygulaması düşük trafiğe sahip ve planındaki tek uygulama ({size} planı).",
+        when=lambda f: (f['plan_app_count'] <= 1).to_numpy(),
+        options=[
+            ("Uygulamayı ve App Service planını silin", None),
+            ("Uygulama gerekliyse Free/Shared katmana veya paylaşılan bir plana taşıyın", None),
+            ("Plan üzerinde otomatik ölçeklendirme ile örnek sayısını en aza indirin", None)
+        ],
+        savings={'monthly': _cost(1.0), 'yearly': _cost(12.0)},
+        details=('size', 'plan_app_count'), estimated_effort='Düşük', risk_level='Düşük'
+    ))
+    add(Rule(
+        WEB_APPS, 'inactive', 'İnaktif App Service',
+        issue="Bu App Service uygulaması düşük trafiğe sahip; planı {plan_app_count} uygulama tarafından paylaşılıyor.",
+        options=[
+            ("Uygulamayı durdurun veya silin", None),
+            ("Planın boyutunu kalan uygulamaların yüküne göre küçültün", None)
+        ],
+        savings={'monthly': _cost(1.0), 'yearly': _cost(12.0)},
+        details=('size', 'plan_app_count'), estimated_effort='Düşük', risk_level='Düşük'
+    ))
+    add(Rule(
+        SQL_DATABASES, 'inactive', 'İnaktif SQL Veritabanı',
+        issue="Bu SQL veritabanı inaktif durumdadır: {reason} ({size}).",
+        options=[
+            ("Veritabanını BACPAC olarak dışa aktarıp silin", None),
+            ("Otomatik duraklatmalı serverless katmana geçin", None),
+            ("Basic veya S0 katmanına düşürün", lambda f: ~f['size_key'].isin(['basic', 's0', 'free']).to_numpy()),
+            ("Düşük kullanımlı veritabanlarını elastik havuzda birleştirin", None)
+        ],
+        savings={
+            'monthly': _cost(1.0),
+            'yearly': _cost(12.0),
+            'serverless_savings': _cost(0.7)  # Otomatik duraklatma ile işlem maliyetinin çoğu kalkar
+        },
+        details=('size', 'dtu'), estimated_effort='Orta', risk_level='Orta'
+    ))
+    add(Rule(
+        COSMOS_ACCOUNTS, 'inactive', 'İnaktif CosmosDB',
+        issue="Bu CosmosDB hesabı inaktif durumdadır: {reason}.",
+        options=[
+            ("Gerekmiyorsa hesabı yedekleyip silin", None),
+            ("Düşük ve aralıklı trafik için serverless kapasite moduna geçin", None),
+            ("Sağlanan RU/s değerini en aza veya otomatik ölçeklendirmeye indirin", None)
+        ],
+        savings={
+            'monthly': _cost(1.0),
+            'yearly': _cost(12.0),
+            'serverless_savings': _cost(0.8)
+        },
+        details=('size',), estimated_effort='Orta', risk_level='Orta'
+    ))
+    add(Rule(
+        AKS_CLUSTERS, 'inactive', 'İnaktif AKS',
+        issue="Bu AKS kümesi inaktif durumdadır: {reason} ({size}).",
+        options=[
+            ("Kümeyi durdurun (az aks stop); durdurulan kümede node maliyeti oluşmaz", None),
+            ("Kullanıcı node havuzlarını sıfıra ölçeklendirin", lambda f: (f['node_count'] > 1).to_numpy()),
+            ("Gerekmiyorsa kümeyi silin", None)
+        ],
+        savings={
+            'monthly': _cost(1.0),
+            'yearly': _cost(12.0),
+            'stop_savings': _cost(0.9)  # Durdurulan kümede yalnızca disk ve IP maliyeti kalır
+        },
+        details=('size', 'node_count', 'cpu', 'memory'), estimated_effort='Düşük', risk_level='Orta'
+    ))
+    add(Rule(
+        None, 'inactive', 'İnaktif Kaynak',
+        issue="Bu kaynak {reason} nedeniyle inaktif durumdadır.",
+        options=[
+            ("Kaynağı devre dışı bırakın", None),
+            ("Gereksizse kaynağı silin", None),
+            ("Kaynağı korumak istiyorsanız, daha düşük maliyetli bir seçeneğe geçin", None)
+        ],
+        savings={'monthly': _cost(1.0), 'yearly': _cost(12.0)},
+        estimated_effort='Düşük', risk_level='Düşük', inactive_days=True
+    ))
+    
+    # --- Yüksek maliyetli kaynaklar ---
+    add(Rule(
+        VIRTUAL_MACHINES, 'high_cost', 'VM Maliyet Optimizasyonu',
+        issue="Bu VM yüksek maliyetlidir: {cost:.2f} USD/ay",
+        options=[
+            ("Bir alt boyuta ({resize_sku}) geçin (ortalama CPU %20'nin altında)",
+             lambda f: _below('cpu', 20)(f) & _resize_known(f)),
+            ("CPU kullanımı düşükse bir alt boyuta ({resize_sku}) geçmeyi değerlendirin",
+             lambda f: _unknown('cpu')(f) & _resize_known(f)),
+            ("Daha küçük bir VM boyutuna geçin (%50'ye kadar tasarruf, ortalama CPU %20'nin altında)",
+             lambda f: _below('cpu', 20)(f) & ~_resize_known(f)),
+            ("1 veya 3 yıllık Reserved Instance satın alın (%40-70 tasarruf)", None),
+            ("Toleranslı workload'lar için Spot VM'leri değerlendirin (%80'e kadar tasarruf)", None),
+            ("B-serisi burstable VM'lere geçmeyi değerlendirin (düşük ortalama CPU kullanımı için)",
+             _size_prefix('standard_d')),
+            ("D-serisi VM'lere geçmeyi değerlendirin (yüksek bellek gereksiniminiz yoksa)", _size_prefix('standard_e'))
+        ],
+        savings={
+            # Fiyatı bilinmeyen SKU'larda RI ile %40, doğru boyutlandırma ile %30 tasarruf varsayılır
+            'monthly_ri_savings': _price_delta('reserved_price', 0.4),
+            'yearly_ri_savings': _price_delta('reserved_price', 0.4, scale=12),
+            'monthly_ri_3y_savings': _price_delta('reserved_3y_price'),
+            'spot_savings': _price_delta('spot_price'),
+            'sizing_savings': _price_delta('resize_price', 0.3,
+                                           when=lambda f: _below('cpu', 20)(f) | (_unknown('cpu')(f) & _resize_known(f)))
+        },
+        details=('size', 'cpu', 'price', 'resize_sku'), estimated_effort='Orta', risk_level='Orta'
+    ))
+    add(Rule(
+        STORAGE_ACCOUNTS, 'high_cost', 'Storage Maliyet Optimizasyonu',
+        issue="Bu depolama hesabı yüksek maliyetlidir: {cost:.2f} USD/ay",
+        options=[
+            ("Blob'lar için erişim sıklığına göre katmanlı depolama (Hot/Cool/Archive) kullanın", None),
+            ("Eski verileri otomatik olarak daha ucuz katmanlara taşımak için yaşam döngüsü politikaları uygulayın", None),
+            ("Kritik olmayan veriler için LRS depolamaya geçin", _replication_geo),
+            ("Eski, gereksiz verileri temizleyin veya arşivleyin", None)
+        ],
+        savings={
+            'monthly_lifecycle_savings': _cost(0.3),  # Yaşam döngüsü ile %30 tasarruf
+            # Replikasyon düşürme (LRS); fiyatı bilinmiyorsa %40 tasarruf
+            'replication_change_savings': _price_delta('lrs_price', 0.4, when=_replication_geo)
+        },
+        details=('tier', 'replication', 'price'), estimated_effort='Orta', risk_level='Düşük'
+    ))
+    add(Rule(
+        SQL_DATABASES, 'high_cost', 'SQL Maliyet Optimizasyonu',
+        issue="Bu SQL veritabanı yüksek maliyetlidir: {cost:.2f} USD/ay",
+        options=[
+            ("Bir alt hizmet katmanına ({resize_sku}) geçin (ortalama DTU kullanımı %40'ın altında)",
+             lambda f: _below('dtu', 40)(f) & _resize_known(f)),
+            ("DTU kullanımı düşükse bir alt hizmet katmanına ({resize_sku}) geçmeyi değerlendirin",
+             lambda f: _unknown('dtu')(f) & _resize_known(f)),
+            ("Bir alt hizmet katmanına geçin (ortalama DTU kullanımı %40'ın altında)",
+             lambda f: _below('dtu', 40)(f) & ~_resize_known(f)),
+            ("vCore modelinde 1 veya 3 yıllık ayrılmış kapasite satın alın (%33'e kadar tasarruf)", None),
+            ("Aralıklı kullanılan veritabanları için serverless katmanı değerlendirin", None),
+            ("Benzer yük profilli veritabanlarını elastik havuzda birleştirin", None)
+        ],
+        savings={
+            # Fiyatı bilinmiyorsa bir alt katman yaklaşık yarı fiyattır
+            'sizing_savings': _price_delta('resize_price', 0.5,
+                                           when=lambda f: _below('dtu', 40)(f) | (_unknown('dtu')(f) & _resize_known(f))),
+            'reserved_savings': _price_delta('reserved_price', 0.33)
+        },
+        details=('size', 'dtu', 'price', 'resize_sku'), estimated_effort='Orta', risk_level='Orta'
+    ))
+    add(Rule(
+        COSMOS_ACCOUNTS, 'high_cost', 'CosmosDB Maliyet Optimizasyonu',
+        issue="Bu CosmosDB hesabı yüksek maliyetlidir: {cost:.2f} USD/ay",
+        options=[
+            ("Değişken trafikli konteynerlerde otomatik ölçeklendirmeli throughput kullanın", None),
+            ("1 veya 3 yıllık ayrılmış kapasite satın alın", None),
+            ("İndeksleme politikasını ve TTL ayarlarını gözden geçirerek RU ve depolama tüketimini azaltın", None)
+        ],
+        savings={
+            'autoscale_savings': _cost(0.3),
+            'reserved_savings': _cost(0.2)
+        },
+        details=('size',), estimated_effort='Orta', risk_level='Düşük'
+    ))
+    add(Rule(
+        AKS_CLUSTERS, 'high_cost', 'AKS Maliyet Optimizasyonu',
+        issue="Bu AKS kümesi yüksek maliyetlidir: {cost:.2f} USD/ay",
+        options=[
+            ("Küme otomatik ölçeklendiricisini etkinleştirin ve node sayısını yüke göre ayarlayın", None),
+            ("Node VM boyutlarını küçültün (ortalama node CPU kullanımı %40'ın altında)", _below('cpu', 40)),
+            ("Kesintiye dayanıklı iş yükleri için Spot node havuzları kullanın", None),
+            ("Sistem node havuzu için Reserved Instance satın alın", None)
+        ],
+        savings={
+            'sizing_savings': _cost(0.3, _below('cpu', 40)),
+            'reserved_savings': _cost(0.35)
+        },
+        details=('size', 'node_count', 'cpu', 'memory'), estimated_effort='Yüksek', risk_level='Orta'
+    ))
+    for resource_type in (WEB_APPS, APP_SERVICE_PLANS):
+        add(Rule(
+            resource_type, 'high_cost', 'App Service Maliyet Optimizasyonu',
+            issue="Bu App Service kaynağı yüksek maliyetlidir: {cost:.2f} USD/ay",
+            options=[
+                ("Plan boyutunu veya örnek sayısını gerçek yüke göre küçültün", None),
+                ("Düşük trafikli uygulamaları tek bir planda birleştirin", None),
+                ("Premium v3 planları için ayrılmış örnek satın alın (%35'e kadar tasarruf)",
+                 lambda f: f['size_key'].str.contains('v3').to_numpy()),
+                ("Otomatik ölçeklendirme kurallarıyla yoğun olmayan saatlerde örnek sayısını azaltın", None)
+            ],
+            savings={
+                'consolidation_savings': _cost(0.2),
+                'reserved_savings': _cost(0.35, lambda f: f['size_key'].str.contains('v3').to_numpy())
+            },
+            details=('size',), estimated_effort='Orta', risk_level='Düşük'
+        ))
+    add(Rule(
+        None, 'high_cost', 'Yüksek Maliyet',
+        issue="Bu kaynak aylık {cost:.2f} USD maliyeti ile yüksek harcamaya sahip.",
+        options=[
+            ("Alternatif fiyatlandırma seçeneklerini değerlendirin", None),
+            ("Kullanım paternlerini analiz ederek optimize edin", None),
+            ("Rezervasyon veya taahhüt planlarını değerlendirin", None)
+        ],
+        savings={
+            'monthly_estimate': _cost(0.2),  # Tahmini %20 tasarruf
+            'yearly_estimate': _cost(0.2 * 12)
+        },
+        estimated_effort='Orta', risk_level='Orta'
+    ))
+    
+    return registry
@@ -0,0 +1,8 @@
+"""
+Testlerin depo kökündeki 'modules' paketini içe aktarabilmesi için yol ayarı.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
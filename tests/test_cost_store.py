@@ -0,0 +1,103 @@
+"""
+CostStore testleri: bölümlü yazma, abonelik bazlı okuma, gün listesi ve sorgular.
+"""
+
+import os
+from datetime import date, timedelta
+import pytest
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("pandas")
+
+from modules.cost_index import CostIndex
+from modules.cost_store import CostStore
+
+VM_ID = "/subscriptions/sub-a/resourceGroups/rg/providers/Microsoft.Compute/virtualMachines/vm1"
+DISK_ID = "/subscriptions/sub-a/resourceGroups/rg/providers/Microsoft.Compute/disks/disk1"
+
+def make_index(subscription_id, costs):
+    """
+    Günlük maliyet dizini oluşturur.
+    
+    Args:
+        subscription_id: Abonelik ID'si
+        costs: (kaynak ID'si, gün, maliyet) demetleri listesi
+    """
+    days = sorted(day for _, day, _ in costs)
+    index = CostIndex(subscription_id, days[0], days[-1], daily=True)
+    for resource_id, day, cost in costs:
+        resource_type = 'microsoft.compute/disks' if '/disks/' in resource_id else 'microsoft.compute/virtualmachines'
+        index.add(resource_id, cost, name=resource_id.rsplit('/', 1)[-1], resource_type=resource_type,
+                  resource_group='rg', location='westeurope', currency='USD', usage_date=day)
+    return index
+
+@pytest.fixture
+def store(tmp_path):
+    return CostStore(str(tmp_path / "costs"))
+
+def test_read_daily_returns_only_subscription_window(store):
+    store.write(make_index('sub-a', [(VM_ID, '2024-01-30', 1.0), (VM_ID, '2024-02-01', 2.0),
+                                     (DISK_ID, '2024-02-02', 3.0)]))
+    store.write(make_index('sub-b', [(VM_ID.replace('sub-a', 'sub-b'), '2024-02-01', 9.0)]))
+    
+    rows = store.read_daily('sub-a', '2024-01-31', '2024-02-28')
+    
+    assert sorted((row['date'], row['cost']) for row in rows) == [('2024-02-01', 2.0), ('2024-02-02', 3.0)]
+    assert {row['resource_id'] for row in rows} == {VM_ID.lower(), DISK_ID.lower()}
+
+def test_read_daily_without_partitions_is_empty(store):
+    assert store.read_daily('sub-a', '2024-01-01', '2024-03-31') == []
+
+def test_write_replaces_written_days_and_keeps_others(store):
+    store.write(make_index('sub-a', [(VM_ID, '2024-03-01', 1.0), (VM_ID, '2024-03-02', 1.0)]))
+    store.write(make_index('sub-a', [(VM_ID, '2024-03-02', 5.0)]))
+    
+    rows = store.read_daily('sub-a', '2024-03-01', '2024-03-31')
+    
+    assert sorted((row['date'], row['cost']) for row in rows) == [('2024-03-01', 1.0), ('2024-03-02', 5.0)]
+
+def test_plan_fetch_skips_closed_days(store):
+    store.write(make_index('sub-a', [(VM_ID, '2024-01-01', 1.0)]), start_date='2024-01-01', end_date='2024-01-10')
+    
+    assert store.plan_fetch('sub-a', '2024-01-01', '2024-01-10') is None
+    assert store.plan_fetch('sub-a', '2024-01-01', '2024-01-12') == '2024-01-11'
+    assert store.plan_fetch('sub-b', '2024-01-01', '2024-01-10') == '2024-01-01'
+
+def test_plan_fetch_refetches_open_days(store):
+    today = date.today()
+    start = (today - timedelta(days=1)).isoformat()
+    store.write(make_index('sub-a', [(VM_ID, start, 1.0)]), start_date=start, end_date=today.isoformat())
+    
+    assert store.plan_fetch('sub-a', start, today.isoformat()) == start
+
+def test_query_ignores_temporary_files(store):
+    store.write(make_index('sub-a', [(VM_ID, '2024-02-01', 2.0), (DISK_ID, '2024-02-01', 3.0)]))
+    partition = os.path.dirname(store._partition_file('sub-a', '2024-02'))
+    with open(os.path.join(partition, ".costs.parquet.tmp"), 'wb') as temp_file:
+        temp_file.write(b"yarim yazilmis dosya")
+    
+    result = store.query(group_by=('resource_type',))
+    
+    assert dict(zip(result['resource_type'], result['cost'])) == {
+        'microsoft.compute/disks': 3.0,
+        'microsoft.compute/virtualmachines': 2.0
+    }
+    assert len(store.read_daily('sub-a', '2024-02-01', '2024-02-29')) == 2
+
+def test_query_rejects_unknown_columns(store):
+    store.write(make_index('sub-a', [(VM_ID, '2024-02-01', 2.0)]))
+    
+    with pytest.raises(ValueError):
+        store.query(group_by=('cost',))
+    with pytest.raises(ValueError):
+        store.query(filters={'date': '2024-01-01'})
+
+def test_month_over_month(store):
+    store.write(make_index('sub-a', [(VM_ID, '2024-01-15', 10.0), (VM_ID, '2024-02-15', 15.0),
+                                     (DISK_ID, '2024-02-15', 4.0)]))
+    
+    result = store.month_over_month('2024-02', group_by=('resource_type',)).set_index('resource_type')
+    
+    assert result.loc['microsoft.compute/virtualmachines', 'previous'] == 10.0
+    assert result.loc['microsoft.compute/virtualmachines', 'change_pct'] == pytest.approx(50.0)
+    assert result.loc['microsoft.compute/disks', 'change'] == 4.0
@@ -0,0 +1,122 @@
+"""
+MetricCache testleri: aralık kayıtları, TTL, günlük seriler ve ortak LRU sınırı.
+"""
+
+import sqlite3
+from types import SimpleNamespace
+from datetime import datetime, timedelta, timezone
+import pytest
+
+from modules import metric_cache
+from modules.metric_cache import MetricCache
+
+VM_ID = "/subscriptions/sub-a/resourceGroups/rg/providers/Microsoft.Compute/virtualMachines/vm1"
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Her çağrıda bir saniye ilerleyen saat; son erişim sırası eşit zaman damgalarına kalmaz.
+    """
+    now = [1_700_000_000.0]
+    
+    def tick():
+        now[0] += 1.0
+        return now[0]
+    
+    monkeypatch.setattr(metric_cache, 'time', SimpleNamespace(time=tick))
+    return now
+
+def open_cache(tmp_path, **kwargs):
+    return MetricCache(str(tmp_path / "cache" / "metrics.db"), **kwargs)
+
+def past_range(days=7):
+    end = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=2)
+    return end - timedelta(days=days), end
+
+def test_put_and_get_roundtrip(tmp_path):
+    cache = open_cache(tmp_path)
+    start, end = past_range()
+    key = MetricCache.make_key(VM_ID, 'Percentage CPU', start, end, 'PT1H', 'Average')
+    
+    assert cache.get(key) is None
+    cache.put(key, [["2024-01-01T00:00:00Z", 1.5]], end)
+    
+    assert cache.get(key) == [["2024-01-01T00:00:00Z", 1.5]]
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+
+def test_make_key_is_case_insensitive():
+    start, end = past_range()
+    assert (MetricCache.make_key(VM_ID, 'Percentage CPU', start, end, 'PT1H', 'Average') ==
+            MetricCache.make_key(VM_ID.upper(), 'percentage cpu', start, end, 'PT1H', 'AVERAGE'))
+
+def test_open_range_expires_after_ttl(tmp_path):
+    cache = open_cache(tmp_path, ttl_seconds=-1)
+    now = datetime.now(timezone.utc)
+    key = MetricCache.make_key(VM_ID, 'Percentage CPU', now - timedelta(days=1), now, 'PT1H', 'Average')
+    cache.put(key, [], now)
+    
+    assert cache.get(key) is None
+    assert cache.stats()['entries'] == 0
+
+def test_closed_range_does_not_expire(tmp_path):
+    cache = open_cache(tmp_path, ttl_seconds=-1)
+    start, end = past_range()
+    key = MetricCache.make_key(VM_ID, 'Percentage CPU', start, end, 'PT1H', 'Average')
+    cache.put(key, [], end)
+    
+    assert cache.get(key) == []
+
+def test_evicts_least_recently_used_entry(tmp_path, clock):
+    cache = open_cache(tmp_path, max_entries=2)
+    end = past_range()[1]
+    cache.put_many([('a', [], end), ('b', [], end)])
+    cache.get('a')
+    cache.put('c', [], end)
+    
+    assert cache.get('b') is None
+    assert cache.get('a') == [] and cache.get('c') == []
+    assert cache.stats()['evictions'] == 1
+
+def test_daily_fetch_plan_and_read(tmp_path):
+    cache = open_cache(tmp_path)
+    series_key = MetricCache.daily_key(VM_ID, 'Percentage CPU', 'Average')
+    start, end = (day.date() for day in past_range(days=3))
+    
+    assert cache.plan_daily_fetch(series_key, start, end) == start
+    cache.put_daily_many([(series_key, [[f"{start.isoformat()}T00:00:00Z", 4.0]], start, end)])
+    
+    assert cache.plan_daily_fetch(series_key, start, end) is None
+    points = cache.read_daily_series(series_key, start, end)
+    assert points[0] == [start.isoformat(), 4.0]
+    # Yanıtta olmayan günler boş değerle saklanır
+    assert len(points) == 4 and all(value is None for _, value in points[1:])
+
+def test_daily_series_share_entry_limit(tmp_path, clock):
+    cache = open_cache(tmp_path, max_entries=2)
+    start, end = (day.date() for day in past_range(days=1))
+    cache.put_daily_many([('series-1', [], start, end)])
+    cache.put_daily_many([('series-2', [], start, end)])
+    cache.read_daily_series('series-1', start, end)
+    cache.put('range', [], end)
+    
+    stats = cache.stats()
+    assert (stats['entries'], stats['daily_series'], stats['evictions']) == (2, 1, 1)
+    assert cache.read_daily_series('series-2', start, end) == []
+    assert len(cache.read_daily_series('series-1', start, end)) == 2
+
+def test_migration_backfills_daily_series(tmp_path):
+    path = tmp_path / "metrics.db"
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE daily_points (series_key TEXT NOT NULL, day TEXT NOT NULL, value REAL,"
+                 " closed INTEGER NOT NULL, fetched_at REAL NOT NULL, PRIMARY KEY (series_key, day))")
+    conn.executemany("INSERT INTO daily_points VALUES (?, ?, ?, 1, ?)",
+                     [('series-1', '2024-01-01', 1.0, 10.0), ('series-1', '2024-01-02', 2.0, 20.0)])
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+    
+    cache = MetricCache(str(path))
+    
+    assert cache.stats()['daily_series'] == 1
+    cache.close()
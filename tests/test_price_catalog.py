@@ -0,0 +1,100 @@
+"""
+PriceCatalog testleri: anlık görüntü okuma, fiyat türleri ve boyut alternatifleri.
+"""
+
+import json
+import pytest
+
+pytest.importorskip("pandas")
+
+from modules.price_catalog import (PriceCatalog, region_key, sku_family, SPOT, RESERVATION_1Y, RESERVATION_3Y,
+                                   HOURS_PER_YEAR)
+
+def vm_item(sku, meter, price, price_type='Consumption', term=None, product='Virtual Machines Dv3 Series',
+            region='westeurope'):
+    return {
+        'serviceName': 'Virtual Machines', 'armSkuName': sku, 'skuName': meter, 'armRegionName': region,
+        'meterName': meter, 'type': price_type, 'reservationTerm': term, 'retailPrice': price,
+        'unitOfMeasure': '1 Hour', 'productName': product, 'tierMinimumUnits': 0.0
+    }
+
+def storage_item(sku, meter, price, tier_minimum=0.0):
+    return {
+        'serviceName': 'Storage', 'armSkuName': '', 'skuName': sku, 'armRegionName': 'westeurope',
+        'meterName': meter, 'type': 'Consumption', 'reservationTerm': None, 'retailPrice': price,
+        'unitOfMeasure': '1 GB/Month', 'productName': 'General Block Blob v2', 'tierMinimumUnits': tier_minimum
+    }
+
+ITEMS = [
+    vm_item('Standard_D2s_v3', 'D2s v3', 0.1),
+    vm_item('Standard_D4s_v3', 'D4s v3', 0.2),
+    vm_item('Standard_D8s_v3', 'D8s v3', 0.4),
+    vm_item('Standard_D4s_v3', 'D4s v3', 0.35, product='Virtual Machines Dv3 Series Windows'),
+    vm_item('Standard_D4s_v3', 'D4s v3 Spot', 0.04),
+    vm_item('Standard_D4s_v3', 'D4s v3', 0.12 * HOURS_PER_YEAR, price_type='Reservation', term='1 Year'),
+    vm_item('Standard_D4s_v3', 'D4s v3', 0.08 * HOURS_PER_YEAR * 3, price_type='Reservation', term='3 Years'),
+    storage_item('Hot GRS', 'Hot GRS Write Operations', 0.1),
+    storage_item('Hot GRS', 'Hot GRS Data Stored', 0.04),
+    storage_item('Hot GRS', 'Hot GRS Data Stored', 0.03, tier_minimum=51200.0),
+    storage_item('Hot LRS', 'Hot LRS Data Stored', 0.02),
+    {'serviceName': 'Other', 'skuName': 'x', 'armRegionName': 'westeurope', 'meterName': 'x', 'retailPrice': 1.0}
+]
+
+@pytest.fixture
+def catalog(tmp_path):
+    (tmp_path / "page1.json").write_text(json.dumps({'Items': ITEMS}), encoding='utf-8')
+    return PriceCatalog(str(tmp_path), services=['Virtual Machines', 'Storage'])
+
+def test_consumption_price_ignores_windows_rows(catalog):
+    assert catalog.price('Virtual Machines', 'Standard_D4s_v3', 'West Europe') == pytest.approx(0.2)
+    assert catalog.price('virtual machines', 'standard_d4s_v3', 'westeurope') == pytest.approx(0.2)
+
+def test_unknown_lookups_return_none(catalog):
+    assert catalog.price('Virtual Machines', 'Standard_D4s_v3', 'eastus') is None
+    assert catalog.price('Virtual Machines', 'Standard_X1', 'westeurope') is None
+    assert catalog.price('Other', 'x', 'westeurope') is None
+
+def test_spot_and_reservation_prices(catalog):
+    assert catalog.price('Virtual Machines', 'Standard_D4s_v3', 'westeurope', price_type=SPOT) == pytest.approx(0.04)
+    # Ayrılmış kapasite fiyatları tüketim birimine (saat) çevrilir
+    assert catalog.price('Virtual Machines', 'Standard_D4s_v3', 'westeurope',
+                         price_type=RESERVATION_1Y) == pytest.approx(0.12)
+    assert catalog.price('Virtual Machines', 'Standard_D4s_v3', 'westeurope',
+                         price_type=RESERVATION_3Y) == pytest.approx(0.08)
+
+def test_storage_primary_meter_and_tiers(catalog):
+    # Sayaç verilmezse sıcak katmanın 'data stored' sayacının ilk kademesi kullanılır
+    assert catalog.price('Storage', 'Standard_GRS', 'westeurope') == pytest.approx(0.04)
+    assert catalog.price('Storage', 'Standard_GRS', 'westeurope', meter='Hot GRS Write Operations') == \
+        pytest.approx(0.1)
+    assert catalog.price('Storage', 'Standard_LRS', 'westeurope') == pytest.approx(0.02)
+
+def test_smaller_and_alternatives(catalog):
+    assert catalog.smaller('Virtual Machines', 'Standard_D4s_v3', 'westeurope') == ('Standard_D2s_v3', 0.1)
+    assert catalog.smaller('Virtual Machines', 'Standard_D2s_v3', 'westeurope') is None
+    assert [sku for sku, _ in catalog.alternatives('Virtual Machines', 'Standard_D4s_v3', 'westeurope')] == [
+        'Standard_D2s_v3', 'Standard_D4s_v3', 'Standard_D8s_v3']
+
+def test_reads_csv_snapshots(tmp_path):
+    (tmp_path / "prices.csv").write_text(
+        "serviceName,armSkuName,armRegionName,meterName,retailPrice\n"
+        "Virtual Machines,Standard_D2s_v3,westeurope,D2s v3,0.1\n", encoding='utf-8')
+    
+    catalog = PriceCatalog(str(tmp_path))
+    
+    assert len(catalog) == 1
+    assert catalog.price('Virtual Machines', 'Standard_D2s_v3', 'westeurope') == pytest.approx(0.1)
+
+def test_missing_required_columns_raise(tmp_path):
+    (tmp_path / "prices.json").write_text(json.dumps([{'serviceName': 'Storage', 'retailPrice': 1.0}]),
+                                          encoding='utf-8')
+    
+    with pytest.raises(ValueError):
+        PriceCatalog(str(tmp_path)).load()
+
+def test_helpers():
+    assert region_key('West Europe') == 'westeurope'
+    assert region_key(None) == ''
+    assert sku_family('standard_d4s_v3') == ('standard_d#s_v3', 4)
+    assert sku_family('s3') == ('s#', 3)
+    assert sku_family('basic') is None
@@ -0,0 +1,120 @@
+"""
+Kural motoru testleri: kural seçimi, katalog tabanlı tasarruflar ve tablo özellikleri.
+"""
+
+import json
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("azure.core")
+
+from modules.records import Resource, CostEntry
+from modules.resource_table import ResourceTable
+from modules.price_catalog import PriceCatalog, HOURS_PER_YEAR
+from modules.rules import Rule, RuleEngine, RuleRegistry, _cost
+
+PROVIDERS = "/subscriptions/sub-a/resourceGroups/rg/providers"
+
+def vm(name, state='running', size='Standard_D4s_v3', cost=100.0, metrics=None, details=None):
+    return Resource(f"{PROVIDERS}/Microsoft.Compute/virtualMachines/{name}", name, 'Virtual Machine', 'rg',
+                    'westeurope', size, state, 'Düşük CPU kullanımı', cost, metrics, details)
+
+def cost_entry(name, provider_type, size=None, cost=500.0):
+    return CostEntry(f"{PROVIDERS}/{provider_type}/{name}", name, provider_type.lower(), 'rg', 'westeurope',
+                     cost, size=size)
+
+def table_of(records, kind, subscription_id='sub-a'):
+    table = ResourceTable()
+    table.append(records, subscription_id, kind=kind)
+    return table
+
+@pytest.fixture
+def catalog(tmp_path):
+    def item(sku, meter, price, price_type='Consumption', term=None):
+        return {'serviceName': 'Virtual Machines', 'armSkuName': sku, 'armRegionName': 'westeurope',
+                'meterName': meter, 'type': price_type, 'reservationTerm': term, 'retailPrice': price,
+                'unitOfMeasure': '1 Hour', 'productName': 'Virtual Machines Dv3 Series'}
+    
+    items = [
+        item('Standard_D2s_v3', 'D2s v3', 0.1),
+        item('Standard_D4s_v3', 'D4s v3', 0.2),
+        item('Standard_D4s_v3', 'D4s v3 Spot', 0.05),
+        item('Standard_D4s_v3', 'D4s v3', 0.12 * HOURS_PER_YEAR, price_type='Reservation', term='1 Year')
+    ]
+    (tmp_path / "prices.json").write_text(json.dumps(items), encoding='utf-8')
+    return PriceCatalog(str(tmp_path))
+
+def test_table_reads_metric_and_detail_columns():
+    table = table_of([vm('a', metrics={'Percentage CPU': {'mean': 3.5}}, details={'inactive_days': 120}),
+                      cost_entry('b', 'Microsoft.Storage/storageAccounts')], 'inactive')
+    
+    frame = table.select(columns=['cpu', 'memory', 'inactive_days', 'reserved_instance'])
+    
+    assert frame['cpu'].iloc[0] == 3.5 and frame['cpu'].isna().iloc[1]
+    assert frame['memory'].isna().all()
+    assert frame['inactive_days'].tolist() == [120, 0]
+    assert frame['reserved_instance'].tolist() == [False, False]
+
+def test_inactive_rules_pick_first_matching_rule():
+    table = table_of([
+        vm('stopped', state='deallocated'),
+        vm('old', metrics={'Percentage CPU': {'mean': 1.0}}, details={'inactive_days': 120}),
+        Resource(f"{PROVIDERS}/Microsoft.Network/publicIPAddresses/ip", 'ip', 'Public IP', 'rg', 'westeurope',
+                 reason='İlişkili kaynak yok', cost=3.0)
+    ], 'inactive')
+    
+    stopped, old, ip = RuleEngine().evaluate(table, 'inactive')
+    
+    assert stopped.recommendation_type == 'İnaktif VM' and 'deallocate' in stopped.issue
+    assert old.recommendations[0].startswith("VM'i tamamen silin")
+    assert old.inactive_days == 120
+    assert old.resource_details == {'size': 'Standard_D4s_v3', 'cpu': 1.0}
+    assert old.potential_savings == {'monthly': 100.0, 'yearly': 1200.0, 'deallocate_savings': 90.0}
+    assert ip.recommendation_type == 'İnaktif Kaynak' and ip.issue.startswith("Bu kaynak İlişkili kaynak yok")
+
+def test_high_cost_savings_use_catalog_prices(catalog):
+    table = table_of([cost_entry('vm1', 'Microsoft.Compute/virtualMachines', size='Standard_D4s_v3')], 'high_cost')
+    
+    recommendation, = RuleEngine(catalog=catalog).evaluate(table, 'high_cost')
+    
+    savings = recommendation.potential_savings
+    assert savings['monthly_ri_savings'] == pytest.approx(500.0 * 0.4)
+    assert savings['spot_savings'] == pytest.approx(500.0 * 0.75)
+    # 3 yıllık fiyat katalogda yok; bilinmeyen tasarruf None olur
+    assert savings['monthly_ri_3y_savings'] is None
+    assert recommendation.resource_details['resize_sku'] == 'Standard_D2s_v3'
+    assert any('Standard_D2s_v3' in text for text in recommendation.recommendations)
+    assert recommendation.issue == "Bu VM yüksek maliyetlidir: 500.00 USD/ay"
+
+def test_high_cost_savings_fall_back_to_ratios():
+    table = table_of([cost_entry('vm1', 'Microsoft.Compute/virtualMachines', size='Standard_D4s_v3')], 'high_cost')
+    
+    recommendation, = RuleEngine().evaluate(table, 'high_cost')
+    
+    assert recommendation.potential_savings['monthly_ri_savings'] == pytest.approx(200.0)
+    assert recommendation.resource_details['price'] is None
+    assert recommendation.resource_details['resize_sku'] is None
+
+def test_evaluate_filters_by_subscription():
+    table = table_of([vm('a', state='deallocated')], 'inactive', subscription_id='sub-a')
+    table.append([vm('b', state='deallocated')], 'sub-b', kind='inactive')
+    
+    assert [r.resource_name for r in RuleEngine().evaluate(table, 'inactive', 'sub-b')] == ['b']
+    assert RuleEngine().evaluate(table, 'high_cost') == []
+
+def test_custom_registry_and_lazy_dicts():
+    registry = RuleRegistry()
+    registry.register(Rule(None, 'inactive', 'Özel', issue="{name} ({size})",
+                           options=[("Sil", None), ("Küçült", lambda f: (f['cost'] > 50).to_numpy())],
+                           savings={'monthly': _cost(0.5)}, details=('state',)))
+    table = table_of([vm('a', cost=100.0), vm('b', cost=10.0)], 'inactive')
+    
+    first, second = RuleEngine(registry).evaluate(table, 'inactive')
+    
+    assert first.issue == "a (Standard_D4s_v3)"
+    assert (first.recommendations, second.recommendations) == (["Sil", "Küçült"], ["Sil"])
+    second.potential_savings = {'monthly': 1.0}
+    assert second.to_dict()['potential_savings'] == {'monthly': 1.0}
+    assert second.to_dict()['resource_details'] == {'state': 'running'}
+    assert 'inactive_days' not in first.to_dict()
+    assert first.copy().to_dict() == first.to_dict()